@@ -0,0 +1,44 @@
+"""
+Benchmarks .ASC parsing of single long trials with an increasing number of
+fixations, with and without merging of short fixations. The time per fixation
+should stay roughly constant as the trial grows.
+
+Usage: python benchmarks/asc_fixations.py
+"""
+
+import random
+import time
+from sideeye.config import ASCParsingConfig
+from sideeye.parser import asc
+from synthetic import asc_trial, item_lines, items
+
+WORDS = 200
+CONFIGS = {
+    "no merging": ASCParsingConfig(),
+    "fixation_min_cutoff": ASCParsingConfig({"fixation_min_cutoff": 150}),
+}
+
+
+def main():
+    """Times parsing one trial of each size with each configuration."""
+    lines = item_lines(WORDS)
+    trial_items = items(1, 1, WORDS)
+    print("%-20s %10s %10s %14s" % ("config", "fixations", "time (s)", "us/fixation"))
+    for (label, config) in CONFIGS.items():
+        for fixations in [250, 500, 1000, 2000, 4000, 8000]:
+            text = "\n".join(
+                asc_trial(
+                    random.Random(0), 1000, "1", "1", lines, fixations, samples=False
+                )
+            )
+            start = time.perf_counter()
+            asc.get_trials(text, trial_items, config)
+            elapsed = time.perf_counter() - start
+            print(
+                "%-20s %10d %10.3f %14.1f"
+                % (label, fixations, elapsed, elapsed / fixations * 1e6)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmarks .ASC line classification: the per-line regex cascade that used to run
+every extractor on every MSG/EFIX/EBLINK line, against `asc.tokenize`, which
+classifies each line once and runs only the matching extractor. Also times a full
+`asc.parse` of the same file.
+
+Usage: python benchmarks/asc_tokenizer.py [size in MB, default 200]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from sideeye.parser import asc
+from synthetic import write_asc
+
+EXTRACTORS = {
+    "SYNCTIME": asc.get_start,
+    "TRIALID": asc.get_item,
+    "CHAR": asc.get_char,
+    "EFIX": asc.FIX_REGEX.search,
+    "EBLINK": asc.get_blink_dur,
+    "TRIAL_RESULT": asc.get_end,
+}
+
+
+def cascade(filename: str) -> int:
+    """Runs every extractor on every line with a parsed keyword."""
+    matches = 0
+    with open(filename) as asc_file:
+        for line in asc_file:
+            if line.split() and line.split()[0] in ("MSG", "EFIX", "EBLINK"):
+                asc.get_start(line)
+                asc.get_condition(line)
+                asc.get_item(line)
+                asc.get_char(line)
+                asc.FIX_REGEX.search(line)
+                asc.get_blink_dur(line)
+                asc.get_end(line)
+                matches += 1
+    return matches
+
+
+def dispatch(filename: str) -> int:
+    """Classifies each line once and runs only the matching extractor."""
+    matches = 0
+    with open(filename) as asc_file:
+        for line in asc_file:
+            tag = asc.tokenize(line)
+            if tag is not None:
+                EXTRACTORS[tag](line)
+                matches += 1
+    return matches
+
+
+def timed(label: str, size: float, function, *args):
+    """Prints the run time and throughput of function(*args)."""
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    print("%-24s %8.2f s %8.1f MB/s" % (label, elapsed, size / elapsed))
+
+
+def main():
+    """Writes a synthetic .ASC file and times each parsing strategy on it."""
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.asc")
+        items = write_asc(filename, size_mb)
+        size = os.path.getsize(filename) / 1024 / 1024
+        print("Synthetic .ASC file: %.1f MB" % size)
+        timed("regex cascade", size, cascade, filename)
+        timed("tokenize + extractor", size, dispatch, filename)
+        timed("asc.parse", size, asc.parse, filename, items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmarks DA1 parsing of a synthetic file: decoding chunks of the file with NumPy,
+with exclusion by the fixation cutoffs applied as array masks, against splitting
+and converting it one line at a time, which is how files are parsed without NumPy.
+Each way is timed building only the FixationSequences of the trials, and parsing
+the whole Experiment.
+
+Usage: python benchmarks/da1_parsing.py [number of trials, default 20000]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from sideeye.config import Configuration, CutoffsConfig
+from sideeye.parser import da1
+from synthetic import write_da1
+
+FIXATIONS = 40
+
+
+def main():
+    """Times parsing the file with and without NumPy."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    config = Configuration()
+    config.cutoffs = CutoffsConfig({"min": 50, "max": 1000})
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "synthetic.da1")
+    items = write_da1(filename, count, fixations=FIXATIONS)
+    print(
+        "%d trials, %d fixations, %.1f MB"
+        % (count, count * FIXATIONS, os.path.getsize(filename) / 1024 / 1024)
+    )
+    (numpy, trial) = (da1.numpy, da1.Trial)
+    results = {}
+    print("%-16s %16s %16s" % ("", "fixations (s)", "experiment (s)"))
+    for (label, module) in [("line by line", None), ("NumPy chunks", numpy)]:
+        da1.numpy = module
+        da1.Trial = lambda index, time, item, fixations, *args: fixations
+        start = time.perf_counter()
+        list(da1.iter_trials(filename, items, config))
+        fixation_time = time.perf_counter() - start
+        da1.Trial = trial
+        start = time.perf_counter()
+        results[label] = da1.parse(filename, items, config)
+        print(
+            "%-16s %16.3f %16.3f"
+            % (label, fixation_time, time.perf_counter() - start)
+        )
+    da1.numpy = numpy
+    if results["line by line"].trials != results["NumPy chunks"].trials:
+        raise AssertionError("Parsed experiments do not match")
+    os.remove(filename)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
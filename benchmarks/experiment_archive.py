@@ -0,0 +1,75 @@
+"""
+Benchmarks reopening a parsed experiment: parsing a synthetic DA1 file again,
+unpickling the parsed Experiment, and loading it from an experiment archive written
+by `Experiment.save`, which memory-maps the archive and builds each trial only when
+it is used. The time to load the archive and build every trial is also shown.
+
+Usage: python benchmarks/experiment_archive.py [number of fixations, default 1000000]
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from sideeye.config import Configuration
+from sideeye.data import Experiment
+from sideeye.parser import da1
+from synthetic import write_da1
+
+FIXATIONS_PER_TRIAL = 40
+
+
+def timed(function):
+    """Returns the result of function, and the seconds it took."""
+    start = time.perf_counter()
+    result = function()
+    return (result, time.perf_counter() - start)
+
+
+def main():
+    """Times each way of opening the experiment."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    directory = tempfile.mkdtemp()
+    da1_file = os.path.join(directory, "synthetic.da1")
+    pickle_file = os.path.join(directory, "synthetic.pickle")
+    archive_file = os.path.join(directory, "synthetic.sideeye")
+    trials = count // FIXATIONS_PER_TRIAL
+    items = write_da1(
+        da1_file, trials, item_count=trials // 2 | 1, fixations=FIXATIONS_PER_TRIAL
+    )
+
+    (experiment, parse_time) = timed(
+        lambda: da1.parse(da1_file, items, Configuration())
+    )
+    with open(pickle_file, "wb") as output:
+        pickle.dump(experiment, output, pickle.HIGHEST_PROTOCOL)
+    experiment.save(archive_file)
+
+    def unpickle():
+        with open(pickle_file, "rb") as pickled:
+            return pickle.load(pickled)
+
+    (unpickled, unpickle_time) = timed(unpickle)
+    (loaded, load_time) = timed(lambda: Experiment.load(archive_file))
+    (_, build_time) = timed(lambda: list(loaded.trials.values()))
+    if unpickled.trials != experiment.trials or loaded.trials != experiment.trials:
+        raise AssertionError("Reopened experiments do not match")
+
+    print("%-10s %10s %10s" % ("", "time (s)", "size (MB)"))
+    for (label, seconds, filename) in [
+        ("DA1 parse", parse_time, da1_file),
+        ("unpickle", unpickle_time, pickle_file),
+        ("archive", load_time, archive_file),
+        ("+ trials", load_time + build_time, archive_file),
+    ]:
+        print(
+            "%-10s %10.3f %10.1f"
+            % (label, seconds, os.path.getsize(filename) / 1024 / 1024)
+        )
+    shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
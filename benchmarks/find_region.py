@@ -0,0 +1,76 @@
+"""
+Benchmarks `Item.find_region`, which parsers call once per fixation: looks up
+random positions in items with many regions, with the bisection over the regions'
+start positions that `Item` builds at construction, and with the linear scan over
+regions that it replaces. Batch lookups with `Item.find_regions`, which parsers
+use to assign the regions of a whole trial's fixations at once, are timed in
+trials of TRIAL_FIXATIONS positions.
+
+Usage: python benchmarks/find_region.py [number of lookups, default 200000]
+"""
+
+import random
+import sys
+import time
+from sideeye.data import Item
+from synthetic import items
+
+TRIAL_FIXATIONS = 250
+
+
+def linear_find_region(item: Item, x_pos: int, y_pos: int):
+    """Finds a region with a linear scan over the regions of an item."""
+    for region in range(1, len(item.regions)):
+        current_x = item.regions[region].start.x
+        current_y = item.regions[region].start.y
+        if (current_x > x_pos and current_y >= y_pos) or (current_y > y_pos):
+            return item.regions[region - 1]
+    if item.regions[-1].end.y >= y_pos:
+        return item.regions[-1]
+    raise ValueError("Position is out of range.")
+
+
+def main():
+    """Times lookups for items with increasing numbers of regions."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print("%8s %12s %12s %12s" % ("regions", "linear (s)", "bisect (s)", "batch (s)"))
+    for words in [10, 30, 60, 100, 150]:
+        item = items(1, conditions=1, words=words)["1"]["1"]
+        rng = random.Random(0)
+        last_line = item.regions[-1].end.y
+        positions = [
+            (rng.randrange(0, 80), rng.randrange(0, last_line + 1))
+            for _ in range(count)
+        ]
+
+        start = time.perf_counter()
+        linear = [
+            linear_find_region(item, x_pos, y_pos) for (x_pos, y_pos) in positions
+        ]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bisect = [item.find_region(x_pos, y_pos) for (x_pos, y_pos) in positions]
+        bisect_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = []
+        for trial in range(0, count, TRIAL_FIXATIONS):
+            trial_positions = positions[trial : trial + TRIAL_FIXATIONS]
+            batch += item.find_regions(
+                [x_pos for (x_pos, _) in trial_positions],
+                [y_pos for (_, y_pos) in trial_positions],
+            )
+        batch_time = time.perf_counter() - start
+
+        for regions in [bisect, batch]:
+            if any(first is not second for (first, second) in zip(linear, regions)):
+                raise AssertionError("Regions do not match the linear scan")
+        print(
+            "%8d %12.3f %12.3f %12.3f"
+            % (words, linear_time, bisect_time, batch_time)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmarks the memory used by fixations: builds a synthetic experiment with one
+million fixations, and reports the bytes allocated per fixation for the fixations
+alone, as Fixation objects and as a FixationSequence, and for the whole experiment,
+including trials and saccades, with each kind of fixations. Items and regions are
+built beforehand, so they are not counted.
+
+Usage: python benchmarks/fixation_memory.py [number of fixations, default 1000000]
+"""
+
+import random
+import sys
+import tracemalloc
+from sideeye.data import Experiment, Fixation, FixationSequence, Point
+from synthetic import items, trials
+
+FIXATIONS_PER_TRIAL = 250
+
+
+def allocated(function):
+    """Returns the result of function, and the number of bytes it allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (result, after - before)
+
+
+def main():
+    """Builds the experiment and prints bytes per fixation."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    trial_count = count // FIXATIONS_PER_TRIAL
+    experiment_items = items((trial_count + 1) // 2)
+    regions = experiment_items["1"]["1"].regions
+
+    (fixations, fixation_bytes) = allocated(
+        lambda: [
+            Fixation(Point(index % 10, 0), index, index + 200, index, regions[0])
+            for index in range(count)
+        ]
+    )
+    print(
+        "%-24s %10d fixations %8.1f bytes/fixation"
+        % ("Fixation objects", len(fixations), fixation_bytes / len(fixations))
+    )
+    del fixations
+
+    def sequence():
+        fixations = FixationSequence(regions)
+        for index in range(count):
+            fixations.add(index % 10, 0, index, index + 200, regions[0])
+        return fixations
+
+    (fixations, fixation_bytes) = allocated(sequence)
+    print(
+        "%-24s %10d fixations %8.1f bytes/fixation"
+        % ("FixationSequence", len(fixations), fixation_bytes / len(fixations))
+    )
+    del fixations
+
+    for (label, sequences) in [("Experiment (lists)", False), ("Experiment", True)]:
+        rng = random.Random(0)
+        (experiment, experiment_bytes) = allocated(
+            lambda: Experiment(
+                "memory",
+                trials(
+                    rng, experiment_items, trial_count, FIXATIONS_PER_TRIAL, sequences
+                ),
+            )
+        )
+        fixation_count = sum(
+            len(trial.fixations) for trial in experiment.trials.values()
+        )
+        print(
+            "%-24s %10d fixations %8.1f bytes/fixation"
+            % (label, fixation_count, experiment_bytes / fixation_count)
+        )
+        del experiment
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmarks sending parsed experiments between processes: pickling each experiment
+on its own, as ProcessPoolExecutor does, copies its Items and Regions into every
+pickle, while pickling with an ItemTable writes them as (item id, region number)
+references to a table each worker receives once.
+
+Usage: python benchmarks/item_table.py [number of experiments, default 24]
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from sideeye.config import Configuration
+from sideeye.data import ItemTable
+from sideeye.parser import da1
+from synthetic import write_da1
+
+TRIALS = 160
+ITEMS = 80
+FIXATIONS_PER_TRIAL = 40
+
+
+def timed(function):
+    """Returns the result of function, and the seconds it took."""
+    start = time.perf_counter()
+    result = function()
+    return (result, time.perf_counter() - start)
+
+
+def main():
+    """Times and measures pickling the experiments with and without a table."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    directory = tempfile.mkdtemp()
+    experiments = []
+    items = None
+    for seed in range(count):
+        da1_file = os.path.join(directory, "synthetic%d.da1" % seed)
+        file_items = write_da1(
+            da1_file, TRIALS, item_count=ITEMS, fixations=FIXATIONS_PER_TRIAL, seed=seed
+        )
+        # All files are parsed with the same items, as with one region file.
+        items = items or file_items
+        experiments += [da1.parse(da1_file, items, Configuration())]
+    shutil.rmtree(directory)
+    table = ItemTable.from_dict(items)
+
+    (pickled, pickle_time) = timed(
+        lambda: [
+            pickle.dumps(experiment, pickle.HIGHEST_PROTOCOL)
+            for experiment in experiments
+        ]
+    )
+    (_, unpickle_time) = timed(lambda: [pickle.loads(data) for data in pickled])
+    (referenced, dumps_time) = timed(
+        lambda: [table.dumps(experiment) for experiment in experiments]
+    )
+    (loaded, loads_time) = timed(lambda: [table.loads(data) for data in referenced])
+    if loaded != experiments:
+        raise AssertionError("Unpickled experiments do not match")
+
+    print("%d experiments of %d trials" % (count, TRIALS))
+    print("%-12s %10s %10s %10s" % ("", "dump (s)", "load (s)", "size (MB)"))
+    for (label, dump_time, load_time, data) in [
+        ("pickle", pickle_time, unpickle_time, pickled),
+        ("item table", dumps_time, loads_time, referenced),
+    ]:
+        print(
+            "%-12s %10.3f %10.3f %10.2f"
+            % (
+                label,
+                dump_time,
+                load_time,
+                sum(len(value) for value in data) / 1024 / 1024,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
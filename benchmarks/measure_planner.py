@@ -0,0 +1,86 @@
+"""
+Benchmarks the measure planner: calculating a set of measures for every trial by
+building only the intermediates the measures need, against building every table of
+the fused engine and calculating trial measures with their functions in
+`sideeye.measures.trial`, one at a time, which is how measures were calculated
+before the planner. Each set of measures is timed on fresh copies of the trials.
+
+Usage: python benchmarks/measure_planner.py [number of trials, default 2000]
+"""
+
+import copy
+import random
+import sys
+import time
+from sideeye import measures
+from sideeye.measures.engine import TrialTables, calculate_trial_measures
+from sideeye.measures.helpers import save_measure
+from synthetic import items, trials
+
+FIXATIONS = 60
+MEASURE_SETS = [
+    ("skip", ["skip"]),
+    ("total time", ["total_time"]),
+    ("trial measures", ["fixation_count", "trial_total_time", "percent_regressions"]),
+    ("region measures", list(measures.region.__all__)),
+    (
+        "all measures",
+        list(measures.region.__all__)
+        + [
+            "location_first_regression",
+            "latency_first_regression",
+            "fixation_count",
+            "percent_regressions",
+            "trial_total_time",
+            "average_forward_saccade",
+            "average_backward_saccade",
+        ],
+    ),
+]
+
+
+def all_tables(trial, measure_names):
+    """Calculates measures the way they were calculated before the planner."""
+    region_names = []
+    for measure in measure_names:
+        if measure in measures.region.__all__:
+            region_names += [measure]
+        else:
+            getattr(measures.trial, measure)(trial)
+    if region_names:
+        tables = TrialTables(trial)
+        for measure in region_names:
+            calculate = getattr(tables, measure)
+            for (region_number, region) in enumerate(tables.regions):
+                value, fixations = calculate(region_number)
+                save_measure(trial, region, measure, value, fixations)
+
+
+def timed(trial_list, calculate, measure_names):
+    """Returns the seconds taken to calculate the measures for copies of trials."""
+    copies = copy.deepcopy(trial_list)
+    start = time.perf_counter()
+    for trial in copies:
+        calculate(trial, measure_names)
+    return time.perf_counter() - start
+
+
+def main():
+    """Times each set of measures both ways."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    trial_list = trials(random.Random(0), items(40), count, FIXATIONS, True)
+    print("%d trials of %d fixations" % (count, FIXATIONS))
+    print("%-16s %12s %12s" % ("", "all (s)", "planned (s)"))
+    for (label, measure_names) in MEASURE_SETS:
+        print(
+            "%-16s %12.3f %12.3f"
+            % (
+                label,
+                timed(trial_list, all_tables, measure_names),
+                timed(trial_list, calculate_trial_measures, measure_names),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
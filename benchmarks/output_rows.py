@@ -0,0 +1,124 @@
+"""
+Benchmarks csv report generation: calling `measure_output` and `write_column`,
+which map every cell's column name to a value, for each row, against
+`write_all_output` and `write_all_output_wide_format`, which compile the configured
+columns into an `OutputPlan` once and read experiment, trial and region values
+once per loop level. Trial reports are timed against `write_trial_output`, which
+does not visit regions.
+
+Usage: python benchmarks/output_rows.py [number of experiments, default 50]
+"""
+
+import io
+import os
+import sys
+import time
+from sideeye import calculate_all_measures, parser
+from sideeye.config import Configuration
+from sideeye.output import (
+    csv_row,
+    measure_output,
+    output_header,
+    wide_format_columns,
+    write_all_output,
+    write_all_output_wide_format,
+    write_column,
+    write_trial_output,
+)
+
+TESTDATA = os.path.join(os.path.dirname(__file__), "..", "tests", "testdata")
+
+
+def cell_by_cell_long(experiments, sink, config):
+    """Writes a long format report with measure_output."""
+    columns = config.output.columns
+    sink.write(output_header(columns))
+    for experiment in experiments:
+        for trial in experiment.trials.values():
+            for (measure, value) in config.measures.trial.items():
+                sink.write(
+                    measure_output(
+                        measure, value.cutoff, columns, experiment, trial, None
+                    )
+                )
+            for region in trial.item.regions:
+                for (measure, value) in config.measures.region.items():
+                    sink.write(
+                        measure_output(
+                            measure, value.cutoff, columns, experiment, trial, region
+                        )
+                    )
+
+
+def cell_by_cell_trial(experiments, sink, config):
+    """Writes a trial measure report with measure_output."""
+    columns = config.output.trial
+    sink.write(output_header(columns))
+    for experiment in experiments:
+        for trial in experiment.trials.values():
+            for (measure, value) in config.measures.trial.items():
+                sink.write(
+                    measure_output(
+                        measure, value.cutoff, columns, experiment, trial, None
+                    )
+                )
+
+
+def cell_by_cell_wide(experiments, sink, config):
+    """Writes a wide format report with write_column."""
+    columns = wide_format_columns(config)
+    sink.write(output_header(columns))
+    for experiment in experiments:
+        for trial in experiment.trials.values():
+            for region in trial.item.regions:
+                sink.write(
+                    csv_row(
+                        [
+                            write_column(
+                                column, experiment, trial, region, column, value.cutoff
+                            )
+                            for (column, value) in columns.items()
+                        ]
+                    )
+                )
+
+
+def timed(label, function, experiments, config):
+    """Prints the rows per second written by function, and returns its output."""
+    sink = io.StringIO()
+    start = time.perf_counter()
+    function(experiments, sink, config)
+    elapsed = time.perf_counter() - start
+    output = sink.getvalue()
+    rows = output.count("\n") - 1
+    print(
+        "%-32s %8d rows %8.2f s %10.0f rows/s"
+        % (label, rows, elapsed, rows / elapsed)
+    )
+    return output
+
+
+def main():
+    """Calculates measures for copies of a test experiment and times each writer."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    config = Configuration()
+    experiments = [
+        parser.experiment.parse(
+            os.path.join(TESTDATA, "timdrop.DA1"),
+            os.path.join(TESTDATA, "timdropDA1.cnt"),
+        )
+        for _ in range(count)
+    ]
+    calculate_all_measures(experiments, None, config)
+    for (label, reference, compiled) in [
+        ("long", cell_by_cell_long, write_all_output),
+        ("wide", cell_by_cell_wide, write_all_output_wide_format),
+        ("trial", cell_by_cell_trial, write_trial_output),
+    ]:
+        expected = timed(label + ": cell by cell", reference, experiments, config)
+        actual = timed(label + ": output plan", compiled, experiments, config)
+        assert actual == expected, "Output plan wrote different rows"
+
+
+if __name__ == "__main__":
+    main()
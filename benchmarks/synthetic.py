@@ -0,0 +1,243 @@
+"""
+Generators for synthetic eye-tracking data used by the benchmarks.
+
+Items are laid out on a fixed grid of 10x40 pixel characters, one region per word,
+so generated .ASC fixations can be mapped back onto character positions.
+"""
+
+import random
+from typing import Dict, List
+from sideeye.data import Fixation, FixationSequence, Item, Point, Trial
+from sideeye.parser import region
+
+WORDS = ["the", "reader", "fixated", "on", "a", "long", "sentence", "while", "we"]
+CHAR_WIDTH = 10
+LINE_HEIGHT = 50
+CHAR_HEIGHT = 40
+
+
+def item_lines(words: int, line_length: int = 80) -> List[List[str]]:
+    """Returns the words of an item, broken into lines of at most line_length characters."""
+    lines: List[List[str]] = [[]]
+    length = 0
+    for word in (WORDS[i % len(WORDS)] for i in range(words)):
+        if lines[-1] and length + len(word) + 1 > line_length:
+            lines += [[]]
+            length = 0
+        length += len(word) + (1 if lines[-1] else 0)
+        lines[-1] += [word]
+    return lines
+
+
+def region_string(lines: List[List[str]]) -> str:
+    """Converts lines of words into a region string with one region per word."""
+    regions: List[str] = []
+    for (line_pos, line) in enumerate(lines):
+        for (word_pos, word) in enumerate(line):
+            if word_pos:
+                regions += [" " + word]
+            else:
+                regions += [("\\n" if line_pos else "") + word]
+    return "/".join(regions)
+
+
+def items(
+    count: int, conditions: int = 2, words: int = 20
+) -> Dict[str, Dict[str, Item]]:
+    """Returns `count` items in `conditions` conditions, each with `words` regions."""
+    text = region_string(item_lines(words))
+    return {
+        str(number): {
+            str(condition): Item(str(number), str(condition), region.text(text))
+            for condition in range(1, conditions + 1)
+        }
+        for number in range(1, count + 1)
+    }
+
+
+def asc_trial(
+    rng: random.Random,
+    time: int,
+    number: str,
+    condition: str,
+    lines: List[List[str]],
+    fixations: int,
+    samples: bool = True,
+) -> List[str]:
+    """Returns the lines of an .ASC recording of a single trial starting at `time`."""
+    text = [" ".join(line) for line in lines]
+    asc = ["MSG\t%d TRIALID E%sI%sD0" % (time, condition, number)]
+    for (line_pos, line) in enumerate(text):
+        for (char_pos, char) in enumerate(line):
+            x_1 = CHAR_WIDTH * (char_pos + 1)
+            y_1 = LINE_HEIGHT * (line_pos + 2)
+            asc += [
+                "MSG\t%d REGION CHAR %d 1 %s %d %d %d %d"
+                % (
+                    time,
+                    char_pos,
+                    char,
+                    x_1,
+                    y_1,
+                    x_1 + CHAR_WIDTH,
+                    y_1 + CHAR_HEIGHT,
+                )
+            ]
+    time += 100
+    asc += ["MSG\t%d SYNCTIME" % time]
+    for _ in range(fixations):
+        line_pos = rng.randrange(len(text))
+        char_pos = rng.randrange(len(text[line_pos]))
+        x_pos = CHAR_WIDTH * (char_pos + 1) + CHAR_WIDTH / 2
+        y_pos = LINE_HEIGHT * (line_pos + 2) + CHAR_HEIGHT / 2
+        duration = rng.randint(80, 400)
+        asc += ["SFIX R   %d" % time]
+        if samples:
+            asc += [
+                "%d\t  %.1f\t  %.1f\t 2100.0\t..." % (time + t, x_pos, y_pos)
+                for t in range(duration)
+            ]
+        asc += [
+            "EFIX R   %d\t%d\t%d\t  %.1f\t  %.1f\t   2100"
+            % (time, time + duration, duration, x_pos, y_pos)
+        ]
+        time += duration
+        if rng.random() < 0.02:
+            asc += ["SBLINK R %d" % time, "EBLINK R %d\t%d\t%d" % (time, time + 90, 90)]
+            time += 90
+        asc += ["SSACC R  %d" % time, "ESACC R  %d\t%d\t30" % (time, time + 30)]
+        time += 30
+    asc += ["MSG\t%d TRIAL_RESULT 7" % time, "MSG\t%d TRIAL OK" % (time + 1)]
+    return asc
+
+
+def write_asc(
+    filename: str,
+    size_mb: float,
+    item_count: int = 40,
+    words: int = 20,
+    fixations: int = 40,
+    samples: bool = True,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Item]]:
+    """
+    Writes a synthetic .ASC file of at least `size_mb` megabytes, and returns the
+    items used in it.
+    """
+    rng = random.Random(seed)
+    lines = item_lines(words)
+    experiment_items = items(item_count, words=words)
+    time = 1000
+    size = 0
+    trial = 0
+    with open(filename, "w") as asc_file:
+        while size < size_mb * 1024 * 1024:
+            number = str(trial % item_count + 1)
+            condition = str(trial % 2 + 1)
+            text = "\n".join(
+                asc_trial(rng, time, number, condition, lines, fixations, samples)
+            )
+            asc_file.write(text + "\n")
+            size += len(text) + 1
+            time += 1000000
+            trial += 1
+    return experiment_items
+
+
+def write_da1(
+    filename: str,
+    trial_count: int,
+    item_count: int = 40,
+    words: int = 20,
+    fixations: int = 40,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Item]]:
+    """
+    Writes a synthetic DA1 file with `trial_count` trials in the default DA1
+    column layout, and returns the items used in it. Fixations are on random
+    characters of the item, and about 5% are too short or too long for common
+    fixation cutoffs.
+    """
+    rng = random.Random(seed)
+    lines = item_lines(words)
+    experiment_items = items(item_count, words=words)
+    with open(filename, "w") as da1_file:
+        for trial in range(trial_count):
+            numbers = []
+            time = 0
+            for _ in range(fixations):
+                line_pos = rng.randrange(len(lines))
+                char_pos = rng.randrange(len(" ".join(lines[line_pos])))
+                duration = rng.choice([40, 1500]) if rng.random() < 0.05 else 200
+                numbers += [char_pos, line_pos, time, time + duration]
+                time += duration + 30
+            da1_file.write(
+                "\t".join(
+                    str(number)
+                    for number in [
+                        trial,
+                        trial % 2 + 1,
+                        trial % item_count + 1,
+                        0,
+                        0,
+                        0,
+                        fixations,
+                        fixations,
+                    ]
+                    + numbers
+                )
+                + "\n"
+            )
+    return experiment_items
+
+
+def trials(
+    rng: random.Random,
+    experiment_items: Dict[str, Dict[str, Item]],
+    count: int,
+    fixations: int,
+    sequences: bool = False,
+) -> List[Trial]:
+    """
+    Returns `count` trials of the given items, each with `fixations` fixations on
+    the first character of random regions of the item, as a list of Fixations or, if
+    `sequences` is set, as a FixationSequence.
+    """
+    keys = [
+        (number, condition)
+        for (number, conditions) in experiment_items.items()
+        for condition in conditions
+    ]
+    result: List[Trial] = []
+    for index in range(count):
+        (number, condition) = keys[index % len(keys)]
+        item = experiment_items[number][condition]
+        time = 0
+        fixation_list: List[Fixation] = []
+        sequence = FixationSequence(item.regions)
+        for fixation_index in range(fixations):
+            fixation_region = rng.choice(item.regions)
+            duration = rng.randint(80, 400)
+            if sequences:
+                sequence.add(
+                    fixation_region.start.x,
+                    fixation_region.start.y,
+                    time,
+                    time + duration,
+                    fixation_region,
+                )
+            else:
+                fixation_list += [
+                    Fixation(
+                        Point(fixation_region.start.x, fixation_region.start.y),
+                        time,
+                        time + duration,
+                        fixation_index,
+                        fixation_region,
+                    )
+                ]
+            time += duration + 30
+        result += [
+            Trial(index, time, item, sequence if sequences else fixation_list)
+        ]
+    return result
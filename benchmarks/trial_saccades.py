@@ -0,0 +1,66 @@
+"""
+Benchmarks the cost of the saccades of a Trial: parsing a synthetic DA1 file,
+loading it from an experiment archive, calculating only region measures, which do
+not use saccades, and then calculating the trial measures that do.
+
+Usage: python benchmarks/trial_saccades.py [number of trials, default 20000]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from sideeye.calculate import calculate_measures
+from sideeye.config import Configuration
+from sideeye.data import Experiment
+from sideeye.parser import da1
+from synthetic import write_da1
+
+FIXATIONS = 40
+SACCADE_MEASURES = [
+    "location_first_regression",
+    "latency_first_regression",
+    "percent_regressions",
+    "average_forward_saccade",
+    "average_backward_saccade",
+]
+
+
+def timed(function):
+    """Returns the result of function, and the seconds it took."""
+    start = time.perf_counter()
+    result = function()
+    return (result, time.perf_counter() - start)
+
+
+def main():
+    """Times each step."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    config = Configuration()
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "synthetic.da1")
+    archive = os.path.join(directory, "synthetic.sideeye")
+    items = write_da1(filename, count, item_count=count // 2 | 1, fixations=FIXATIONS)
+    print("%d trials, %d fixations" % (count, count * FIXATIONS))
+
+    (experiment, parse_time) = timed(lambda: da1.parse(filename, items, config))
+    experiment.save(archive)
+    (_, load_time) = timed(lambda: Experiment.load(archive))
+    (_, region_time) = timed(
+        lambda: calculate_measures([experiment], list(config.measures.region))
+    )
+    (_, trial_time) = timed(lambda: calculate_measures([experiment], SACCADE_MEASURES))
+    shutil.rmtree(directory)
+
+    for (label, seconds) in [
+        ("DA1 parse", parse_time),
+        ("archive load", load_time),
+        ("region measures", region_time),
+        ("saccade measures", trial_time),
+    ]:
+        print("%-18s %8.3f s" % (label, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,12 @@ setup(
     packages=find_packages(exclude=["doc", "tests"]),
     install_requires=["typing", "mypy", "mypy_extensions"],
     include_package_data=True,
-    extras_require={"test": ["nose2", "pylint"], "dev": ["nose2", "pylint"]},
+    extras_require={
+        "test": ["nose2", "pylint"],
+        "dev": ["nose2", "pylint"],
+        "vectorized": ["numpy"],
+        "parquet": ["pyarrow"],
+    },
     package_data={"sideeye": ["default_config.json"]},
     test_suite="nose2.collector.collector",
     tests_require=["nose2", "pylint"],
@@ -4,12 +4,21 @@ with EyeTrack and Experiment Builder.
 """
 
 from .data import *
-from .calculate import calculate_measure, calculate_all_measures
+from .calculate import (
+    calculate_measure,
+    calculate_all_measures,
+    iter_all_measures,
+    write_all_measures,
+)
 from .output import (
     generate_region_output,
     generate_trial_output,
     generate_all_output_wide_format,
     generate_all_output,
+    write_trial_output,
+    write_region_output,
+    write_all_output_wide_format,
+    write_all_output,
 )
 from . import parser
 from . import measures
@@ -5,11 +5,135 @@ experiment. These functions do not return anything, they only calculate the meas
 or measures on each trial or region of the experiments.
 """
 
-from typing import List
-from sideeye import measures
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Iterable, Iterator, Tuple, Dict, Optional
+from sideeye import measures, parquet
 from sideeye.config import Configuration
-from sideeye.output import generate_all_output, generate_all_output_wide_format
-from sideeye.data import Experiment
+from sideeye.output import (
+    generate_all_output,
+    generate_all_output_wide_format,
+    output_header,
+    wide_format_columns,
+    OutputPlan,
+    trial_all_output,
+    trial_wide_output,
+    write_all_output,
+    write_all_output_wide_format,
+)
+from sideeye.data import Experiment, ItemTable, Trial
+from sideeye.measures.engine import (
+    MEASURE_INTERMEDIATES,
+    calculate_trial_measures as calculate_planned_measures,
+    can_fuse,
+)
+from sideeye.measures.helpers import save_measure
+from sideeye.parser import cache
+from sideeye.types import MeasureTable
+
+
+def calculate_trial_measure(trial: Trial, measure: str):
+    """
+    Given a trial and the name of a measure, calculate the measure for the trial, or
+    for every region of the trial if it is a region measure.
+
+    Args:
+        trial (Trial): Trial to calculate the measure for.
+        measure (str): Name of measure to calculate.
+    """
+    if hasattr(measures.trial, measure):
+        if not trial.trial_measures[measure]:
+            getattr(measures.trial, measure)(trial)
+    elif hasattr(measures.region, measure):
+        for region in trial.item.regions:
+            if (
+                region.number is not None
+                and not trial.region_measures[region.number][measure]
+            ):
+                getattr(measures.region, measure)(trial, region.number)
+    else:
+        raise ValueError('Measure "%s" does not exist.' % measure)
+
+
+def calculate_trial_measures(
+    trial: Trial, measure_names: Iterable[str], vectorized: bool = False
+):
+    """
+    Given a trial and a list of measure names, calculate each measure for the trial.
+    Trial measures that have not been calculated, and region measures that have not
+    been calculated for every region, are calculated together by
+    `sideeye.measures.engine.calculate_trial_measures`, which builds the
+    intermediates the measures share once instead of rescanning the trial's
+    fixations for every measure and region.
+
+    Args:
+        trial (Trial): Trial to calculate measures for.
+        measure_names (Iterable[str]): Names of measures to calculate.
+        vectorized (bool): Whether to calculate the measures in
+            `sideeye.measures.vectorized` with NumPy array operations.
+    """
+    use_columns = vectorized and can_fuse(trial)
+    planned_measure_names: List[str] = []
+    for measure in measure_names:
+        if use_columns and measure in measures.vectorized.__all__:
+            if hasattr(measures.trial, measure):
+                if not trial.trial_measures[measure]:
+                    getattr(measures.vectorized, measure)(trial)
+            elif not all(
+                trial.region_measures[region.number][measure]
+                for region in trial.item.regions
+            ):
+                getattr(measures.vectorized, measure)(trial)
+        elif hasattr(measures.trial, measure):
+            if measure not in MEASURE_INTERMEDIATES:
+                calculate_trial_measure(trial, measure)
+            elif not trial.trial_measures[measure]:
+                planned_measure_names += [measure]
+        elif hasattr(measures.region, measure):
+            if any(
+                region.number is not None
+                and not trial.region_measures[region.number][measure]
+                for region in trial.item.regions
+            ):
+                planned_measure_names += [measure]
+        else:
+            raise ValueError('Measure "%s" does not exist.' % measure)
+
+    if planned_measure_names:
+        calculate_planned_measures(trial, planned_measure_names)
+
+
+def calculate_measures(
+    experiments: List[Experiment],
+    measure_names: List[str],
+    verbose: int = 0,
+    vectorized: bool = False,
+):
+    """
+    Given an array of experiments and a list of measure names, calculate every
+    measure for every trial in the experiments, one trial at a time.
+
+    Args:
+        experiments (List[Experiment]): List of experiments to calculate measures for.
+        measure_names (List[str]): Names of measures to calculate.
+        verbose (int): Debugging output level.
+        vectorized (bool): Whether to calculate the measures in
+            `sideeye.measures.vectorized` with NumPy array operations.
+    """
+    for measure in measure_names:
+        if not hasattr(measures.trial, measure) and not hasattr(
+            measures.region, measure
+        ):
+            raise ValueError('Measure "%s" does not exist.' % measure)
+
+    for experiment in experiments:
+        if verbose >= 3:
+            print("Calculating measures for experiment: %s" % experiment.name)
+        for trial in experiment.trials.values():
+            if verbose >= 4:
+                print("\t...for trial: %s" % trial.index)
+            calculate_trial_measures(trial, measure_names, vectorized)
 
 
 def calculate_measure(experiments: List[Experiment], measure: str, verbose: int = 0):
@@ -22,65 +146,390 @@ def calculate_measure(experiments: List[Experiment], measure: str, verbose: int
         measure (str): Name of measure to calculate.
         verbose (int): Debugging output level.
     """
-    if hasattr(measures.trial, measure):
-        for experiment in experiments:
-            if verbose >= 3:
-                print(
-                    "Calculating measure: %s for experiment: %s"
-                    % (measure, experiment.name)
+    if not hasattr(measures.trial, measure) and not hasattr(measures.region, measure):
+        raise ValueError('Measure "%s" does not exist.' % measure)
+
+    for experiment in experiments:
+        if verbose >= 3:
+            print(
+                "Calculating measure: %s for experiment: %s" % (measure, experiment.name)
+            )
+        for trial in experiment.trials.values():
+            if verbose >= 4:
+                print("\t...for trial: %s" % trial.index)
+            calculate_trial_measures(trial, [measure])
+
+
+def measure_table(
+    experiment: Experiment, measure_names: List[str] = None
+) -> MeasureTable:
+    """
+    Returns the calculated measures of an experiment as a compact table mapping each
+    trial's (number, condition) to its trial measure values and its region measure
+    values. Fixations used in a region measure are listed by index in the trial.
+
+    Args:
+        experiment (Experiment): Experiment the measures were calculated for.
+        measure_names (Optional[List[str]]): Names of measures to include. If not
+            provided, all calculated measures are included.
+    """
+    names = None if measure_names is None else set(measure_names)
+    return {
+        key: (
+            {
+                measure: value
+                for (measure, value) in trial.trial_measures.items()
+                if names is None or measure in names
+            },
+            {
+                region_number: {
+                    measure: (
+                        value["value"],
+                        [fixation.index for fixation in value["fixations"]]
+                        if value["fixations"] is not None
+                        else None,
+                    )
+                    for (measure, value) in region_measures.items()
+                    if value and (names is None or measure in names)
+                }
+                for (region_number, region_measures) in trial.region_measures.items()
+            },
+        )
+        for (key, trial) in experiment.trials.items()
+    }
+
+
+def merge_experiment_measures(experiment: Experiment, table: MeasureTable):
+    """
+    Save measures returned by `calculate_experiment_measures` or `measure_table` to
+    the trials of an experiment.
+
+    Args:
+        experiment (Experiment): Experiment the measures were calculated for.
+        table (MeasureTable): Calculated measures.
+    """
+    for (key, (trial_measures, region_measures)) in table.items():
+        trial = experiment.trials[key]
+        trial.trial_measures.update(trial_measures)
+        for (region_number, values) in region_measures.items():
+            region = trial.item.regions[region_number]
+            for (measure, (value, fixations)) in values.items():
+                save_measure(
+                    trial,
+                    region,
+                    measure,
+                    value,
+                    [trial.fixations[index] for index in fixations]
+                    if fixations is not None
+                    else None,
                 )
-            for trial in experiment.trials.values():
-                if verbose >= 4:
-                    print("\t...for trial: %s" % trial.index)
-                if not trial.trial_measures[measure]:
-                    getattr(measures.trial, measure)(trial)
 
-    elif hasattr(measures.region, measure):
+
+def saved_measures_key(
+    experiment: Experiment, config: Configuration = Configuration()
+) -> Optional[str]:
+    """
+    Returns the cache key of the saved measures of an experiment: the cache key of
+    the files it was parsed from (`Experiment.source_key`) and the configuration
+    sections used to parse them. Returns None if the experiment was not parsed from
+    files with a cache directory.
+
+    Args:
+        experiment (Experiment): Experiment.
+        config (Configuration): Configuration the measures are calculated with.
+    """
+    if experiment.source_key is None:
+        return None
+    return hashlib.sha256(
+        json.dumps(
+            [
+                cache.CACHE_VERSION,
+                "measures",
+                experiment.source_key,
+                cache.config_key(config),
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def load_saved_measures(
+    experiment: Experiment,
+    measure_names: List[str],
+    config: Configuration = Configuration(),
+    key: str = None,
+) -> List[str]:
+    """
+    Load measures saved by `save_measures` for the same source files and
+    configuration (see `saved_measures_key`), and by the current version of each
+    measure (see `sideeye.measures.VERSIONS`), into the trials of an experiment, and
+    return the names of the measures that were not saved.
+
+    Args:
+        experiment (Experiment): Experiment to load measures for.
+        measure_names (List[str]): Names of measures to load.
+        config (Configuration): Configuration with the cache directory.
+        key (Optional[str]): Result of `saved_measures_key` for the experiment.
+    """
+    key = key if key is not None else saved_measures_key(experiment, config)
+    saved: Dict[str, Tuple[str, MeasureTable]] = (
+        (cache.load(config.cache_dir, key) or {}) if key is not None else {}
+    )
+    missing: List[str] = []
+    for measure in measure_names:
+        if measure in saved and saved[measure][0] == measures.VERSIONS.get(measure):
+            merge_experiment_measures(experiment, saved[measure][1])
+        else:
+            missing += [measure]
+    return missing
+
+
+def save_measures(
+    experiment: Experiment,
+    measure_names: List[str],
+    config: Configuration = Configuration(),
+    key: str = None,
+):
+    """
+    Save the calculated values of measures for an experiment to the cache
+    directory, with the version of each measure, keeping measures that were saved
+    before for the same source files and configuration. Measures of experiments
+    without a `saved_measures_key` are not saved.
+
+    Args:
+        experiment (Experiment): Experiment the measures were calculated for.
+        measure_names (List[str]): Names of measures to save.
+        config (Configuration): Configuration with the cache directory.
+        key (Optional[str]): Result of `saved_measures_key` for the experiment.
+    """
+    key = key if key is not None else saved_measures_key(experiment, config)
+    if key is None:
+        return
+    saved: Dict[str, Tuple[str, Any]] = cache.load(config.cache_dir, key) or {}
+    for measure in measure_names:
+        saved[measure] = (
+            measures.VERSIONS.get(measure),
+            measure_table(experiment, [measure]),
+        )
+    cache.store(config.cache_dir, key, saved, config.cache_size * 1024 * 1024)
+
+
+def calculate_configured_measures(
+    experiment: Experiment, config: Configuration = Configuration()
+):
+    """
+    Calculate all measures specified in the config file for an experiment. If the
+    configuration has a cache directory and the experiment was parsed from files
+    with it, measures saved for the same files are loaded instead of calculated, and
+    newly calculated measures are saved.
+
+    Args:
+        experiment (Experiment): Experiment to calculate measures for.
+        config (Configuration): SideEye configuration.
+    """
+    key = None if config.cache_dir is None else saved_measures_key(experiment, config)
+    if key is None:
+        calculate_measures(
+            [experiment],
+            config.measures.names,
+            config.terminal_output,
+            config.vectorized,
+        )
+        return
+
+    missing = load_saved_measures(experiment, config.measures.names, config, key)
+    if missing:
+        calculate_measures(
+            [experiment], missing, config.terminal_output, config.vectorized
+        )
+        save_measures(experiment, missing, config, key)
+
+
+def calculate_experiment_measures(
+    experiment: Experiment, config: Configuration = Configuration()
+) -> MeasureTable:
+    """
+    Calculate all measures specified in the config file for an experiment, and return
+    them as a compact table (see `measure_table`).
+
+    Args:
+        experiment (Experiment): Experiment to calculate measures for.
+        config (Configuration): SideEye configuration.
+    """
+    calculate_configured_measures(experiment, config)
+    return measure_table(experiment)
+
+
+# Configuration and item table of a calculate_all_measures worker process, set once
+# per worker by init_worker.
+WORKER_STATE: Dict[str, Any] = {}
+
+
+def init_worker(config: Configuration, table: ItemTable):
+    """
+    Stores the configuration used by all experiments calculated in a worker, and the
+    table of the items of the experiments.
+    """
+    WORKER_STATE["config"] = config
+    WORKER_STATE["table"] = table
+
+
+def calculate_worker_experiment(data: bytes) -> MeasureTable:
+    """
+    Calculates measures in a worker process initialized by init_worker, for an
+    experiment pickled with the worker's item table.
+    """
+    return calculate_experiment_measures(
+        WORKER_STATE["table"].loads(data), WORKER_STATE["config"]
+    )
+
+
+def iter_calculated_experiments(
+    experiments: List[Experiment],
+    config: Configuration = Configuration(),
+    workers: int = None,
+) -> Iterator[Experiment]:
+    """
+    Calculate all measures specified in the config file for each experiment, and
+    yield each experiment, in order, as soon as its measures are calculated.
+
+    Args:
+        experiments (List[Experiment]): List of experiments to calculate measures for.
+        config (Configuration): SideEye configuration.
+        workers (Optional[int]): Number of worker processes, as in
+            `calculate_all_measures`.
+    """
+    workers = config.workers if workers is None else workers
+
+    if workers == 1 or len(experiments) < 2:
         for experiment in experiments:
-            if verbose >= 3:
-                print(
-                    "Calculating measure: %s for experiment: %s"
-                    % (measure, experiment.name)
-                )
-            for trial in experiment.trials.values():
-                if verbose >= 4:
-                    print("\t...for trial: %s" % trial.index)
-                for region in trial.item.regions:
-                    if (
-                        region.number is not None
-                        and not trial.region_measures[region.number][measure]
-                    ):
-                        getattr(measures.region, measure)(trial, region.number)
+            calculate_configured_measures(experiment, config)
+            yield experiment
     else:
-        raise ValueError('Measure "%s" does not exist.' % measure)
+        # Items are sent to each worker once, and experiments without them.
+        items = ItemTable(
+            [
+                trial.item
+                for experiment in experiments
+                for trial in experiment.trials.values()
+            ]
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers if workers > 0 else None,
+            initializer=init_worker,
+            initargs=(config, items),
+        ) as executor:
+            for (experiment, table) in zip(
+                experiments,
+                executor.map(
+                    calculate_worker_experiment,
+                    [items.dumps(experiment) for experiment in experiments],
+                ),
+            ):
+                merge_experiment_measures(experiment, table)
+                yield experiment
 
 
 def calculate_all_measures(
     experiments: List[Experiment],
     output_file: str = None,
     config: Configuration = Configuration(),
+    workers: int = None,
 ):
     """
     Given an array of experiments and config file, calculate all measures specified in the
     config file for the experiment, and optionally output the results as a csv.
 
+    The csv is returned as a string, and is also written to `output_file` if it is
+    provided, as by `write_all_measures`. If the configured output format is
+    "parquet", a `pyarrow.Table` is returned instead, and the file is a Parquet file
+    (see `sideeye.parquet`).
+
     Args:
         experiments (List[Experiment]): List of experiments to calculate measures for.
         output_file (str): Name of output file. if `None`, no file is produced.
         config (Configuration): SideEye configuration.
+        workers (Optional[int]): Number of worker processes to calculate experiments
+            with, or 0 for one per CPU. If not provided, `config.workers` is used.
+            Each worker sends back only the calculated measure values, and output
+            rows are in the same order as with a single process.
     """
-    wide_format = config.wide_format
-
-    for measure in config.measures.names:
-        calculate_measure(experiments, measure, config.terminal_output)
+    if output_file is not None:
+        write_all_measures(experiments, output_file, config, workers)
+    else:
+        for _ in iter_calculated_experiments(experiments, config, workers):
+            pass
 
-    output_text = (
+    if config.output.format == "parquet":
+        return parquet.generate_table(experiments, config)
+    return (
         generate_all_output_wide_format(experiments, config)
-        if wide_format
+        if config.wide_format
         else generate_all_output(experiments, config)
     )
-    if output_file is not None:
-        with open(output_file, "w") as output:
-            output.write(output_text)
 
-    return output_text
+
+def write_all_measures(
+    experiments: List[Experiment],
+    output_file: str,
+    config: Configuration = Configuration(),
+    workers: int = None,
+):
+    """
+    Given an array of experiments and config file, calculate all measures specified in
+    the config file for the experiments, and write the results to a file. Each
+    experiment is written to the file as soon as its measures are calculated, so the
+    output is not built in memory. The file is a csv, or a Parquet file with one row
+    group per experiment if the configured output format is "parquet".
+
+    Args:
+        experiments (List[Experiment]): List of experiments to calculate measures for.
+        output_file (str): Name of output file.
+        config (Configuration): SideEye configuration.
+        workers (Optional[int]): Number of worker processes, as in
+            `calculate_all_measures`.
+    """
+    calculated = iter_calculated_experiments(experiments, config, workers)
+
+    if config.output.format == "parquet":
+        parquet.write_parquet(calculated, output_file, config)
+        return
+
+    with open(output_file, "w") as output:
+        if config.wide_format:
+            write_all_output_wide_format(calculated, output, config)
+        else:
+            write_all_output(calculated, output, config)
+
+
+def iter_all_measures(
+    trials: Iterable[Tuple[Experiment, Trial]], config: Configuration = Configuration()
+) -> Iterator[str]:
+    """
+    Given a stream of (experiment, trial) pairs, such as the one produced by
+    `sideeye.parser.experiment.iter_trials`, calculate all measures specified in the
+    config file for each trial and yield its csv output as soon as it is calculated.
+    The header row is yielded first. Trials are not kept after their output is
+    generated, so experiments of any size can be processed in constant memory.
+
+    Args:
+        trials (Iterable[Tuple[Experiment, Trial]]): Trials, paired with the experiment
+            they belong to.
+        config (Configuration): SideEye configuration.
+    """
+    wide_format = config.wide_format
+    columns = wide_format_columns(config) if wide_format else config.output.columns
+    plan = OutputPlan(columns)
+
+    yield output_header(columns)
+    for (experiment, trial) in trials:
+        if config.terminal_output >= 4:
+            print(
+                "Calculating measures for experiment: %s, trial: %s"
+                % (experiment.name, trial.index)
+            )
+        calculate_trial_measures(trial, config.measures.names, config.vectorized)
+        yield (
+            trial_wide_output(experiment, trial, config, plan)
+            if wide_format
+            else trial_all_output(experiment, trial, config, plan)
+        )
@@ -4,7 +4,7 @@ validating sideeye configuration dictionaries.
 """
 
 import json
-from typing import Dict, Union, Any
+from typing import Dict, Optional, Union, Any
 
 
 def validate_key(config_dict: Dict[str, Any], key: str, value_type: type, default: Any):
@@ -160,7 +160,7 @@ class MeasuresConfig:
             if not ("exclude" in config and config["exclude"])
         }
         self.all = {**self.trial, **self.region}
-        self.names = {**trial_measures, **region_measures}.keys()
+        self.names = list({**trial_measures, **region_measures}.keys())
 
 
 class OutputColumnConfig:
@@ -185,13 +185,29 @@ class OutputColumnConfig:
 
 
 class OutputConfig:
-    """Output column configuration."""
+    """
+    Output column configuration.
+
+    Attributes:
+        region (Dict[str, OutputColumnConfig]): Output columns for region measures.
+        trial (Dict[str, OutputColumnConfig]): Output columns for trial measures.
+        columns (Dict[str, OutputColumnConfig]): All output columns.
+        format (str): Output file format, "csv" or "parquet".
+
+    Args:
+        region_output (Dict[str, Dict]): Region output configuration dictionary.
+        trial_output (Dict[str, Dict]): Trial output configuration dictionary.
+        output_format (str): Output file format, "csv" or "parquet".
+    """
 
     def __init__(
         self,
         region_output: Dict[str, Dict[str, Union[int, str]]],
         trial_output: Dict[str, Dict[str, Union[int, str]]],
+        output_format: str = "csv",
     ):
+        if output_format not in ("csv", "parquet"):
+            raise ValueError('Output format "%s" does not exist.' % output_format)
         self.region = {
             measure: OutputColumnConfig(measure, config)
             for (measure, config) in region_output.items()
@@ -203,6 +219,7 @@ class OutputConfig:
             if not ("exclude" in config and config["exclude"])
         }
         self.columns = {**self.region, **self.trial}
+        self.format = output_format
 
 
 class Configuration:
@@ -218,6 +235,12 @@ class Configuration:
         measures (MeasuresConfig): Configuration for calculating measures.
         output (OutputConfig): Output file configuration.
         terminal_output (int): Verbose output level.
+        workers (int): Number of processes used to parse and calculate experiments.
+        vectorized (bool): Whether measures with vectorized implementations are
+            calculated with NumPy array operations.
+        cache_dir (Optional[str]): Directory to cache parsed files and calculated
+            measures in, or None to parse files and calculate measures every time.
+        cache_size (int): Maximum size of the parse cache, in megabytes.
 
     Args:
         config_file (Optional[str]): Path to configuration JSON file.
@@ -231,6 +254,10 @@ class Configuration:
     measures: MeasuresConfig
     output: OutputConfig
     terminal_output: int
+    workers: int
+    vectorized: bool
+    cache_dir: Optional[str]
+    cache_size: int
 
     def __init__(self, config_file: str = None):
         config: Dict = {}
@@ -311,7 +338,14 @@ class Configuration:
                 "item_id": {},
                 "item_condition": {},
             },
+            validate_key(
+                config["output"] if "output" in config else {}, "format", str, "csv"
+            ),
         )
         self.terminal_output = (
             config["terminal_output"] if "terminal_output" in config else 0
         )
+        self.workers = validate_key(config, "workers", int, 1)
+        self.vectorized = validate_key(config, "vectorized", bool, False)
+        self.cache_dir = validate_key(config, "cache_dir", str, None)
+        self.cache_size = validate_key(config, "cache_size", int, 256)
@@ -0,0 +1,482 @@
+"""
+Experiment archives store parsed Experiments in a compact binary file, written by
+`Experiment.save` and read by `Experiment.load`, so an experiment can be analyzed
+again without parsing its DA1 or ASC file. An archive starts with a short JSON
+header, which holds the name, file name and date of the experiment and the size of
+each table, followed by the tables of the trials, Items, Regions and fixations of
+the experiment as contiguous columns of integers in the byte order of the machine
+that wrote the archive. Each Item is stored once, and the fixations of each trial
+are a range of the fixation columns. Values that are not always integers, such as
+item numbers and region text, are stored once each as JSON text in a table of
+values, and are referred to by their position in it.
+
+Archives are memory-mapped when they are read, and nothing is built from the
+tables until it is used: each Trial, and the Item it refers to, is built the first
+time it is accessed, and the fixations of each trial are views of the mapped
+columns, so they are not copied, and are only read from the file when they are
+used.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from sideeye.data.point import Point
+from sideeye.data.region import Region
+from sideeye.data.item import Item
+from sideeye.data.sequence import FixationSequence, typed_array
+from sideeye.data.table import ItemTable
+from sideeye.data.trial import Trial
+from sideeye.types import ItemId
+
+MAGIC = b"SIDEEYE\x00"
+# Incremented when the layout of archives changes.
+ARCHIVE_VERSION = 2
+# Magic bytes, version and length of the JSON header.
+PREFIX = struct.Struct("<8sIQ")
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# Names of the columns of the trial, item and region tables, in the order they are
+# stored. Every column holds 64-bit integers. Columns named in VALUE_COLUMNS hold
+# positions in the table of values.
+TABLES = [
+    (
+        "trials",
+        [
+            "index",
+            "time",
+            "item",
+            "first",
+            "length",
+            "include_fixation",
+            "include_saccades",
+        ],
+    ),
+    ("items", ["number", "condition", "labels", "first", "length"]),
+    ("regions", ["start_x", "start_y", "end_x", "end_y", "length", "text"]),
+]
+VALUE_COLUMNS = {
+    "trials": ["time"],
+    "items": ["number", "condition", "labels"],
+    "regions": ["length", "text"],
+}
+# Names and typecodes of the fixation columns, in the order they are stored. They
+# are stored after the other tables and the offsets of the values, and are
+# followed by the JSON text of the values, so every column is aligned.
+COLUMNS = [
+    ("char", "q"),
+    ("line", "q"),
+    ("start", "q"),
+    ("end", "q"),
+    ("region_index", "q"),
+    ("excluded", "b"),
+]
+
+
+def region_numbers(trial: Trial) -> array:
+    """
+    Returns the number of each fixation's region in the trial's item, or -1 if the
+    fixation has no region.
+    """
+    numbers = array("q")
+    for fixation in trial.fixations:
+        number = getattr(fixation.region, "number", None)
+        if fixation.region is None:
+            numbers.append(-1)
+        elif (
+            isinstance(number, int)
+            and 0 <= number < len(trial.item.regions)
+            and trial.item.regions[number] == fixation.region
+        ):
+            numbers.append(number)
+        else:
+            raise ValueError(
+                "Fixation regions must be regions of the trial's item to be archived."
+            )
+    return numbers
+
+
+def fixation_columns(trial: Trial) -> List[array]:
+    """Returns the fixation columns of a trial, in the order they are stored."""
+    fixations = trial.fixations
+    if (
+        isinstance(fixations, FixationSequence)
+        and len(fixations.regions) == len(trial.item.regions)
+        and all(
+            region is item_region
+            for (region, item_region) in zip(fixations.regions, trial.item.regions)
+        )
+    ):
+        return [
+            typed_array(typecode, getattr(fixations, name))
+            for (name, typecode) in COLUMNS
+        ]
+    return [
+        array("q", [fixation.char for fixation in fixations]),
+        array("q", [fixation.line for fixation in fixations]),
+        array("q", [fixation.start for fixation in fixations]),
+        array("q", [fixation.end for fixation in fixations]),
+        region_numbers(trial),
+        array("b", [bool(fixation.excluded) for fixation in fixations]),
+    ]
+
+
+class ValueTable:
+    """
+    The values of an archive, such as item numbers and region text, each stored
+    once as JSON text.
+
+    Attributes:
+        offsets (array): Position of each value in `data`, followed by the length of
+            `data`. Value n is data[offsets[n] : offsets[n + 1]].
+        data (bytearray): JSON text of every value.
+    """
+
+    def __init__(self):
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+        self.positions: Dict[bytes, int] = {}
+
+    def add(self, value: Any) -> int:
+        """Returns the position of a value in the table, adding it if it is new."""
+        text = json.dumps(value).encode()
+        if text not in self.positions:
+            self.positions[text] = len(self.positions)
+            self.data += text
+            self.offsets.append(len(self.data))
+        return self.positions[text]
+
+
+class LazyDict(MutableMapping):
+    """
+    A dictionary whose entries are loaded the first time it is used, and whose
+    values are built the first time they are read. Pickling a LazyDict builds all of
+    its values, and pickles it as a dict.
+
+    Args:
+        load (Callable[[], Dict]): Returns the entries of the dictionary.
+        build (Optional[Callable]): Builds a value from the value returned by
+            `load`. If not provided, values are used as they are loaded.
+    """
+
+    def __init__(self, load: Callable[[], Dict], build: Callable[[Any], Any] = None):
+        self.load = load
+        self.build = build
+        self.entries: Optional[Dict] = None
+        self.pending: Set[Any] = set()
+
+    def data(self) -> Dict:
+        """Returns the entries of the dictionary, loading them if needed."""
+        if self.entries is None:
+            self.entries = self.load()
+            if self.build is not None:
+                self.pending = set(self.entries)
+        return self.entries
+
+    def __getitem__(self, key: Any) -> Any:
+        entries = self.data()
+        if key in self.pending:
+            entries[key] = self.build(entries[key])
+            self.pending.discard(key)
+        return entries[key]
+
+    def __setitem__(self, key: Any, value: Any):
+        self.data()[key] = value
+        self.pending.discard(key)
+
+    def __delitem__(self, key: Any):
+        del self.data()[key]
+        self.pending.discard(key)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.data())
+
+    def __len__(self) -> int:
+        return len(self.data())
+
+    def __reduce__(self):
+        return (dict, (list(self.items()),))
+
+
+class Archive:
+    """
+    A memory-mapped experiment archive. The mapping is private, so changes to the
+    fixations of its trials are not written to the archive.
+
+    Attributes:
+        name (str): Name of the experiment.
+        filename (str): Name of the file the experiment was parsed from.
+        date (Optional[datetime]): Date of the experiment.
+        tables (Dict[str, Dict[str, memoryview]]): Columns of the trial, item,
+            region and fixation tables, by table and column name.
+        items (Dict[int, Item]): Items built so far, by position.
+
+    Args:
+        path (str): Name of the archive file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as archive_file:
+            prefix = archive_file.read(PREFIX.size)
+            if len(prefix) < PREFIX.size:
+                raise ValueError("%s is not a SideEye experiment archive." % path)
+            (magic, version, header_length) = PREFIX.unpack(prefix)
+            if magic != MAGIC:
+                raise ValueError("%s is not a SideEye experiment archive." % path)
+            if version != ARCHIVE_VERSION:
+                raise ValueError(
+                    "%s is an archive of version %d, but version %d is required."
+                    % (path, version, ARCHIVE_VERSION)
+                )
+            header = json.loads(archive_file.read(header_length).decode())
+            data = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(
+                "%s was written on a %s-endian machine." % (path, header["byteorder"])
+            )
+        self.name: str = header["name"]
+        self.filename: str = header["filename"]
+        self.date: Optional[datetime] = (
+            datetime.strptime(header["date"], DATE_FORMAT) if header["date"] else None
+        )
+
+        counts = header["counts"]
+        layout = [
+            (table, name, "q", counts[table])
+            for (table, names) in TABLES
+            for name in names
+        ] + [("values", "offsets", "q", counts["values"] + 1)]
+        layout += [
+            ("fixations", name, typecode, counts["fixations"])
+            for (name, typecode) in COLUMNS
+        ] + [("values", "data", "B", counts["bytes"])]
+        offset = PREFIX.size + header_length
+        view = memoryview(data)
+        self.tables: Dict[str, Dict[str, memoryview]] = {}
+        for (table, name, typecode, count) in layout:
+            size = count * struct.calcsize(typecode)
+            if offset + size > len(data):
+                raise ValueError("%s is not a complete experiment archive." % path)
+            self.tables.setdefault(table, {})[name] = view[
+                offset : offset + size
+            ].cast(typecode)
+            offset += size
+        self.items: Dict[int, Item] = {}
+        self.keys: Dict[int, ItemId] = {}
+        self.values: Dict[int, Any] = {}
+
+    def value(self, position: int) -> Any:
+        """
+        Returns a value of the table of values. Each value is decoded once, and
+        lists are copied, so they are not shared by the objects they are used in.
+        """
+        if position not in self.values:
+            offsets = self.tables["values"]["offsets"]
+            data = self.tables["values"]["data"]
+            self.values[position] = json.loads(
+                data[offsets[position] : offsets[position + 1]].tobytes()
+            )
+        value = self.values[position]
+        return list(value) if isinstance(value, list) else value
+
+    def item_key(self, position: int) -> ItemId:
+        """Returns the number and condition of an item, without building it."""
+        if position not in self.keys:
+            items = self.tables["items"]
+            self.keys[position] = (
+                self.value(items["number"][position]),
+                self.value(items["condition"][position]),
+            )
+        return self.keys[position]
+
+    def item(self, position: int) -> Item:
+        """Returns an item, building it and its regions the first time."""
+        if position not in self.items:
+            items = self.tables["items"]
+            first = items["first"][position]
+            regions = slice(first, first + items["length"][position])
+            (number, condition) = self.item_key(position)
+            self.items[position] = Item(
+                number,
+                condition,
+                [
+                    Region(
+                        Point(start_x, start_y),
+                        Point(end_x, end_y),
+                        self.value(length),
+                        self.value(text),
+                    )
+                    for (start_x, start_y, end_x, end_y, length, text) in zip(
+                        *[
+                            self.tables["regions"][name][regions].tolist()
+                            for name in dict(TABLES)["regions"]
+                        ]
+                    )
+                ],
+                self.value(items["labels"][position]),
+            )
+        return self.items[position]
+
+    def trial(self, position: int) -> Trial:
+        """
+        Returns a new Trial built from the archive. Its fixations are views of the
+        fixation columns.
+        """
+        trials = self.tables["trials"]
+        item = self.item(trials["item"][position])
+        first = trials["first"][position]
+        last = first + trials["length"][position]
+        (char, line, start, end, region_index, excluded) = [
+            self.tables["fixations"][name][first:last] for (name, _) in COLUMNS
+        ]
+        return Trial(
+            trials["index"][position],
+            self.value(trials["time"][position]),
+            item,
+            FixationSequence.from_columns(
+                item, char, line, start, end, excluded, region_index, copy=False
+            ),
+            bool(trials["include_fixation"][position]),
+            bool(trials["include_saccades"][position]),
+        )
+
+    def trials(self) -> LazyDict:
+        """
+        Returns the trials of the archive by (item number, condition), like
+        `Experiment.trials`. Each Trial is built the first time it is read.
+        """
+        trials = self.tables["trials"]
+        return LazyDict(
+            lambda: {
+                self.item_key(item): position
+                for (position, item) in enumerate(trials["item"])
+            },
+            self.trial,
+        )
+
+    def trial_indices(self) -> LazyDict:
+        """Returns the (item number, condition) of each trial index."""
+        trials = self.tables["trials"]
+        return LazyDict(
+            lambda: {
+                index: self.item_key(item)
+                for (index, item) in zip(trials["index"], trials["item"])
+            }
+        )
+
+
+def write(experiment: Any, path: str):
+    """
+    Writes an experiment to an archive. Only the parsed data of the experiment is
+    written, not the measures calculated for it. The archive is written to a
+    temporary file, which replaces `path` once it is complete.
+
+    Args:
+        experiment (Experiment): Experiment to write.
+        path (str): Name of the archive file.
+    """
+    items = ItemTable()
+    values = ValueTable()
+    tables: Dict[str, Dict[str, array]] = {
+        table: {name: array("q") for name in names} for (table, names) in TABLES
+    }
+    columns = [array(typecode) for (_, typecode) in COLUMNS]
+    for trial in experiment.trials.values():
+        row = {
+            "index": trial.index,
+            "time": values.add(trial.time),
+            "item": items.add(trial.item),
+            "first": len(columns[0]),
+            "length": len(trial.fixations),
+            "include_fixation": trial.include_fixation,
+            "include_saccades": trial.include_saccades,
+        }
+        for (name, value) in row.items():
+            tables["trials"][name].append(value)
+        for (column, trial_column) in zip(columns, fixation_columns(trial)):
+            column.extend(trial_column)
+    for item in items:
+        row = {
+            "number": values.add(item.number),
+            "condition": values.add(item.condition),
+            "labels": values.add(
+                None if isinstance(item.labels, range) else list(item.labels)
+            ),
+            "first": len(tables["regions"]["text"]),
+            "length": len(item.regions),
+        }
+        for (name, value) in row.items():
+            tables["items"][name].append(value)
+        for region in item.regions:
+            row = {
+                "start_x": region.start.x,
+                "start_y": region.start.y,
+                "end_x": region.end.x,
+                "end_y": region.end.y,
+                "length": values.add(region.length),
+                "text": values.add(region.text),
+            }
+            for (name, value) in row.items():
+                tables["regions"][name].append(value)
+
+    header = json.dumps(
+        {
+            "name": experiment.name,
+            "filename": experiment.filename,
+            "date": experiment.date.strftime(DATE_FORMAT) if experiment.date else None,
+            "byteorder": sys.byteorder,
+            "counts": {
+                "trials": len(tables["trials"]["index"]),
+                "items": len(tables["items"]["number"]),
+                "regions": len(tables["regions"]["text"]),
+                "values": len(values.offsets) - 1,
+                "bytes": len(values.data),
+                "fixations": len(columns[0]),
+            },
+        }
+    ).encode()
+    header += b" " * (-(PREFIX.size + len(header)) % 8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    (handle, temp_path) = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as archive_file:
+            archive_file.write(PREFIX.pack(MAGIC, ARCHIVE_VERSION, len(header)))
+            archive_file.write(header)
+            for (table, names) in TABLES:
+                for name in names:
+                    archive_file.write(tables[table][name].tobytes())
+            archive_file.write(values.offsets.tobytes())
+            for column in columns:
+                archive_file.write(column.tobytes())
+            archive_file.write(values.data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def read(path: str) -> Tuple[str, str, Optional[datetime], LazyDict, LazyDict]:
+    """
+    Reads the name, file name, date, trials and trial indices of an experiment from
+    an archive. The archive is memory-mapped, and only its header is read: the
+    trials are a LazyDict, which builds each Trial, and its Item, the first time it
+    is read, and the fixation columns of each trial are memoryviews of the mapping.
+
+    Args:
+        path (str): Name of the archive file.
+    """
+    archive = Archive(path)
+    return (
+        archive.name,
+        archive.filename,
+        archive.date,
+        archive.trials(),
+        archive.trial_indices(),
+    )
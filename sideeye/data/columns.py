@@ -0,0 +1,85 @@
+"""
+A columnar view of a trial's fixations. Each attribute of the fixations is stored
+as a NumPy array with one entry per fixation, so measures can be calculated for a
+whole trial with array operations. NumPy is an optional dependency of SideEye,
+installed with ``pip install sideeye[vectorized]``.
+"""
+
+from typing import Sequence
+from sideeye.data.fixation import Fixation
+from sideeye.data.sequence import FixationSequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FixationColumns:
+    """
+    The fixations of a trial, as columns.
+
+    Attributes:
+        start (numpy.ndarray): Start time of each fixation.
+        end (numpy.ndarray): End time of each fixation.
+        duration (numpy.ndarray): Duration of each fixation.
+        char (numpy.ndarray): Character position of each fixation.
+        line (numpy.ndarray): Line position of each fixation.
+        region_number (numpy.ndarray): Number of the region each fixation occurred in,
+            or -1 if the fixation has no region or the region has no number.
+        excluded (numpy.ndarray): Whether each fixation is excluded.
+
+    Args:
+        fixations (Sequence[Fixation]): Fixations of a trial. The columns of a
+            FixationSequence are copied from its arrays.
+    """
+
+    def __init__(self, fixations: Sequence[Fixation]):
+        if numpy is None:
+            raise ImportError(
+                "Columnar fixations require NumPy. Install it with "
+                "`pip install sideeye[vectorized]`."
+            )
+        if isinstance(fixations, FixationSequence):
+            self.from_sequence(fixations)
+            return
+        self.start = numpy.array([fix.start for fix in fixations], dtype=numpy.int64)
+        self.end = numpy.array([fix.end for fix in fixations], dtype=numpy.int64)
+        self.duration = self.end - self.start
+        self.char = numpy.array([fix.char for fix in fixations], dtype=numpy.int64)
+        self.line = numpy.array([fix.line for fix in fixations], dtype=numpy.int64)
+        self.region_number = numpy.array(
+            [
+                fix.region.number
+                if fix.region and fix.region.number is not None
+                else -1
+                for fix in fixations
+            ],
+            dtype=numpy.int64,
+        )
+        self.excluded = numpy.array([fix.excluded for fix in fixations], dtype=bool)
+
+    def from_sequence(self, fixations: FixationSequence):
+        """Copies the columns from the arrays of a FixationSequence."""
+        self.start = numpy.array(fixations.start, dtype=numpy.int64)
+        self.end = numpy.array(fixations.end, dtype=numpy.int64)
+        self.duration = self.end - self.start
+        self.char = numpy.array(fixations.char, dtype=numpy.int64)
+        self.line = numpy.array(fixations.line, dtype=numpy.int64)
+        region_numbers = numpy.array(
+            [
+                region.number
+                if region and getattr(region, "number", None) is not None
+                else -1
+                for region in fixations.regions
+            ]
+            + [-1],
+            dtype=numpy.int64,
+        )
+        self.region_number = region_numbers[
+            numpy.array(fixations.region_index, dtype=numpy.int64)
+        ]
+        self.excluded = numpy.array(fixations.excluded, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.start)
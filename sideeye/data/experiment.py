@@ -4,8 +4,9 @@ a single participant's data.
 """
 
 from datetime import datetime
-from typing import List, Dict
+from typing import List, MutableMapping, Optional
 from sideeye.data.trial import Trial
+from sideeye.data import archive
 from sideeye.types import Condition, ItemNum, ItemId
 
 
@@ -15,11 +16,16 @@ class Experiment:
 
     Attributes:
         name (str): Name of experiment.
-        trials (dict): Dictionary mapping (number, condition) tuples to trials.
+        trials (dict): Dictionary mapping (number, condition) tuples to trials. The
+                       trials of a loaded experiment are built when they are used.
         filename (str): Name of file.
         date (Date): Date of experiment.
         trial_indices (dict): A dictionary mapping trial indices to (number, condition)
                               tuples. Used to locate trials.
+        source_key (Optional[str]): Cache key of the files the experiment was parsed
+                                    from, if it was parsed with a cache directory.
+                                    Saved measures of the experiment are keyed by
+                                    it.
 
     Args:
         name (str): A string name/identifier for the participant.
@@ -32,10 +38,11 @@ class Experiment:
         self, name: str, trials: List[Trial], filename: str = "", date: datetime = None
     ):
         self.name: str = name
-        self.trials: Dict[ItemId, Trial] = {}
+        self.trials: MutableMapping[ItemId, Trial] = {}
         self.filename: str = filename
         self.date: datetime = date if date else datetime.now()
-        self.trial_indices: Dict[int, ItemId] = {}
+        self.trial_indices: MutableMapping[int, ItemId] = {}
+        self.source_key: Optional[str] = None
         for trial in trials:
             self.trials[(trial.item.number, trial.item.condition)] = trial
             self.trial_indices[trial.index] = (trial.item.number, trial.item.condition)
@@ -51,6 +58,33 @@ class Experiment:
             ",\n".join([str(trial) for trial in self.trials]),
         )
 
+    def save(self, path: str):
+        """
+        Save the experiment's parsed data to a binary archive, which can be opened
+        with `Experiment.load` without parsing the experiment again. Calculated
+        measures are not saved.
+
+        Args:
+            path (str): Name of the archive file.
+        """
+        archive.write(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Experiment":
+        """
+        Load an experiment saved with `Experiment.save`. The archive is
+        memory-mapped, so fixations are read from the file as they are used, and
+        each trial is built from the archive the first time it is used.
+
+        Args:
+            path (str): Name of the archive file.
+        """
+        (name, filename, date, trials, trial_indices) = archive.read(path)
+        experiment = cls(name, [], filename, date)
+        experiment.trials = trials
+        experiment.trial_indices = trial_indices
+        return experiment
+
     def get_trial(
         self, number: ItemNum = None, condition: Condition = None, index: int = None
     ) -> Trial:
@@ -34,6 +34,8 @@ class Fixation:
         excluded (Optional[boolean]): Whether the fixation should be excluded from calculations.
     """
 
+    __slots__ = ("excluded", "char", "line", "start", "end", "region", "index")
+
     def __init__(
         self,
         position: Point,
@@ -56,7 +58,23 @@ class Fixation:
 
     def __eq__(self, other) -> bool:
         if self.region:
-            return self.__dict__ == other.__dict__
+            return (
+                self.excluded,
+                self.char,
+                self.line,
+                self.start,
+                self.end,
+                self.region,
+                self.index,
+            ) == (
+                other.excluded,
+                other.char,
+                other.line,
+                other.start,
+                other.end,
+                other.region,
+                other.index,
+            )
         return (
             self.char == other.char
             and self.line == other.line
@@ -4,10 +4,17 @@ A number and condition identify the item, which consists of a list of regions,
 and optionally a list of labels for the regions.
 """
 
-from typing import Sequence, List, Union
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from sideeye.types import ItemNum, Condition
 from sideeye.data.region import Region
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Item:
     """
@@ -20,6 +27,13 @@ class Item:
         labels (List[Union[int, str]]): A list of labels for the regions. If
                                          labels are not provided, integer indices
                                          are used. All labels are unique.
+        region_starts (Optional[array]): The start position of every region after
+                                         the first, as a key that sorts in reading
+                                         order, used to find regions by bisection.
+                                         None if the regions are not in reading order.
+        region_width (int): Line width used to convert positions into keys. It is
+                                         greater than the character position of every
+                                         region start.
     Args:
         number (ItemNum): An identifier for the Item.
         condition (Condition): An identifier for the condition of the Item.
@@ -43,9 +57,18 @@ class Item:
             raise ValueError("Region labels must be unique")
         if not regions:
             raise ValueError("An Item must have at least one Region")
+        # Equal regions have the same boundaries, so each region is only compared
+        # with the regions before it that have the same boundaries.
+        boundaries: Dict[Tuple[int, int, int, int], List[Region]] = {}
         for region in regions:
-            if regions.count(region) > 1:
+            same_boundaries = boundaries.setdefault(
+                (region.start.x, region.start.y, region.end.x, region.end.y), []
+            )
+            if same_boundaries and any(
+                region is other or region == other for other in same_boundaries
+            ):
                 raise ValueError("Regions must be unique.")
+            same_boundaries += [region]
 
         self.labels: Sequence[Union[int, str]] = labels if labels else range(
             len(regions)
@@ -58,6 +81,14 @@ class Item:
         self.condition: Condition = condition
         self.regions: List[Region] = regions
 
+        starts = [(region.start.y, region.start.x) for region in regions[1:]]
+        self.region_width: int = max((x for (_, x) in starts), default=0) + 3
+        self.region_starts: Optional[array] = (
+            array("q", [self.position_key(x, y) for (y, x) in starts])
+            if all(first <= second for (first, second) in zip(starts, starts[1:]))
+            else None
+        )
+
     def __eq__(self, other) -> bool:
         return self.__dict__ == other.__dict__
 
@@ -77,17 +108,25 @@ class Item:
 
     def find_region(self, x_pos: int, y_pos: int) -> Region:
         """
-        Get the region containing position (x_pos, y_pos).
+        Get the region containing position (x_pos, y_pos). This is the last region
+        that starts at or before the position, or the last region in the Item if the
+        position is not after its last line.
 
         Args:
             x_pos (int): X (character) position of a location.
             y_pos (int): Y (line) position of a location.
         """
-        for region in range(1, len(self.regions)):
-            current_x = self.regions[region].start.x
-            current_y = self.regions[region].start.y
-            if (current_x > x_pos and current_y >= y_pos) or (current_y > y_pos):
-                return self.regions[region - 1]
+        if self.region_starts is not None:
+            key = self.position_key(x_pos, y_pos)
+            region = bisect_right(self.region_starts, key)
+            if region < len(self.region_starts):
+                return self.regions[region]
+        else:
+            for region in range(1, len(self.regions)):
+                current_x = self.regions[region].start.x
+                current_y = self.regions[region].start.y
+                if (current_x > x_pos and current_y >= y_pos) or (current_y > y_pos):
+                    return self.regions[region - 1]
 
         if (
             x_pos <= self.regions[-1].end.x and y_pos <= self.regions[-1].end.y
@@ -103,6 +142,71 @@ class Item:
             + str(self)
         )
 
+    def find_region_numbers(
+        self, x_positions: Sequence[int], y_positions: Sequence[int]
+    ) -> array:
+        """
+        Get the numbers of the regions containing a list of positions, with the
+        same result as calling `find_region` for each position. If NumPy is
+        installed, all positions are looked up with one vectorized search.
+
+        Args:
+            x_positions (Sequence[int]): X (character) position of each location.
+            y_positions (Sequence[int]): Y (line) position of each location.
+        """
+        if len(x_positions) != len(y_positions):
+            raise ValueError("Number of x and y positions must be equal.")
+        if numpy is None or self.region_starts is None:
+            return array(
+                "q",
+                [
+                    self.find_region(x_pos, y_pos).number
+                    for (x_pos, y_pos) in zip(x_positions, y_positions)
+                ],
+            )
+        x_array = numpy.asarray(x_positions, dtype=numpy.int64)
+        y_array = numpy.asarray(y_positions, dtype=numpy.int64)
+        if len(y_array) and y_array.max() > self.regions[-1].end.y:
+            first = int(numpy.argmax(y_array > self.regions[-1].end.y))
+            self.find_region(x_positions[first], y_positions[first])
+        keys = y_array * self.region_width
+        keys += numpy.minimum(numpy.maximum(x_array, -1), self.region_width - 2)
+        keys += 1
+        numbers = numpy.searchsorted(
+            numpy.frombuffer(self.region_starts, dtype=numpy.int64), keys, "right"
+        )
+        result = array("q")
+        result.frombytes(numbers.astype(numpy.int64).tobytes())
+        return result
+
+    def find_regions(
+        self, x_positions: Sequence[int], y_positions: Sequence[int]
+    ) -> List[Region]:
+        """
+        Get the regions containing a list of positions, with the same result as
+        calling `find_region` for each position.
+
+        Args:
+            x_positions (Sequence[int]): X (character) position of each location.
+            y_positions (Sequence[int]): Y (line) position of each location.
+        """
+        return [
+            self.regions[number]
+            for number in self.find_region_numbers(x_positions, y_positions)
+        ]
+
+    def position_key(self, x_pos: int, y_pos: int) -> int:
+        """
+        Get a key for position (x_pos, y_pos) that orders positions in reading
+        order relative to the start positions of the regions.
+
+        Args:
+            x_pos (int): X (character) position of a location.
+            y_pos (int): Y (line) position of a location.
+        """
+        char = min(max(x_pos, -1), self.region_width - 2)
+        return y_pos * self.region_width + char + 1
+
     def region_count(self) -> int:
         """Get the number of Regions in the Item."""
         return len(self.regions)
@@ -13,6 +13,8 @@ class Point:
         y (int): y location.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int, y: int):
         self.x = x  # pylint: disable=invalid-name
         self.y = y  # pylint: disable=invalid-name
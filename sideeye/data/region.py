@@ -30,6 +30,8 @@ class Region:
         number (Optional[int]): A number identifier for the region.
     """
 
+    __slots__ = ("start", "end", "length", "label", "text", "number")
+
     def __init__(
         self,
         start: Point,
@@ -54,7 +56,21 @@ class Region:
         self.number: Optional[int] = number
 
     def __eq__(self, other) -> bool:
-        return self.__dict__ == other.__dict__
+        return (
+            self.start,
+            self.end,
+            self.length,
+            self.label,
+            self.text,
+            self.number,
+        ) == (
+            other.start,
+            other.end,
+            other.length,
+            other.label,
+            other.text,
+            other.number,
+        )
 
     def __str__(self) -> str:
         return "(start: {}, end: {}, length: {}, label: {}, number: {}, text: {})".format(
@@ -20,6 +20,8 @@ class Saccade:
         end (Fixation): The fixation after the saccade.
     """
 
+    __slots__ = ("duration", "regression", "start", "end")
+
     def __init__(self, duration: int, regression: bool, start: Fixation, end: Fixation):
         if duration < 0:
             raise ValueError("Duration of saccade must be positive.")
@@ -31,7 +33,12 @@ class Saccade:
 
     def __eq__(self, other) -> bool:
         """Check if two Saccades are equivalent"""
-        return self.__dict__ == other.__dict__
+        return (self.duration, self.regression, self.start, self.end) == (
+            other.duration,
+            other.regression,
+            other.start,
+            other.end,
+        )
 
     def __str__(self) -> str:
         """Convert Saccade into a string."""
@@ -42,5 +49,5 @@ class Saccade:
                 "start": self.start,
                 "end": self.end,
             },
-            default=lambda x: str(x) if isinstance(x, Fixation) else x.__dict__,
+            default=str,
         )
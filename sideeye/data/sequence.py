@@ -0,0 +1,392 @@
+"""
+A FixationSequence stores the fixations of a trial in arrays, with one entry per
+fixation for each attribute, instead of as a list of Fixation objects. Indexing or
+iterating over the sequence returns FixationViews, which behave like Fixations but
+read and write the arrays, so code written for lists of Fixations works unchanged.
+Parsers fill sequences directly with `FixationSequence.add`, without creating a
+Fixation object for every fixation, and then assign the regions of all fixations
+at once with `FixationSequence.assign_regions`.
+
+Every write to a sequence gives it a new `version`, so values computed from a
+trial's fixations, such as its first pass fixations, can be cached on the trial
+until the fixations change.
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import count
+from typing import Any, Iterator, List, Optional, Sequence as SequenceType, Union
+from sideeye.data.point import Point
+from sideeye.data.region import Region
+from sideeye.data.fixation import Fixation
+from sideeye.data.item import Item
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Source of FixationSequence versions. A sequence takes a new version when it is
+# created and on every write, so no two sequences or states share a version.
+VERSIONS = count()
+
+
+def typed_array(typecode: str, values: SequenceType[int]) -> array:
+    """
+    Copies integers into an array with a typecode of "q" or "b". NumPy arrays and
+    memoryviews are copied from their buffers.
+    """
+    if isinstance(values, memoryview) and values.format == typecode:
+        result = array(typecode)
+        result.frombytes(values.cast("B"))
+        return result
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        result = array(typecode)
+        result.frombytes(
+            values.astype(numpy.int64 if typecode == "q" else numpy.int8).tobytes()
+        )
+        return result
+    return array(typecode, values)
+
+
+class FixationView(Fixation):
+    """
+    A Fixation stored at a position in a FixationSequence. Attributes are read from
+    and written to the sequence's arrays. The index of a view is its position in
+    the sequence, and cannot be changed. A pickled view is unpickled as a Fixation.
+
+    Args:
+        sequence (FixationSequence): Sequence the fixation is stored in.
+        position (int): Position of the fixation in the sequence.
+    """
+
+    __slots__ = ("sequence", "position")
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, sequence: "FixationSequence", position: int):
+        self.sequence = sequence
+        self.position = position
+
+    def __reduce__(self):
+        return (
+            Fixation,
+            (
+                Point(self.char, self.line),
+                self.start,
+                self.end,
+                self.index,
+                self.region,
+                self.excluded,
+            ),
+        )
+
+    @property
+    def char(self) -> int:  # type: ignore
+        """Character position of the fixation."""
+        return self.sequence.char[self.position]
+
+    @char.setter
+    def char(self, value: int):
+        self.sequence.char[self.position] = value
+        self.sequence.changed()
+
+    @property
+    def line(self) -> int:  # type: ignore
+        """Line position of the fixation."""
+        return self.sequence.line[self.position]
+
+    @line.setter
+    def line(self, value: int):
+        self.sequence.line[self.position] = value
+        self.sequence.changed()
+
+    @property
+    def start(self) -> int:  # type: ignore
+        """Start time of the fixation."""
+        return self.sequence.start[self.position]
+
+    @start.setter
+    def start(self, value: int):
+        self.sequence.start[self.position] = value
+        self.sequence.changed()
+
+    @property
+    def end(self) -> int:  # type: ignore
+        """End time of the fixation."""
+        return self.sequence.end[self.position]
+
+    @end.setter
+    def end(self, value: int):
+        self.sequence.end[self.position] = value
+        self.sequence.changed()
+
+    @property
+    def excluded(self) -> bool:  # type: ignore
+        """Whether the fixation is excluded from calculations."""
+        return bool(self.sequence.excluded[self.position])
+
+    @excluded.setter
+    def excluded(self, value: bool):
+        self.sequence.excluded[self.position] = bool(value)
+        self.sequence.changed()
+
+    @property
+    def region(self) -> Optional[Region]:  # type: ignore
+        """Region the fixation occurred in."""
+        return self.sequence.region_at(self.position)
+
+    @region.setter
+    def region(self, value: Optional[Region]):
+        self.sequence.region_index[self.position] = self.sequence.index_of(value)
+        self.sequence.changed()
+
+    @property
+    def index(self) -> int:  # type: ignore
+        """Index of the fixation in the trial."""
+        return self.position
+
+
+class FixationSequence(Sequence):
+    """
+    The fixations of a trial, stored in arrays.
+
+    Attributes:
+        char (array): Character position of each fixation.
+        line (array): Line position of each fixation.
+        start (array): Start time of each fixation.
+        end (array): End time of each fixation.
+        excluded (array): Whether each fixation is excluded, as 0 or 1.
+        region_index (array): Position of each fixation's region in `regions`, or
+            -1 if the fixation has no region. If the sequence is created with the
+            regions of an item, this is the number of the region.
+        regions (List[Region]): Regions of the fixations.
+        version (int): Changed on every write through the sequence or its views.
+            Writing to the arrays directly must be followed by `changed`.
+
+    Args:
+        regions (Optional[Sequence[Region]]): Regions of the item the fixations are
+            in. Other regions are added to `regions` when they are first used.
+        fixations (Optional[Iterable[Fixation]]): Fixations to add to the sequence.
+    """
+
+    def __init__(
+        self,
+        regions: SequenceType[Region] = None,
+        fixations: SequenceType[Fixation] = None,
+    ):
+        self.char = array("q")
+        self.line = array("q")
+        self.start = array("q")
+        self.end = array("q")
+        self.excluded = array("b")
+        self.region_index = array("q")
+        self.regions: List[Any] = list(regions) if regions else []
+        self.version = next(VERSIONS)
+        for fixation in fixations or []:
+            self.append(fixation)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getstate__(self):
+        # The version is not pickled, so equal sequences pickle the same, and an
+        # unpickled sequence takes a new version.
+        return {
+            name: typed_array(column.format, column)
+            if isinstance(column, memoryview)
+            else column
+            for (name, column) in self.__dict__.items()
+            if name != "version"
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.changed()
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return [FixationView(self, position) for position in range(len(self))[key]]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Fixation index out of range.")
+        return FixationView(self, key)
+
+    def __setitem__(self, key: int, fixation: Fixation):
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Fixation index out of range.")
+        self.char[key] = fixation.char
+        self.line[key] = fixation.line
+        self.start[key] = fixation.start
+        self.end[key] = fixation.end
+        self.excluded[key] = bool(fixation.excluded)
+        self.region_index[key] = self.index_of(fixation.region)
+        self.changed()
+
+    def __iadd__(self, fixations: SequenceType[Fixation]) -> "FixationSequence":
+        self.extend(fixations)
+        return self
+
+    def __iter__(self) -> Iterator[FixationView]:
+        for position in range(len(self)):
+            yield FixationView(self, position)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (FixationSequence, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            fixation == other_fixation
+            for (fixation, other_fixation) in zip(self, other)
+        )
+
+    def __str__(self) -> str:
+        return "[{}]".format(", ".join(str(fixation) for fixation in self))
+
+    def changed(self):
+        """Gives the sequence a new version, after its fixations are changed."""
+        self.version = next(VERSIONS)
+
+    def index_of(self, region: Optional[Region]) -> int:
+        """Returns the position of a region in `regions`, adding it if needed."""
+        if region is None:
+            return -1
+        number = getattr(region, "number", None)
+        if (
+            isinstance(number, int)
+            and 0 <= number < len(self.regions)
+            and self.regions[number] is region
+        ):
+            return number
+        for (position, known) in enumerate(self.regions):
+            if known is region:
+                return position
+        self.regions.append(region)
+        return len(self.regions) - 1
+
+    def region_at(self, position: int) -> Optional[Region]:
+        """Returns the region of the fixation at a position."""
+        region_index = self.region_index[position]
+        return None if region_index < 0 else self.regions[region_index]
+
+    @classmethod
+    def from_columns(
+        cls,
+        item: Item,
+        char: SequenceType[int],
+        line: SequenceType[int],
+        start: SequenceType[int],
+        end: SequenceType[int],
+        excluded: SequenceType[int],
+        region_number: SequenceType[int] = None,
+        copy: bool = True,
+    ) -> "FixationSequence":
+        """
+        Creates a sequence from columns of fixation attributes, such as NumPy
+        arrays, in the regions of an Item. Unlike `add`, the columns are not
+        validated, so times must already be checked and fixations with a negative
+        position must already be excluded.
+
+        Args:
+            item (Item): Item the fixations are in.
+            char (Sequence[int]): Character position of each fixation.
+            line (Sequence[int]): Line position of each fixation.
+            start (Sequence[int]): Start time of each fixation.
+            end (Sequence[int]): End time of each fixation.
+            excluded (Sequence[int]): Whether each fixation is excluded.
+            region_number (Optional[Sequence[int]]): Number of the region of each
+                fixation in the Item. If not provided, regions are assigned with
+                `assign_regions`.
+            copy (bool): Whether to copy the columns into arrays. If False, the
+                columns are used as they are, such as memoryviews of an experiment
+                archive, and the sequence cannot be extended.
+        """
+        if not len(char) == len(line) == len(start) == len(end) == len(excluded):
+            raise ValueError("Fixation columns must have the same length.")
+        if region_number is not None and len(region_number) != len(char):
+            raise ValueError("Fixation columns must have the same length.")
+        sequence = cls.__new__(cls)
+        sequence.regions = list(item.regions)
+        sequence.version = next(VERSIONS)
+        column = typed_array if copy else lambda typecode, values: values
+        sequence.char = column("q", char)
+        sequence.line = column("q", line)
+        sequence.start = column("q", start)
+        sequence.end = column("q", end)
+        sequence.excluded = column("b", excluded)
+        if region_number is None:
+            sequence.assign_regions(item)
+        else:
+            sequence.region_index = column("q", region_number)
+        return sequence
+
+    def assign_regions(self, item: Item):
+        """
+        Sets the region of every fixation to the region of an Item containing its
+        position. The regions of all fixations are found with one call to
+        `Item.find_region_numbers`.
+
+        Args:
+            item (Item): Item the fixations are in.
+        """
+        self.region_index = item.find_region_numbers(self.char, self.line)
+        self.regions = list(item.regions)
+        self.changed()
+
+    def add(
+        self,
+        char: int,
+        line: int,
+        start: int,
+        end: int,
+        region: Optional[Region],
+        excluded: bool = False,
+    ):
+        """
+        Adds a fixation to the end of the sequence, with the same validation as
+        `Fixation`.
+
+        Args:
+            char (int): Character position of the fixation.
+            line (int): Line position of the fixation.
+            start (int): Start time of the fixation, in milliseconds.
+            end (int): End time of the fixation, in milliseconds.
+            region (Optional[Region]): Region the fixation occurred in.
+            excluded (bool): Whether the fixation should be excluded from
+                calculations. Fixations with a negative position are always excluded.
+        """
+        if start > end or start < 0 or end < 0:
+            raise ValueError("Invalid start or end time.")
+        self.char.append(char)
+        self.line.append(line)
+        self.start.append(start)
+        self.end.append(end)
+        self.excluded.append(char < 0 or line < 0 or bool(excluded))
+        self.region_index.append(self.index_of(region))
+        self.changed()
+
+    def append(self, fixation: Fixation):
+        """
+        Adds a copy of a Fixation to the end of the sequence.
+
+        Args:
+            fixation (Fixation): Fixation to add.
+        """
+        self.char.append(fixation.char)
+        self.line.append(fixation.line)
+        self.start.append(fixation.start)
+        self.end.append(fixation.end)
+        self.excluded.append(bool(fixation.excluded))
+        self.region_index.append(self.index_of(fixation.region))
+        self.changed()
+
+    def extend(self, fixations: SequenceType[Fixation]):
+        """
+        Adds copies of Fixations to the end of the sequence.
+
+        Args:
+            fixations (Sequence[Fixation]): Fixations to add.
+        """
+        for fixation in list(fixations):
+            self.append(fixation)
@@ -0,0 +1,242 @@
+"""
+An ItemTable interns the Items of an experiment, so that each Item and its Regions
+exist once and are identified by an item id, their position in the table. A
+Region is identified by the id of its Item and its region number.
+
+Experiments and Trials refer to Items and Regions directly. When they are pickled
+with an ItemTable (`ItemTable.dumps`), every Item and Region of the table is
+written as its (item id, region number) reference instead of as a copy, and is
+unpickled as the table's object (`ItemTable.loads`). This keeps the Items out of
+experiments sent between processes or stored in the parse cache, as long as the
+reader has the same table.
+"""
+
+import copyreg
+import io
+import pickle
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from sideeye.data.item import Item
+from sideeye.data.region import Region
+from sideeye.types import Condition, ItemNum
+
+# Reference to an Item, ("item", item id), or a Region, ("region", item id,
+# region number), written in place of the object by TablePickler.
+Reference = Tuple[Any, ...]
+
+
+def table_reference(*reference: Any) -> Any:
+    """
+    Stands in for the Item or Region of a reference in pickles written by
+    TablePickler. TableUnpickler replaces it with a function resolving the
+    reference in its table, so it is never called by that unpickler.
+    """
+    raise pickle.UnpicklingError(
+        "Reference %r must be unpickled with ItemTable.load." % (reference,)
+    )
+
+
+class ItemTable:
+    """
+    A table of interned Items.
+
+    Attributes:
+        items (List[Item]): Items in the table. The id of an Item is its position.
+
+    Args:
+        items (Optional[List[Item]]): Items to add to the table.
+    """
+
+    def __init__(self, items: List[Item] = None):
+        self.items: List[Item] = []
+        self.keys: Dict[Tuple[ItemNum, Condition], List[int]] = {}
+        # Maps the id() of every Item and Region added to the table to the object
+        # and its reference. Added objects are kept alive by `aliases`, so their
+        # id() values are not reused.
+        self.references: Dict[int, Tuple[Any, Reference]] = {}
+        self.aliases: List[Item] = []
+        for item in items or []:
+            self.add(item)
+
+    def __reduce__(self):
+        return (ItemTable, (self.items,))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self.items)
+
+    def __getitem__(self, item_id: int) -> Item:
+        return self.items[item_id]
+
+    @classmethod
+    def from_dict(cls, items: Dict[ItemNum, Dict[Condition, Item]]) -> "ItemTable":
+        """
+        Creates a table of the items returned by the region parsers.
+
+        Args:
+            items (Dict[ItemNum, Dict[Condition, Item]]): Items by number and
+                condition.
+        """
+        return cls(
+            [
+                item
+                for conditions in items.values()
+                for item in conditions.values()
+                if item
+            ]
+        )
+
+    def as_dict(self) -> Dict[ItemNum, Dict[Condition, Item]]:
+        """
+        Returns the items of the table by number and condition, as returned by the
+        region parsers. If several items have the same number and condition, the
+        first is used.
+        """
+        items: Dict[ItemNum, Dict[Condition, Item]] = {}
+        for item in self.items:
+            items.setdefault(item.number, {}).setdefault(item.condition, item)
+        return items
+
+    def add(self, item: Item) -> int:
+        """
+        Adds an Item to the table, unless it or an equal Item is already in the
+        table, and returns its id. An equal Item is pickled as the Item in the
+        table, and so are its Regions.
+
+        Args:
+            item (Item): Item to add.
+        """
+        known = self.references.get(id(item))
+        if known is not None and known[0] is item:
+            return known[1][1]
+        same_key = self.keys.setdefault((item.number, item.condition), [])
+        for item_id in same_key:
+            if self.items[item_id] == item:
+                break
+        else:
+            item_id = len(self.items)
+            self.items += [item]
+            same_key += [item_id]
+        self.aliases += [item]
+        self.references[id(item)] = (item, ("item", item_id))
+        for (number, region) in enumerate(item.regions):
+            self.references[id(region)] = (region, ("region", item_id, number))
+        return item_id
+
+    def intern(self, item: Item) -> Item:
+        """
+        Returns the Item of the table equal to an Item, adding it if needed.
+
+        Args:
+            item (Item): Item to intern.
+        """
+        return self.items[self.add(item)]
+
+    def region(self, item_id: int, number: int) -> Region:
+        """
+        Returns a Region by the id of its Item and its region number.
+
+        Args:
+            item_id (int): Id of the Item.
+            number (int): Number of the Region in the Item.
+        """
+        return self.items[item_id].regions[number]
+
+    def reference(self, value: Any) -> Optional[Reference]:
+        """Returns the reference of an Item or Region of the table, or None."""
+        known = self.references.get(id(value))
+        return known[1] if known is not None and known[0] is value else None
+
+    def resolve(self, reference: Reference) -> Any:
+        """Returns the Item or Region of a reference."""
+        try:
+            if reference[0] == "item":
+                return self.items[reference[1]]
+            if reference[0] == "region":
+                return self.region(reference[1], reference[2])
+        except (IndexError, TypeError):
+            pass
+        raise pickle.UnpicklingError(
+            "Reference %r is not in the item table." % (reference,)
+        )
+
+    def dump(self, value: Any, file: BinaryIO):
+        """
+        Pickles a value to a file, writing the Items and Regions of the table as
+        references.
+
+        Args:
+            value (Any): Value to pickle.
+            file (BinaryIO): File to write to.
+        """
+        TablePickler(file, self).dump(value)
+
+    def load(self, file: BinaryIO) -> Any:
+        """
+        Unpickles a value pickled by `dump`, with references resolved to the Items
+        and Regions of this table.
+
+        Args:
+            file (BinaryIO): File to read from.
+        """
+        return TableUnpickler(file, self).load()
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Pickles a value, writing the Items and Regions of the table as references.
+
+        Args:
+            value (Any): Value to pickle.
+        """
+        data = io.BytesIO()
+        self.dump(value, data)
+        return data.getvalue()
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Unpickles a value pickled by `dumps`.
+
+        Args:
+            data (bytes): Pickled value.
+        """
+        return self.load(io.BytesIO(data))
+
+
+class TablePickler(pickle.Pickler):
+    """
+    Pickler writing the Items and Regions of an ItemTable as references. Only
+    Items and Regions are looked up in the table, through the pickler's dispatch
+    table, so other objects are pickled at full speed.
+    """
+
+    def __init__(self, file: BinaryIO, table: ItemTable):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.table = table
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        self.dispatch_table[Item] = self.reduce_reference
+        self.dispatch_table[Region] = self.reduce_reference
+
+    def reduce_reference(self, obj: Any) -> Any:
+        """Reduces an Item or Region to its reference, if it is in the table."""
+        reference = self.table.reference(obj)
+        if reference is None:
+            return obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+        return (table_reference, reference)
+
+
+class TableUnpickler(pickle.Unpickler):
+    """Unpickler resolving references written by TablePickler."""
+
+    def __init__(self, file: BinaryIO, table: ItemTable):
+        super().__init__(file)
+        self.table = table
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == __name__ and name == table_reference.__name__:
+            return self.resolve_reference
+        return super().find_class(module, name)
+
+    def resolve_reference(self, *reference: Any) -> Any:
+        """Returns the Item or Region of a reference in the table."""
+        return self.table.resolve(reference)
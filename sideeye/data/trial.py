@@ -6,13 +6,16 @@ of trial and region measures calculated for the Trial.
 """
 
 import json
-from typing import List
+from functools import partial
+from typing import Any, List, Optional, Sequence, Tuple
 from collections import defaultdict
 from sideeye.data.saccade import Saccade
 from sideeye.data.point import Point
 from sideeye.data.item import Item
 from sideeye.data.fixation import Fixation
-from sideeye.types import Measures, TrialMeasures
+from sideeye.data.sequence import FixationSequence, FixationView
+from sideeye.data.columns import FixationColumns
+from sideeye.types import Measures, TrialMeasures, FirstPassCache
 
 
 class Trial:
@@ -23,16 +26,35 @@ class Trial:
         index (int): Trial index.
         time (int): Total time of trial in milliseconds.
         item (Item): Item corresponding to trial data.
-        fixations (List[Fixation]): List of fixations in trial.
-        saccades (List[Saccade]): A list of saccades in the trial.
+        fixations (FixationSequence): Fixations in trial. Fixations assigned as a
+            list are copied into a FixationSequence.
+        saccades (List[Saccade]): A list of saccades in the trial, found from the
+            fixations when they are first used.
+        include_fixation (bool): Whether excluded fixations are included in saccades.
+        include_saccades (bool): Whether saccades surrounding excluded fixations are
+            included in saccades.
         trial_measures (dict): Trial measures that have been calculated for the trial.
         region_measures (dict): Region measures that have been calculated for the trial.
+        first_pass_cache (Optional[tuple]): First pass fixations of every region, cached
+            by `sideeye.measures.helpers.get_fp_table`. Not compared by `==`.
+        column_cache (Optional[tuple]): Columnar view of the fixations, cached by
+            `columns`. Not compared by `==`.
+        saccade_cache (Optional[tuple]): Saccades of the trial, or None if they have
+            not been used yet. Not compared by `==`.
+
+    The caches are keyed on the version of the fixations (see `FixationSequence`),
+    so they are rebuilt when the fixations are replaced or changed, and are not
+    pickled. Trials are compared by their data, so `include_fixation` and
+    `include_saccades` are not compared by `==`, but the saccades they produce are.
 
     Args:
         index (int): An identifier for the Trial. Must be greater than or equal to 0.
         time (int): Total time of the Trial in milliseconds.
         item (Item): An Item corresponding to the Trial.
-        fixations (List[Fixation]): A list of Fixations in the Trial.
+        fixations (Sequence[Fixation]): A list or FixationSequence of Fixations in the
+                                         Trial. A list is copied into a
+                                         FixationSequence, and the index of each of its
+                                         Fixations is set to its position.
         include_fixation (bool): Boolean indicating whether an excluded fixation should be
                                  included in a saccade.
         include_saccades (bool): Boolean indicating whether saccades surrounding an excluded
@@ -44,7 +66,7 @@ class Trial:
         index: int,
         time: int,
         item: Item,
-        fixations: List[Fixation],
+        fixations: Sequence[Fixation],
         include_fixation: bool = False,
         include_saccades: bool = False,
     ):
@@ -56,9 +78,98 @@ class Trial:
         if time and time < 0:
             raise ValueError("Total time must be positive.")
 
+        self.index: int = index
+        self.time: int = time
+        self.item: Item = item
+        self.fixations = fixations
+        self.include_fixation: bool = include_fixation
+        self.include_saccades: bool = include_saccades
+        self.trial_measures: TrialMeasures = defaultdict(dict)
+        self.region_measures: Measures = defaultdict(partial(defaultdict, dict))
+        self.first_pass_cache: FirstPassCache = None
+        self.column_cache: Optional[Tuple[int, FixationColumns]] = None
+        self.saccade_cache: Optional[Tuple[Any, List[Saccade]]] = None
+
+    def __getstate__(self):
+        # Cache keys are versions of this process's fixations, so caches are not
+        # pickled.
+        return dict(
+            self.__dict__, first_pass_cache=None, column_cache=None, saccade_cache=None
+        )
+
+    def __eq__(self, other) -> bool:
+        ignored = {
+            "first_pass_cache": None,
+            "column_cache": None,
+            "saccade_cache": None,
+            "include_fixation": None,
+            "include_saccades": None,
+        }
+        return (
+            dict(self.__dict__, **ignored) == dict(other.__dict__, **ignored)
+            and self.saccades == other.saccades
+        )
+
+    def __str__(self) -> str:
+        return json.dumps(
+            {
+                "index": self.index,
+                "time": self.time,
+                "item": self.item,
+                "fixation count": len(self.fixations),
+                "fixations": list(self.fixations),
+                "saccade count": len(self.saccades),
+                "saccades": self.saccades,
+            },
+            indent=4,
+            default=lambda x: str(x)
+            if isinstance(x, (Fixation, Item))
+            else {slot: getattr(x, slot) for slot in x.__slots__},
+        )
+
+    @property
+    def fixations(self) -> FixationSequence:
+        """The fixations in the trial."""
+        return self.fixation_sequence
+
+    @fixations.setter
+    def fixations(self, fixations: Sequence[Fixation]):
+        if not isinstance(fixations, FixationSequence):
+            for (idx, fixation) in enumerate(fixations):
+                if not isinstance(fixation, FixationView):
+                    fixation.index = idx
+            fixations = FixationSequence(self.item.regions, fixations)
+        self.fixation_sequence = fixations
+
+    def saccade_key(self) -> Tuple[int, bool, bool]:
+        """Returns the key of the saccades of the trial in `saccade_cache`."""
+        return (self.fixations.version, self.include_fixation, self.include_saccades)
+
+    @property
+    def saccades(self) -> List[Saccade]:
+        """
+        The saccades in the trial. They are found from the fixations the first time
+        they are used, and cached in `saccade_cache` until the fixations or the
+        saccade settings change.
+        """
+        key = self.saccade_key()
+        if self.saccade_cache is None or self.saccade_cache[0] != key:
+            self.saccade_cache = (key, self.find_saccades())
+        return self.saccade_cache[1]
+
+    @saccades.setter
+    def saccades(self, saccades: List[Saccade]):
+        self.saccade_cache = (self.saccade_key(), saccades)
+
+    def find_saccades(self) -> List[Saccade]:
+        """
+        Find the saccades between the fixations in the trial, as defined by
+        `include_fixation` and `include_saccades`.
+        """
         saccades: List[Saccade] = []
         saccade_start = None
         saccade_duration = 0
+        fixations = self.fixations
         for key, fixation in enumerate(fixations):
             saccade_start = (
                 fixation
@@ -66,7 +177,7 @@ class Trial:
                 else saccade_start
             )
             if not fixation.excluded:
-                if not fixations[key - 1].excluded or include_saccades:
+                if not fixations[key - 1].excluded or self.include_saccades:
                     saccade_duration += fixation.start - fixations[key - 1].end
                 if saccade_start and saccade_duration > 0:
                     if fixation.char is None or fixation.line is None:
@@ -94,39 +205,22 @@ class Trial:
                 saccade_start = fixation
                 saccade_duration = 0
             else:
-                if include_fixation:
+                if self.include_fixation:
                     saccade_duration += fixation.duration()
-                if include_saccades:
+                if self.include_saccades:
                     saccade_duration += fixation.start - fixations[key - 1].end
 
-        for (idx, fixation) in enumerate(fixations):
-            fixation.index = idx
-
-        self.index: int = index
-        self.time: int = time
-        self.item: Item = item
-        self.fixations: List[Fixation] = fixations
-        self.saccades: List[Saccade] = saccades
-        self.trial_measures: TrialMeasures = defaultdict(dict)
-        self.region_measures: Measures = defaultdict(lambda: defaultdict(dict))
-
-    def __eq__(self, other) -> bool:
-        return self.__dict__ == other.__dict__
+        return saccades
 
-    def __str__(self) -> str:
-        return json.dumps(
-            {
-                "index": self.index,
-                "time": self.time,
-                "item": self.item,
-                "fixation count": len(self.fixations),
-                "fixations": self.fixations,
-                "saccade count": len(self.saccades),
-                "saccades": self.saccades,
-            },
-            indent=4,
-            default=lambda x: str(x) if isinstance(x, (Fixation, Item)) else x.__dict__,
-        )
+    def columns(self) -> FixationColumns:
+        """
+        Return a columnar view of the fixations in the trial. The view is built once
+        and rebuilt if `fixations` is replaced or changed. Requires NumPy.
+        """
+        key = self.fixations.version
+        if self.column_cache is None or self.column_cache[0] != key:
+            self.column_cache = (key, FixationColumns(self.fixations))
+        return self.column_cache[1]
 
     def fixation_count(self) -> int:
         """Return the number of fixations in the item."""
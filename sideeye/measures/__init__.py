@@ -2,4 +2,44 @@
 Region and trial-based measures.
 """
 
-from . import region, trial
+import hashlib
+import inspect
+from typing import Dict, List
+from . import region, trial, vectorized, helpers, engine
+
+# Modules whose code is used by every measure.
+SHARED_MODULES = [helpers, engine, vectorized]
+
+
+def measure_sources() -> Dict[str, List[str]]:
+    """
+    Returns the source code of the functions implementing each region and trial
+    measure, by measure name.
+    """
+    sources: Dict[str, List[str]] = {}
+    for module in [region, trial]:
+        for (name, function) in vars(module).items():
+            if inspect.isfunction(function) and function.__module__.startswith(
+                module.__name__
+            ):
+                sources.setdefault(name, []).append(inspect.getsource(function))
+    return sources
+
+
+def measure_versions() -> Dict[str, str]:
+    """
+    Returns the version of each measure: a digest of the source code of the
+    functions implementing it and of the modules shared by all measures.
+    """
+    shared = "".join(inspect.getsource(module) for module in SHARED_MODULES)
+    return {
+        name: hashlib.sha256("".join([shared, *sources]).encode()).hexdigest()[:16]
+        for (name, sources) in measure_sources().items()
+    }
+
+
+# Versions of the implementations of measures. Saved measure results (see
+# `sideeye.calculate.load_saved_measures`) are only reused if they were calculated
+# by the same version of a measure, so changing the code of a measure, or of the
+# engine and helpers shared by all measures, invalidates its saved results.
+VERSIONS: Dict[str, str] = measure_versions()
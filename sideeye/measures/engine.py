@@ -0,0 +1,690 @@
+"""
+A fused engine for calculating region measures. Each function in
+`sideeye.measures.region` rescans a trial's fixations for a single region, so
+calculating every measure for every region of a trial takes time proportional to
+the number of measures times the number of regions times the number of fixations.
+The engine instead walks a trial's fixations a small, constant number of times to
+build tables shared by all measures, and then reads each measure for every region
+off those tables. Results are identical to the per-region functions.
+
+Each measure, including the trial measures, declares the intermediate tables it is
+calculated from in `MEASURE_INTERMEDIATES`. A planner (`plan_intermediates`) builds
+only the intermediates needed by the requested measures, each once per trial, so
+adding a measure to a run costs the tables it alone needs, not another scan.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sideeye.data import Trial, Fixation, Saccade
+from sideeye.measures import region as region_measures
+from sideeye.measures.helpers import (
+    get_fp_table,
+    region_exists,
+    save_measure,
+    save_trial_measure,
+)
+
+MeasureValue = Tuple[Any, Optional[List[Fixation]]]
+
+
+def can_fuse(trial: Trial) -> bool:
+    """
+    Returns True if every fixation in the trial lies in a numbered region of the
+    trial's item and is indexed by its position in the trial, which the fused engine
+    requires.
+
+    Args:
+        trial (Trial): A trial.
+    """
+    count = len(trial.item.regions)
+    for (index, fixation) in enumerate(trial.fixations):
+        number = fixation.region.number if fixation.region else None
+        if fixation.index != index or not isinstance(number, int):
+            return False
+        if not 0 <= number < count:
+            return False
+    return True
+
+
+def first_greater(positions: Iterable[Tuple[int, int]], count: int, default: int):
+    """
+    Given (position, region number) pairs in order, returns a list with the first
+    position whose region number is greater than each region number in
+    range(count), or default if there is none.
+    """
+    first = [default] * count
+    highest = -1
+    for (position, number) in positions:
+        if number > highest:
+            for region_number in range(max(highest, 0), min(number, count)):
+                first[region_number] = position
+            highest = number
+    return first
+
+
+def first_less(positions: Iterable[Tuple[int, int]], count: int, default: int):
+    """
+    Given (position, region number) pairs in order, returns a list with the first
+    position whose region number is less than each region number in range(count),
+    or default if there is none.
+    """
+    first = [default] * count
+    lowest = count
+    for (position, number) in positions:
+        if number < lowest:
+            for region_number in range(number + 1, min(lowest + 1, count)):
+                first[region_number] = position
+            lowest = number
+    return first
+
+
+# Intermediate tables of a trial, in the order they are built, and the
+# intermediates each is built from.
+INTERMEDIATES: Dict[str, Tuple[str, ...]] = {
+    "included": (),
+    "region_fixations": ("included",),
+    "first_pass": (),
+    "first_pass_start": ("first_pass", "region_fixations"),
+    "next_greater": ("region_fixations",),
+    "next_included": (),
+    "go_back": (),
+    "saccades": (),
+}
+
+# Intermediates that require every fixation to lie in a numbered region of the
+# trial's item (see `can_fuse`).
+FUSED_INTERMEDIATES = {
+    "region_fixations",
+    "first_pass_start",
+    "next_greater",
+    "go_back",
+}
+
+# Intermediates each measure is calculated from. A measure is calculated by the
+# TrialTables method of the same name, so a new measure is added with a method and
+# an entry here, and shares the intermediates of the other requested measures.
+MEASURE_INTERMEDIATES: Dict[str, Tuple[str, ...]] = {
+    # Trial measures.
+    "location_first_regression": ("saccades",),
+    "latency_first_regression": ("saccades",),
+    "fixation_count": ("included",),
+    "percent_regressions": ("saccades",),
+    "trial_total_time": ("included",),
+    "average_forward_saccade": ("saccades",),
+    "average_backward_saccade": ("saccades",),
+    # Region measures.
+    "skip": ("first_pass",),
+    "first_pass_regressions_in": ("region_fixations",),
+    "first_pass_regressions_out": ("first_pass", "next_included"),
+    "landing_position": ("first_pass",),
+    "launch_site": ("region_fixations", "next_greater"),
+    "first_pass_fixation_count": ("first_pass",),
+    "first_fixation_duration": ("first_pass",),
+    "single_fixation_duration": ("first_pass",),
+    "first_pass": ("first_pass",),
+    "go_past": ("first_pass_start", "next_greater"),
+    "total_time": ("region_fixations",),
+    "right_bounded_time": ("first_pass_start", "next_greater"),
+    "reread_time": ("region_fixations", "next_greater"),
+    "second_pass": ("region_fixations",),
+    "spillover_time": ("region_fixations",),
+    "refixation_time": ("first_pass",),
+    "go_back_time_char": ("first_pass", "go_back"),
+    "go_back_time_region": ("first_pass", "go_back"),
+}
+
+
+def plan_intermediates(measures: Iterable[str]) -> List[str]:
+    """
+    Returns the intermediates needed to calculate a list of measures, including
+    the intermediates they are built from, in the order they must be built.
+
+    Args:
+        measures (Iterable[str]): Names of measures in `MEASURE_INTERMEDIATES`.
+    """
+    needed: Set[str] = set()
+    pending: List[str] = []
+    for measure in measures:
+        if measure not in MEASURE_INTERMEDIATES:
+            raise ValueError('Measure "%s" does not exist.' % measure)
+        pending += MEASURE_INTERMEDIATES[measure]
+    while pending:
+        intermediate = pending.pop()
+        if intermediate not in needed:
+            needed.add(intermediate)
+            pending += INTERMEDIATES[intermediate]
+    return [intermediate for intermediate in INTERMEDIATES if intermediate in needed]
+
+
+class TrialTables:
+    """
+    Tables of a trial's fixations shared by the fused measures. Only the
+    intermediates needed by the measures to calculate are built (see
+    `MEASURE_INTERMEDIATES`), each once. Fixations that are not excluded are
+    indexed by their position in the list of non-excluded fixations (their
+    non-excluded position).
+
+    Args:
+        trial (Trial): Trial to build tables for. Unless only trial measures are
+                       calculated, every fixation must lie in a numbered region of
+                       the trial's item (see `can_fuse`).
+        measures (Optional[Iterable[str]]): Names of the measures to calculate. If
+                       not provided, the tables of every measure are built.
+    """
+
+    def __init__(self, trial: Trial, measures: Iterable[str] = None):
+        # Fixations of a FixationSequence are created on access, so they are
+        # created once here rather than on every lookup.
+        fixations = list(trial.fixations)
+        count = len(trial.item.regions)
+        self.trial = trial
+        self.fixations: List[Fixation] = fixations
+        self.regions = [region_exists(trial, number) for number in range(count)]
+        self.intermediates = plan_intermediates(
+            MEASURE_INTERMEDIATES if measures is None else measures
+        )
+        for intermediate in self.intermediates:
+            getattr(self, "build_" + intermediate)()
+
+    def build_included(self):
+        """Non-excluded fixations."""
+        self.included: List[Fixation] = [
+            fixation for fixation in self.fixations if not fixation.excluded
+        ]
+
+    def build_region_fixations(self):
+        """Non-excluded fixations by region, with running duration totals."""
+        count = len(self.regions)
+        # Region of each non-excluded fixation.
+        self.included_region: List[int] = []
+        # Non-excluded fixations in each region, their non-excluded positions, and
+        # running duration totals of each region.
+        self.region_fixations: List[List[Fixation]] = [[] for _ in range(count)]
+        self.region_positions: List[List[int]] = [[] for _ in range(count)]
+        self.region_totals: List[List[int]] = [[0] for _ in range(count)]
+        # Whether each region was entered from a region to its right.
+        self.regressions_in: List[Optional[bool]] = [None] * count
+        # Fixations on each region directly after fixations on the region before it.
+        self.spillover: List[List[Fixation]] = [[] for _ in range(count)]
+        self.spillover_total: List[int] = [0] * count
+
+        visited: List[int] = []
+        for (position, fixation) in enumerate(self.included):
+            number = fixation.region.number
+            if self.regressions_in[number] is None:
+                self.regressions_in[number] = False
+            if position and self.included_region[-1] > number:
+                self.regressions_in[number] = True
+
+            visited = [
+                region_number
+                for region_number in visited
+                if number == region_number + 1
+            ]
+            if visited:
+                self.spillover[number - 1] += [fixation]
+                self.spillover_total[number - 1] += fixation.duration()
+            visited += [number]
+
+            self.included_region += [number]
+            self.region_fixations[number] += [fixation]
+            self.region_positions[number] += [position]
+            self.region_totals[number] += [
+                self.region_totals[number][-1] + fixation.duration()
+            ]
+
+    def build_first_pass(self):
+        """
+        First pass fixations of each region, shared with the measure functions
+        through the trial's first pass cache.
+        """
+        fp_table = get_fp_table(self.trial)
+        self.fp_fixations: List[List[Fixation]] = [
+            fp_table.get(number, []) for number in range(len(self.regions))
+        ]
+
+    def build_first_pass_start(self):
+        """
+        The non-excluded position of the first first pass fixation of each region,
+        which is always the region's first non-excluded fixation.
+        """
+        self.first_pass_start: List[int] = [
+            self.region_positions[number][0] if self.fp_fixations[number] else -1
+            for number in range(len(self.regions))
+        ]
+
+    def build_next_greater(self):
+        """
+        For each non-excluded position, the next non-excluded position in a region
+        further right, and for each region, the first non-excluded position in a
+        region further right.
+        """
+        included_count = len(self.included)
+        self.next_greater: List[int] = [included_count] * included_count
+        stack: List[int] = []
+        for (position, number) in enumerate(self.included_region):
+            while stack and self.included_region[stack[-1]] < number:
+                self.next_greater[stack.pop()] = position
+            stack += [position]
+        self.first_right = first_greater(
+            enumerate(self.included_region), len(self.regions), included_count
+        )
+
+    def build_next_included(self):
+        """
+        For each position in the trial's list of fixations, the next position of a
+        non-excluded fixation.
+        """
+        fixations = self.fixations
+        self.next_included: List[Optional[int]] = [None] * (len(fixations) + 1)
+        for position in range(len(fixations) - 1, -1, -1):
+            self.next_included[position] = (
+                position
+                if not fixations[position].excluded
+                else self.next_included[position + 1]
+            )
+
+    def build_go_back(self):
+        """Tables for go-back time, by position in the trial's list of fixations."""
+        fixations = self.fixations
+        count = len(self.regions)
+        # For each region, the first non-excluded fixation in a region to its left.
+        self.first_left = first_less(
+            (
+                (position, fixation.region.number)
+                for (position, fixation) in enumerate(fixations)
+                if not fixation.excluded
+            ),
+            count,
+            -1,
+        )
+        # For each region, the first non-excluded fixation in a region to its right,
+        # excluding the first and last fixations of the trial.
+        scan_end = max(len(fixations) - 1, 1)
+        self.scan_first_right = first_greater(
+            (
+                (position, fixations[position].region.number)
+                for position in range(1, scan_end)
+                if not fixations[position].excluded
+            ),
+            count,
+            scan_end,
+        )
+        # For each position, the last non-excluded fixation before it, excluding
+        # the first fixation of the trial.
+        self.scan_last_included: List[Optional[Fixation]] = [None] * (scan_end + 1)
+        for position in range(1, scan_end):
+            self.scan_last_included[position + 1] = (
+                fixations[position]
+                if not fixations[position].excluded
+                else self.scan_last_included[position]
+            )
+        # For each position, the first regression at or after it, by character and
+        # by region, ignoring the last fixation of the trial.
+        self.next_regression_char: List[Optional[int]] = [None] * (len(fixations) + 1)
+        self.next_regression_region: List[Optional[int]] = [None] * (
+            len(fixations) + 1
+        )
+        previous: List[Optional[Fixation]] = [None] * len(fixations)
+        last = None
+        for (position, fixation) in enumerate(fixations):
+            previous[position] = last
+            if not fixation.excluded:
+                last = fixation
+        for position in range(len(fixations) - 2, -1, -1):
+            fixation = fixations[position]
+            prev_fix = previous[position]
+            self.next_regression_char[position] = self.next_regression_char[
+                position + 1
+            ]
+            self.next_regression_region[position] = self.next_regression_region[
+                position + 1
+            ]
+            if fixation.excluded or prev_fix is None:
+                continue
+            if fixation.line < prev_fix.line or (
+                fixation.line == prev_fix.line and fixation.char < prev_fix.char
+            ):
+                self.next_regression_char[position] = position
+            if fixation.region.number < prev_fix.region.number:
+                self.next_regression_region[position] = position
+        self.previous = previous
+
+    def build_saccades(self):
+        """
+        The first regression among the trial's saccades, and the number and total
+        duration of its forward and backward saccades.
+        """
+        self.first_regression: Optional[Saccade] = None
+        self.saccade_count = len(self.trial.saccades)
+        self.forward_count = 0.0
+        self.forward_total = 0.0
+        self.backward_count = 0.0
+        self.backward_total = 0.0
+        for saccade in self.trial.saccades:
+            if saccade.regression:
+                if self.first_regression is None:
+                    self.first_regression = saccade
+                self.backward_count += 1.0
+                self.backward_total += saccade.duration
+            else:
+                self.forward_count += 1.0
+                self.forward_total += saccade.duration
+
+    def region_total(self, region_number: int, start: int, end: int) -> int:
+        """Total duration of region_fixations[region_number][start:end]."""
+        totals = self.region_totals[region_number]
+        return totals[end] - totals[start]
+
+    def skip(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.skip`."""
+        return (not self.fp_fixations[region_number], None)
+
+    def first_pass_regressions_out(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.first_pass_regressions_out`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if not fp_fixations:
+            return (None, None)
+        next_fix_idx = fp_fixations[-1].index + 1
+        if next_fix_idx >= len(self.fixations):
+            return (False, None)
+        position = self.next_included[next_fix_idx]
+        if position is None:
+            return (False, None)
+        return (self.fixations[position].region.number < region_number, None)
+
+    def first_pass_regressions_in(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.first_pass_regressions_in`."""
+        return (self.regressions_in[region_number], None)
+
+    def first_fixation_duration(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.first_fixation_duration`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if not fp_fixations:
+            return (None, None)
+        return (fp_fixations[0].duration(), [fp_fixations[0]])
+
+    def single_fixation_duration(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.single_fixation_duration`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if len(fp_fixations) == 1:
+            return (fp_fixations[0].duration(), [fp_fixations[0]])
+        return (None, None)
+
+    def first_pass(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.first_pass`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if not fp_fixations:
+            return (None, None)
+        return (
+            sum(fixation.duration() for fixation in fp_fixations),
+            list(fp_fixations),
+        )
+
+    def go_past(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.go_past`."""
+        if not self.fp_fixations[region_number]:
+            return (None, None)
+        position = self.first_pass_start[region_number]
+        end = self.next_greater[position]
+        gp_fixations: List[Fixation] = []
+        total = 0
+        # Fixations outside the region only count once the total is not zero.
+        while position < end and not total:
+            if self.included_region[position] == region_number:
+                gp_fixations += [self.included[position]]
+                total += self.included[position].duration()
+            position += 1
+        gp_fixations += self.included[position:end]
+        total += sum(fixation.duration() for fixation in self.included[position:end])
+        return (total, gp_fixations)
+
+    def total_time(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.total_time`."""
+        return (
+            self.region_totals[region_number][-1],
+            list(self.region_fixations[region_number]),
+        )
+
+    def right_bounded_time(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.right_bounded_time`."""
+        if not self.fp_fixations[region_number]:
+            return (None, None)
+        end = bisect_left(
+            self.region_positions[region_number],
+            self.next_greater[self.first_pass_start[region_number]],
+        )
+        return (
+            self.region_total(region_number, 0, end),
+            self.region_fixations[region_number][:end],
+        )
+
+    def reread_time(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.reread_time`."""
+        start = bisect_right(
+            self.region_positions[region_number], self.first_right[region_number]
+        )
+        return (
+            self.region_total(
+                region_number, start, len(self.region_fixations[region_number])
+            ),
+            self.region_fixations[region_number][start:],
+        )
+
+    def second_pass(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.second_pass`."""
+        positions = self.region_positions[region_number]
+        start = 1 if positions else 0
+        while start < len(positions) and positions[start] == positions[start - 1] + 1:
+            start += 1
+        return (
+            self.region_total(region_number, start, len(positions)),
+            self.region_fixations[region_number][start:],
+        )
+
+    def spillover_time(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.spillover_time`."""
+        if not self.spillover_total[region_number]:
+            return (None, None)
+        return (self.spillover_total[region_number], self.spillover[region_number])
+
+    def refixation_time(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.refixation_time`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if len(fp_fixations) < 2:
+            return (None, None)
+        return (
+            sum(fixation.duration() for fixation in fp_fixations[1:]),
+            fp_fixations[1:],
+        )
+
+    def landing_position(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.landing_position`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if (
+            fp_fixations
+            and fp_fixations[0].char is not None
+            and fp_fixations[0].line is not None
+        ):
+            region = self.regions[region_number]
+            return (
+                '"(%s, %s)"'
+                % (
+                    fp_fixations[0].char - region.start.x,
+                    fp_fixations[0].line - region.start.y,
+                ),
+                [fp_fixations[0]],
+            )
+        return (None, None)
+
+    def launch_site(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.launch_site`."""
+        positions = self.region_positions[region_number]
+        first_right = self.first_right[region_number]
+        # The last fixation looked at by launch_site is returned with the measure,
+        # even when there is no launch site.
+        if first_right < len(self.included) and (
+            not positions or first_right < positions[0]
+        ):
+            return (None, [self.included[first_right]])
+        if not positions:
+            return (None, [self.included[-1]] if self.included else None)
+        if positions[0] == 0:
+            return (None, [self.included[0]])
+        fixation = self.included[positions[0]]
+        launch_fix = self.included[positions[0] - 1]
+        launch_char = (
+            launch_fix.char
+            if launch_fix.char is None
+            else launch_fix.char - fixation.region.start.x
+        )
+        launch_line = (
+            launch_fix.line
+            if launch_fix.line is None
+            else launch_fix.line - fixation.region.start.y
+        )
+        return ('"(%s, %s)"' % (launch_char, launch_line), [launch_fix])
+
+    def first_pass_fixation_count(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.first_pass_fixation_count`."""
+        fp_fixations = self.fp_fixations[region_number]
+        if not fp_fixations:
+            return (None, None)
+        return (len(fp_fixations), list(fp_fixations))
+
+    def go_back_time(self, region_number: int, by_region: bool) -> MeasureValue:
+        """Shared implementation of go_back_time_char and go_back_time_region."""
+        fp_fixations = self.fp_fixations[region_number]
+        if fp_fixations:
+            start_fix = fp_fixations[0]
+            go_back_start = start_fix.start
+        else:
+            if self.first_left[region_number] < 0:
+                return (None, None)
+            start_fix = (
+                self.scan_last_included[self.scan_first_right[region_number]]
+                or self.fixations[self.first_left[region_number]]
+            )
+            go_back_start = start_fix.end
+
+        next_regression = (
+            self.next_regression_region if by_region else self.next_regression_char
+        )
+        position = start_fix.index + 1
+        regression = (
+            next_regression[position] if position < len(next_regression) else None
+        )
+        if regression is None:
+            return (None, None)
+        prev_fix = self.previous[regression]
+        return (prev_fix.end - go_back_start, None)
+
+    def go_back_time_char(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.go_back_time_char`."""
+        return self.go_back_time(region_number, False)
+
+    def go_back_time_region(self, region_number: int) -> MeasureValue:
+        """See `sideeye.measures.region.go_back_time_region`."""
+        return self.go_back_time(region_number, True)
+
+    def location_first_regression(self) -> Any:
+        """See `sideeye.measures.trial.location_first_regression`."""
+        if self.first_regression is None:
+            return None
+        return '"(%s, %s)"' % (
+            self.first_regression.start.char,
+            self.first_regression.start.line,
+        )
+
+    def latency_first_regression(self) -> Any:
+        """See `sideeye.measures.trial.latency_first_regression`."""
+        if self.first_regression is None:
+            return None
+        return self.first_regression.start.end
+
+    def fixation_count(self) -> Any:
+        """See `sideeye.measures.trial.fixation_count`."""
+        return len(self.included)
+
+    def percent_regressions(self) -> Any:
+        """See `sideeye.measures.trial.percent_regressions`."""
+        if not self.saccade_count:
+            return None
+        return self.backward_count / self.saccade_count
+
+    def trial_total_time(self) -> Any:
+        """See `sideeye.measures.trial.trial_total_time`."""
+        if self.trial.time is None:
+            return self.included[-1].end
+        return self.trial.time
+
+    def average_forward_saccade(self) -> Any:
+        """See `sideeye.measures.trial.average_forward_saccade`."""
+        if self.forward_count == 0.0:
+            return 0
+        return self.forward_total / self.forward_count
+
+    def average_backward_saccade(self) -> Any:
+        """See `sideeye.measures.trial.average_backward_saccade`."""
+        if self.backward_count == 0.0:
+            return 0
+        return self.backward_total / self.backward_count
+
+
+def calculate_trial_measures(trial: Trial, measures: Iterable[str]):
+    """
+    Calculate trial measures and region measures for every region of a trial at
+    once. The intermediates needed by all of the measures are built once (see
+    `MEASURE_INTERMEDIATES`), and every measure is then read off them. If any
+    fixation in the trial does not lie in a numbered region of the trial's item,
+    region measures are calculated separately by their functions in
+    `sideeye.measures.region` instead.
+
+    Args:
+        trial (Trial): Trial to calculate measures for.
+        measures (Iterable[str]): Names of trial and region measures to calculate.
+    """
+    measures = list(measures)
+    for measure in measures:
+        if measure not in MEASURE_INTERMEDIATES:
+            raise ValueError('Measure "%s" does not exist.' % measure)
+    trial_measures = [
+        measure for measure in measures if measure not in region_measures.__all__
+    ]
+    fused_measures = [
+        measure for measure in measures if measure in region_measures.__all__
+    ]
+
+    if fused_measures and not can_fuse(trial):
+        for measure in fused_measures:
+            for region in trial.item.regions:
+                if region.number is not None:
+                    getattr(region_measures, measure)(trial, region.number)
+        fused_measures = []
+
+    if not trial_measures and not fused_measures:
+        return
+    tables = TrialTables(trial, trial_measures + fused_measures)
+    for measure in trial_measures:
+        save_trial_measure(trial, measure, getattr(tables, measure)())
+    for measure in fused_measures:
+        calculate = getattr(tables, measure)
+        for (region_number, region) in enumerate(tables.regions):
+            value, fixations = calculate(region_number)
+            save_measure(trial, region, measure, value, fixations)
+
+
+def calculate_region_measures(trial: Trial, measures: Iterable[str]):
+    """
+    Calculate region measures for every region of a trial at once (see
+    `calculate_trial_measures`).
+
+    Args:
+        trial (Trial): Trial to calculate measures for.
+        measures (Iterable[str]): Names of region measures to calculate.
+    """
+    measures = list(measures)
+    for measure in measures:
+        if measure not in region_measures.__all__:
+            raise ValueError('Region measure "%s" does not exist.' % measure)
+    calculate_trial_measures(trial, measures)
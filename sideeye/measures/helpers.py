@@ -2,26 +2,76 @@
 Helpers for calculating region measures.
 """
 
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional
 from sideeye.data import Trial, Fixation, Region
-from sideeye.types import RegionMeasure
+from sideeye.types import RegionMeasure, FirstPassTable
 
+# Number of get_fp_table lookups served from a trial's cache (hits) and computed
+# from its fixations (misses) in this process.
+FP_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
 
-def get_fp_fixations(trial: Trial, region_number: int) -> List[Fixation]:
-    """Returns a list of fixations in the target region during first pass."""
-    fp_fixations: List[Fixation] = []
+
+def fp_cache_info() -> Dict[str, int]:
+    """Returns the number of first pass cache hits and misses in this process."""
+    return dict(FP_CACHE_STATS)
+
+
+def reset_fp_cache_info():
+    """Resets the first pass cache hit and miss counters to zero."""
+    FP_CACHE_STATS.update(hits=0, misses=0)
+
+
+def clear_fp_cache(trial: Trial):
+    """
+    Discards a trial's cached first pass fixations. This is not needed when the
+    fixations change, since the cache is keyed on their version (see
+    `sideeye.data.FixationSequence`), but frees the cached table.
+    """
+    trial.first_pass_cache = None
+
+
+def get_fp_table(trial: Trial) -> FirstPassTable:
+    """
+    Returns the first pass fixations of every region of a trial, by region number,
+    computed in one pass over the trial's fixations and cached on the trial until
+    the fixations are replaced or changed. Regions with no first pass fixations are
+    left out of the table.
+    """
+    key = trial.fixations.version
+    if trial.first_pass_cache is not None and trial.first_pass_cache[0] == key:
+        FP_CACHE_STATS["hits"] += 1
+        return trial.first_pass_cache[1]
+
+    FP_CACHE_STATS["misses"] += 1
+    table: FirstPassTable = {}
+    # Region of the first pass currently being read, and the rightmost region
+    # fixated so far.
+    current = None
+    highest = None
     for fixation in trial.fixations:
         region = fixation.region
         if not region:
             break
-        if region.number is not None and region.number > region_number:
-            break
-        if fp_fixations and region.number is not region_number:
-            break
-        if region.number is region_number and not fixation.excluded:
-            fp_fixations += [fixation]
+        number = region.number
+        if number is None or number != current:
+            current = None
+        if number is None:
+            continue
+        if not fixation.excluded:
+            if current is not None:
+                table[number] += [fixation]
+            elif number not in table and (highest is None or highest <= number):
+                table[number] = [fixation]
+                current = number
+        highest = number if highest is None else max(highest, number)
 
-    return fp_fixations
+    trial.first_pass_cache = (key, table)
+    return table
+
+
+def get_fp_fixations(trial: Trial, region_number: int) -> List[Fixation]:
+    """Returns a list of fixations in the target region during first pass."""
+    return list(get_fp_table(trial).get(region_number, []))
 
 
 def region_exists(trial: Trial, region_number: int) -> Region:
@@ -0,0 +1,114 @@
+"""
+Vectorized implementations of some trial and region measures, calculated with
+NumPy array operations on a trial's columnar fixations (see `Trial.columns`)
+instead of loops over Fixation objects. Region measures are calculated for every
+region of the trial at once. Results are identical to the measures in
+`sideeye.measures.trial` and `sideeye.measures.region`.
+
+These measures are used in place of the standard implementations when ``vectorized``
+is set in the configuration. They require NumPy, installed with
+``pip install sideeye[vectorized]``, and trials whose fixations all lie in numbered
+regions of the trial's item (see `sideeye.measures.engine.can_fuse`).
+"""
+
+from typing import List
+from sideeye.data import Trial, Fixation
+from sideeye.measures.helpers import region_exists, save_measure, save_trial_measure
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ["fixation_count", "trial_total_time", "total_time", "reread_time", "skip"]
+
+
+def fixations_by_region(trial: Trial, indices) -> List[List[Fixation]]:
+    """
+    Groups the fixations at the given indices of a trial by region number, in trial
+    order.
+    """
+    region_numbers = trial.columns().region_number[indices]
+    order = indices[numpy.argsort(region_numbers, kind="stable")]
+    counts = numpy.bincount(region_numbers, minlength=len(trial.item.regions))
+    return [
+        [trial.fixations[index] for index in group]
+        for group in numpy.split(order, numpy.cumsum(counts)[:-1])
+    ]
+
+
+def save_region_totals(trial: Trial, measure: str, indices):
+    """
+    Saves the total duration of the fixations at the given indices of a trial, and
+    the fixations themselves, as a measure of the region they occurred in.
+    """
+    columns = trial.columns()
+    totals = numpy.zeros(len(trial.item.regions), dtype=numpy.int64)
+    numpy.add.at(totals, columns.region_number[indices], columns.duration[indices])
+    for (region_number, fixations) in enumerate(fixations_by_region(trial, indices)):
+        save_measure(
+            trial,
+            region_exists(trial, region_number),
+            measure,
+            int(totals[region_number]),
+            fixations,
+        )
+
+
+def fixation_count(trial: Trial):
+    """See `sideeye.measures.trial.fixation_count`."""
+    return save_trial_measure(
+        trial, "fixation_count", int(numpy.count_nonzero(~trial.columns().excluded))
+    )
+
+
+def trial_total_time(trial: Trial):
+    """See `sideeye.measures.trial.trial_total_time`."""
+    if trial.time is None:
+        columns = trial.columns()
+        return save_trial_measure(
+            trial, "trial_total_time", int(columns.end[~columns.excluded][-1])
+        )
+    return save_trial_measure(trial, "trial_total_time", trial.time)
+
+
+def total_time(trial: Trial):
+    """See `sideeye.measures.region.total_time`."""
+    included = numpy.flatnonzero(~trial.columns().excluded)
+    save_region_totals(trial, "total_time", included)
+
+
+def reread_time(trial: Trial):
+    """
+    See `sideeye.measures.region.reread_time`. A fixation is reread if a fixation
+    in a region further right came before it.
+    """
+    columns = trial.columns()
+    included = numpy.flatnonzero(~columns.excluded)
+    region_numbers = columns.region_number[included]
+    rightmost = numpy.maximum.accumulate(region_numbers)
+    save_region_totals(trial, "reread_time", included[rightmost > region_numbers])
+
+
+def skip(trial: Trial):
+    """
+    See `sideeye.measures.region.skip`. A region is not skipped if a non-excluded
+    fixation in the region comes before any fixation further right.
+    """
+    columns = trial.columns()
+    previous_rightmost = numpy.maximum.accumulate(
+        numpy.concatenate(([-1], columns.region_number))
+    )[:-1]
+    first_pass_regions = set(
+        columns.region_number[
+            ~columns.excluded & (previous_rightmost <= columns.region_number)
+        ].tolist()
+    )
+    for region_number in range(len(trial.item.regions)):
+        save_measure(
+            trial,
+            region_exists(trial, region_number),
+            "skip",
+            region_number not in first_pass_regions,
+            None,
+        )
@@ -1,9 +1,24 @@
 """
 This module contains functions to generate csv reports of measures calculated
-for experiments.
+for experiments. Reports can be written row by row to a file-like sink with the
+`write_*` functions, or returned as a string by the `generate_*` functions. Rows
+are formatted with `csv.writer`, so cells that contain a comma, quote or line break
+are quoted.
 """
 
-from typing import Any, List, Dict, Optional
+import csv
+from io import StringIO
+from typing import (
+    Any,
+    Callable,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    TextIO,
+    Tuple,
+)
 from sideeye.data import Experiment, Trial, Region
 from sideeye.config import Configuration, OutputColumnConfig
 
@@ -40,28 +55,228 @@ def write_column(
             output = region.number
     elif column == "region_text":
         if region is not None:
-            output = f'"{region.text}"'
+            output = region.text
     elif column == "region_start":
         if region is not None:
-            output = f'"{region.start}"'
+            output = region.start
     elif column == "region_end":
         if region is not None:
-            output = f'"{region.end}"'
+            output = region.end
     elif column == "measure":
-        output = f'"{measure}"' if "," in str(measure) else measure
-    elif (
+        output = measure
+    else:
+        output = measure_value(trial, region, measure)
+    return format_cell(output, cutoff)
+
+
+def measure_value(trial: Trial, region: Optional[Region], measure: str) -> Any:
+    """
+    Returns the value of a region measure for a region of a trial, or of a trial
+    measure if region is None or the region measure was not calculated, or "NA".
+    """
+    if (
         region is not None
         and region.number is not None
         and measure in trial.region_measures[region.number]
     ):
-        output = trial.region_measures[region.number][measure]["value"]
-    elif measure in trial.trial_measures:
-        output = trial.trial_measures[measure]
+        return unquote(trial.region_measures[region.number][measure]["value"])
+    if measure in trial.trial_measures:
+        return unquote(trial.trial_measures[measure])
+    return "NA"
+
+
+def unquote(value: Any) -> Any:
+    """
+    Removes the quotes from measure values that are quoted for csv, such as the
+    positions returned by `landing_position`, since rows are quoted by `csv.writer`.
+    """
+    if isinstance(value, str) and len(value) > 1 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def format_cell(output: Any, cutoff: Optional[int]) -> str:
+    """Formats an output value, replacing integers above the cutoff with CUTOFF."""
     if isinstance(output, int) and cutoff and output > cutoff >= 0:
         output = "CUTOFF"
     return str(output).replace("\n", "\\n")
 
 
+class CsvFormatter:
+    """
+    Formats lists of cells as csv rows with `csv.writer`, which quotes cells that
+    contain a comma, quote or line break, and doubles the quotes in them. Most rows
+    contain none of them, so rows are joined with commas, and only written with the
+    writer if they need quotes. The writer writes every row to the same buffer.
+    """
+
+    def __init__(self):
+        self.buffer = StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def row(self, cells: List[str]) -> str:
+        """Returns the csv row of a list of cells, ending with a line break."""
+        line = ",".join(cells)
+        if (
+            line.count(",") == len(cells) - 1
+            and '"' not in line
+            and "\n" not in line
+            and "\r" not in line
+            and (line or len(cells) != 1)
+        ):
+            return line + "\n"
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(cells)
+        return self.buffer.getvalue()
+
+
+def csv_row(cells: List[str]) -> str:
+    """Returns the csv row of a list of cells, ending with a line break."""
+    return CsvFormatter().row(cells)
+
+
+def region_accessor(accessor: Callable[[Region], Any]) -> Callable:
+    """Wraps a region column accessor to output NA for rows without a region."""
+    return lambda region: "NA" if region is None else accessor(region)
+
+
+# Accessors for the output columns that do not depend on the measure of a row, by
+# the loop level their value is read at.
+COLUMN_ACCESSORS: Dict[str, Tuple[str, Callable]] = {
+    "experiment_name": ("experiment", lambda experiment: experiment.name),
+    "filename": ("experiment", lambda experiment: experiment.filename),
+    "date": ("experiment", lambda experiment: experiment.date),
+    "trial_id": ("trial", lambda trial: trial.index),
+    "trial_total_time": ("trial", lambda trial: trial.time),
+    "item_id": ("trial", lambda trial: trial.item.number),
+    "item_condition": ("trial", lambda trial: trial.item.condition),
+    "region_label": ("region", region_accessor(lambda region: region.label)),
+    "region_number": ("region", region_accessor(lambda region: region.number)),
+    "region_text": ("region", region_accessor(lambda region: region.text)),
+    "region_start": ("region", region_accessor(lambda region: region.start)),
+    "region_end": ("region", region_accessor(lambda region: region.end)),
+}
+
+
+class OutputPlan:
+    """
+    Output columns compiled once into a plan for writing rows. Values of experiment,
+    trial and region columns are read once per experiment, trial and region, and
+    formatted in advance unless they are integers, which depend on the cutoff of the
+    measure in each row. Writing a row then only looks up measure values. Rows are
+    identical to those written by `measure_output`.
+
+    Args:
+        columns (Dict[str, OutputColumnConfig]): Columns to output.
+    """
+
+    def __init__(self, columns: Dict[str, OutputColumnConfig]):
+        self.columns = list(columns.keys())
+        self.cutoffs = [column.cutoff for column in columns.values()]
+        self.levels: Dict[str, List[Tuple[int, Callable]]] = {
+            "experiment": [],
+            "trial": [],
+            "region": [],
+        }
+        self.measure_columns: List[int] = []
+        self.value_columns: List[int] = []
+        for (index, column) in enumerate(self.columns):
+            if column in COLUMN_ACCESSORS:
+                level, accessor = COLUMN_ACCESSORS[column]
+                self.levels[level] += [(index, accessor)]
+            elif column == "measure":
+                self.measure_columns += [index]
+            else:
+                self.value_columns += [index]
+        self.experiment: Optional[Experiment] = None
+        self.experiment_values: List[Any] = []
+        self.formatter = CsvFormatter()
+
+    def read(self, level: str, source: Any, values: List[Any]) -> List[Any]:
+        """
+        Returns a copy of values with the columns read at the given loop level read
+        from source. Values are formatted unless they are integers.
+        """
+        values = list(values)
+        for (index, accessor) in self.levels[level]:
+            value = accessor(source)
+            values[index] = (
+                value if isinstance(value, int) else format_cell(value, None)
+            )
+        return values
+
+    def trial_values(self, experiment: Experiment, trial: Trial) -> List[Any]:
+        """Returns the values of the experiment and trial columns for a trial."""
+        if experiment is not self.experiment:
+            self.experiment = experiment
+            self.experiment_values = self.read(
+                "experiment", experiment, [None] * len(self.columns)
+            )
+        return self.read("trial", trial, self.experiment_values)
+
+    def region_values(self, values: List[Any], region: Optional[Region]) -> List[Any]:
+        """Returns trial_values with the region columns read for a region."""
+        return self.read("region", region, values)
+
+    def row(
+        self,
+        values: List[Any],
+        trial: Trial,
+        region: Optional[Region],
+        measure: str,
+        cutoff: Optional[int],
+    ) -> str:
+        """
+        Returns a long format row for a measure, given the region values of the row.
+        """
+        cells = list(values)
+        for index in self.measure_columns:
+            cells[index] = format_cell(measure, cutoff)
+        if self.value_columns:
+            value = format_cell(measure_value(trial, region, measure), cutoff)
+            for index in self.value_columns:
+                cells[index] = value
+        return self.formatter.row(
+            [
+                cell if isinstance(cell, str) else format_cell(cell, cutoff)
+                for cell in cells
+            ]
+        )
+
+    def wide_row(
+        self, values: List[Any], trial: Trial, region: Optional[Region]
+    ) -> str:
+        """
+        Returns a wide format row, where each measure column holds the value of the
+        measure it is named after, given the region values of the row.
+        """
+        cells = list(values)
+        for index in self.measure_columns:
+            cells[index] = "measure"
+        region_measures = (
+            trial.region_measures[region.number]
+            if region is not None and region.number is not None
+            else {}
+        )
+        trial_measures = trial.trial_measures
+        for index in self.value_columns:
+            measure = self.columns[index]
+            if measure in region_measures:
+                value = region_measures[measure]["value"]
+            elif measure in trial_measures:
+                value = trial_measures[measure]
+            else:
+                value = "NA"
+            cells[index] = format_cell(unquote(value), self.cutoffs[index])
+        return self.formatter.row(
+            [
+                cell if isinstance(cell, str) else format_cell(cell, cutoff)
+                for (cell, cutoff) in zip(cells, self.cutoffs)
+            ]
+        )
+
+
 def measure_output(
     measure: str,
     cutoff: int,
@@ -81,16 +296,274 @@ def measure_output(
         trial (Trial): Trial to generate output for.
         region (Optional[Region]): Region to generate output for.
     """
-    return (
-        ",".join(
-            map(
-                lambda column: write_column(
-                    column, experiment, trial, region, measure, cutoff
-                ),
-                list(columns.keys()),
-            )
-        )
-        + "\n"
+    return csv_row(
+        [
+            write_column(column, experiment, trial, region, measure, cutoff)
+            for column in columns
+        ]
+    )
+
+
+def output_header(columns: Dict[str, OutputColumnConfig]) -> str:
+    """
+    Generates the header row of a csv report with the given columns.
+
+    Args:
+        columns (Dict[str, OutputColumnConfig]): Dict of columns to output.
+    """
+    return csv_row([value.header for value in columns.values()])
+
+
+def wide_format_columns(
+    config: Configuration = Configuration(),
+) -> Dict[str, OutputColumnConfig]:
+    """
+    Returns the columns of a wide format report: the configured output columns,
+    followed by a column for every measure.
+
+    Args:
+        config (Configuration): Configuration.
+    """
+    return {**config.output.columns, **config.measures.all}
+
+
+def measure_rows(
+    experiment: Experiment,
+    trial: Trial,
+    plan: OutputPlan,
+    trial_measures: Dict[str, OutputColumnConfig],
+    region_measures: Dict[str, OutputColumnConfig],
+) -> Iterator[str]:
+    """
+    Yields long format csv rows for a single trial: one row per trial measure,
+    followed by one row per region measure for each region of the trial. The
+    regions of the trial are not visited if there are no region measures.
+
+    Args:
+        experiment (Experiment): Experiment the trial belongs to.
+        trial (Trial): Trial to generate output for.
+        plan (OutputPlan): Plan compiled from the columns to output.
+        trial_measures (Dict[str, OutputColumnConfig]): Trial measures to output.
+        region_measures (Dict[str, OutputColumnConfig]): Region measures to output.
+    """
+    values = plan.trial_values(experiment, trial)
+    if trial_measures:
+        trial_values = plan.region_values(values, None)
+        for (measure, value) in trial_measures.items():
+            yield plan.row(trial_values, trial, None, measure, value.cutoff)
+    if region_measures:
+        for region in trial.item.regions:
+            region_values = plan.region_values(values, region)
+            for (measure, value) in region_measures.items():
+                yield plan.row(region_values, trial, region, measure, value.cutoff)
+
+
+def trial_all_rows(
+    experiment: Experiment,
+    trial: Trial,
+    config: Configuration = Configuration(),
+    plan: OutputPlan = None,
+) -> Iterator[str]:
+    """
+    Yields csv rows of all measures specified in config file for a single trial,
+    with each measure in a separate row.
+
+    Args:
+        experiment (Experiment): Experiment the trial belongs to.
+        trial (Trial): Trial to generate output for.
+        config (Configuration): Configuration.
+        plan (Optional[OutputPlan]): Plan compiled from `config.output.columns`, to
+            reuse across trials.
+    """
+    plan = plan if plan is not None else OutputPlan(config.output.columns)
+    return measure_rows(
+        experiment, trial, plan, config.measures.trial, config.measures.region
+    )
+
+
+def trial_wide_rows(
+    experiment: Experiment,
+    trial: Trial,
+    config: Configuration = Configuration(),
+    plan: OutputPlan = None,
+) -> Iterator[str]:
+    """
+    Yields csv rows of all measures specified in config file for a single trial,
+    with one row per region and all measures as columns.
+
+    Args:
+        experiment (Experiment): Experiment the trial belongs to.
+        trial (Trial): Trial to generate output for.
+        config (Configuration): Configuration.
+        plan (Optional[OutputPlan]): Plan compiled from `wide_format_columns(config)`,
+            to reuse across trials.
+    """
+    plan = plan if plan is not None else OutputPlan(wide_format_columns(config))
+    values = plan.trial_values(experiment, trial)
+    for region in trial.item.regions:
+        yield plan.wide_row(plan.region_values(values, region), trial, region)
+
+
+def trial_all_output(
+    experiment: Experiment,
+    trial: Trial,
+    config: Configuration = Configuration(),
+    plan: OutputPlan = None,
+) -> str:
+    """
+    Generates csv rows of all measures specified in config file for a single trial,
+    with each measure in a separate row.
+
+    Args:
+        experiment (Experiment): Experiment the trial belongs to.
+        trial (Trial): Trial to generate output for.
+        config (Configuration): Configuration.
+        plan (Optional[OutputPlan]): Plan compiled from `config.output.columns`, to
+            reuse across trials.
+    """
+    return "".join(trial_all_rows(experiment, trial, config, plan))
+
+
+def trial_wide_output(
+    experiment: Experiment,
+    trial: Trial,
+    config: Configuration = Configuration(),
+    plan: OutputPlan = None,
+) -> str:
+    """
+    Generates csv rows of all measures specified in config file for a single trial,
+    with one row per region and all measures as columns.
+
+    Args:
+        experiment (Experiment): Experiment the trial belongs to.
+        trial (Trial): Trial to generate output for.
+        config (Configuration): Configuration.
+        plan (Optional[OutputPlan]): Plan compiled from `wide_format_columns(config)`,
+            to reuse across trials.
+    """
+    return "".join(trial_wide_rows(experiment, trial, config, plan))
+
+
+def write_rows(
+    experiments: Iterable[Experiment],
+    sink: TextIO,
+    columns: Dict[str, OutputColumnConfig],
+    trial_rows: Callable[[Experiment, Trial, OutputPlan], Iterable[str]],
+):
+    """
+    Writes a csv report with the given columns to a file-like sink: the header row,
+    followed by the rows yielded by `trial_rows` for each trial of each experiment.
+    All reports are written by this function, with an `OutputPlan` compiled once
+    from the columns.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        sink (TextIO): File-like object to write to.
+        columns (Dict[str, OutputColumnConfig]): Columns to output.
+        trial_rows (Callable[[Experiment, Trial, OutputPlan], Iterable[str]]):
+            Function returning the rows of a trial, given the plan.
+    """
+    plan = OutputPlan(columns)
+    sink.write(output_header(columns))
+
+    for experiment in experiments:
+        for trial in experiment.trials.values():
+            sink.writelines(trial_rows(experiment, trial, plan))
+
+
+def write_trial_output(
+    experiments: Iterable[Experiment],
+    sink: TextIO,
+    config: Configuration = Configuration(),
+):
+    """
+    Writes a csv report of a list of experiments' trial measures using columns
+    specified in config file to a file-like sink, one row at a time. Regions are not
+    visited.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        sink (TextIO): File-like object to write to.
+        config (Configuration): Configuration.
+    """
+    write_rows(
+        experiments,
+        sink,
+        config.output.trial,
+        lambda experiment, trial, plan: measure_rows(
+            experiment, trial, plan, config.measures.trial, {}
+        ),
+    )
+
+
+def write_region_output(
+    experiments: Iterable[Experiment],
+    sink: TextIO,
+    config: Configuration = Configuration(),
+):
+    """
+    Writes a csv report of a list of experiments' region measures using columns
+    specified in config file to a file-like sink, one row at a time.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        sink (TextIO): File-like object to write to.
+        config (Configuration): Configuration.
+    """
+    write_rows(
+        experiments,
+        sink,
+        config.output.region,
+        lambda experiment, trial, plan: measure_rows(
+            experiment, trial, plan, {}, config.measures.region
+        ),
+    )
+
+
+def write_all_output(
+    experiments: Iterable[Experiment],
+    sink: TextIO,
+    config: Configuration = Configuration(),
+):
+    """
+    Writes a csv report of all measures specified in config file for a list of
+    experiments to a file-like sink, one row at a time.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        sink (TextIO): File-like object to write to.
+        config (Configuration): Configuration.
+    """
+    write_rows(
+        experiments,
+        sink,
+        config.output.columns,
+        lambda experiment, trial, plan: trial_all_rows(experiment, trial, config, plan),
+    )
+
+
+def write_all_output_wide_format(
+    experiments: Iterable[Experiment],
+    sink: TextIO,
+    config: Configuration = Configuration(),
+):
+    """
+    Writes a csv report of all measures specified in config file for a list of
+    experiments, with all measures as columns, to a file-like sink, one row at a
+    time.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        sink (TextIO): File-like object to write to.
+        config (Configuration): Configuration.
+    """
+    write_rows(
+        experiments,
+        sink,
+        wide_format_columns(config),
+        lambda experiment, trial, plan: trial_wide_rows(
+            experiment, trial, config, plan
+        ),
     )
 
 
@@ -105,18 +578,9 @@ def generate_region_output(
         experiments (List[Experiment]): List of experiments.
         config (Configuration): Configuration.
     """
-    measures = config.measures.region
-    columns = config.output.region
-    output = ",".join([value.header for value in columns.values()]) + "\n"
-
-    for experiment in experiments:
-        for trial in experiment.trials.values():
-            for region in trial.item.regions:
-                for (measure, value) in measures.items():
-                    output += measure_output(
-                        measure, value.cutoff, columns, experiment, trial, region
-                    )
-    return output
+    output = StringIO()
+    write_region_output(experiments, output, config)
+    return output.getvalue()
 
 
 def generate_trial_output(
@@ -130,15 +594,9 @@ def generate_trial_output(
         experiments (List[Experiment]): List of experiments.
         config (Configuration): Configuration.
     """
-    measures = config.measures.trial
-    columns = config.output.trial
-    output = ",".join([value.header for value in columns.values()]) + "\n"
-
-    for experiment in experiments:
-        for trial in experiment.trials.values():
-            for (measure, value) in measures.items():
-                measure_output(measure, value.cutoff, columns, experiment, trial, None)
-    return output
+    output = StringIO()
+    write_trial_output(experiments, output, config)
+    return output.getvalue()
 
 
 def generate_all_output(
@@ -151,24 +609,9 @@ def generate_all_output(
         experiments (List[Experiment]): List of experiments.
         config (Configuration): Configuration.
     """
-    region_measures = config.measures.region
-    trial_measures = config.measures.trial
-    columns = config.output.columns
-
-    output = ",".join([value.header for value in columns.values()]) + "\n"
-
-    for experiment in experiments:
-        for trial in experiment.trials.values():
-            for (measure, value) in trial_measures.items():
-                output += measure_output(
-                    measure, value.cutoff, columns, experiment, trial, None
-                )
-            for region in trial.item.regions:
-                for (measure, value) in region_measures.items():
-                    output += measure_output(
-                        measure, value.cutoff, columns, experiment, trial, region
-                    )
-    return output
+    output = StringIO()
+    write_all_output(experiments, output, config)
+    return output.getvalue()
 
 
 def generate_all_output_wide_format(
@@ -182,29 +625,6 @@ def generate_all_output_wide_format(
         experiments (List[Experiment]): List of experiments.
         config (Configuration): Configuration.
     """
-    columns: Dict[str, OutputColumnConfig] = {
-        **config.output.columns,
-        **config.measures.all,
-    }
-    output = ",".join([value.header for value in columns.values()]) + "\n"
-
-    for experiment in experiments:
-        for trial in experiment.trials.values():
-            for region in trial.item.regions:
-                output += (
-                    ",".join(
-                        map(
-                            lambda col: write_column(
-                                col[0],
-                                experiment,
-                                trial,
-                                region,
-                                col[0],
-                                col[1].cutoff,  # pylint: disable=no-member
-                            ),
-                            columns.items(),
-                        )
-                    )
-                    + "\n"
-                )
-    return output
+    output = StringIO()
+    write_all_output_wide_format(experiments, output, config)
+    return output.getvalue()
@@ -0,0 +1,262 @@
+"""
+This module contains functions to generate reports of measures calculated for
+experiments as Apache Arrow tables, and to write them to Apache Parquet files.
+Each column has a fixed type, so the tables can be loaded by pandas, R (arrow) or
+any other Arrow reader without parsing csv text. Writing Parquet files requires
+pyarrow, installed with ``pip install sideeye[parquet]``.
+
+Wide format tables have one row per region of each trial, with the configured
+output columns followed by one column per measure. Long format tables have one
+row per measure, with the configured output columns followed by ``measure``,
+``value`` (numeric and boolean values, as floats) and ``value_text`` (text values,
+such as ``landing_position``). Values above a measure's cutoff, and measures that
+were not calculated, are null.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sideeye.config import Configuration, OutputColumnConfig
+from sideeye.data import Experiment, Trial, Region
+from sideeye.output import measure_value, wide_format_columns
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Arrow types of output columns and measures. Columns without a type are strings.
+COLUMN_TYPES: Dict[str, str] = {
+    "date": "timestamp",
+    "trial_id": "int64",
+    "trial_total_time": "int64",
+    "region_number": "int64",
+    "skip": "bool_",
+    "first_pass_regressions_out": "bool_",
+    "first_pass_regressions_in": "bool_",
+    "first_fixation_duration": "int64",
+    "single_fixation_duration": "int64",
+    "first_pass": "int64",
+    "go_past": "int64",
+    "total_time": "int64",
+    "right_bounded_time": "int64",
+    "reread_time": "int64",
+    "second_pass": "int64",
+    "spillover_time": "int64",
+    "refixation_time": "int64",
+    "first_pass_fixation_count": "int64",
+    "go_back_time_region": "int64",
+    "go_back_time_char": "int64",
+    "latency_first_regression": "int64",
+    "fixation_count": "int64",
+    "percent_regressions": "float64",
+    "average_forward_saccade": "float64",
+    "average_backward_saccade": "float64",
+}
+
+# Accessors for output columns that do not depend on the measure of a row, by the
+# object they are read from.
+COLUMN_ACCESSORS: Dict[str, Tuple[str, Callable]] = {
+    "experiment_name": ("experiment", lambda experiment: experiment.name),
+    "filename": ("experiment", lambda experiment: experiment.filename),
+    "date": ("experiment", lambda experiment: experiment.date),
+    "trial_id": ("trial", lambda trial: trial.index),
+    "trial_total_time": ("trial", lambda trial: trial.time),
+    "item_id": ("trial", lambda trial: str(trial.item.number)),
+    "item_condition": ("trial", lambda trial: str(trial.item.condition)),
+    "region_label": ("region", lambda region: str(region.label)),
+    "region_number": ("region", lambda region: region.number),
+    "region_text": ("region", lambda region: region.text),
+    "region_start": ("region", lambda region: str(region.start)),
+    "region_end": ("region", lambda region: str(region.end)),
+}
+
+
+def require_pyarrow():
+    """Raises an ImportError if pyarrow is not installed."""
+    if pyarrow is None:
+        raise ImportError(
+            "Parquet output requires pyarrow. Install it with "
+            "`pip install sideeye[parquet]`."
+        )
+
+
+def arrow_type(column: str):
+    """Returns the Arrow type of an output column or measure."""
+    type_name = COLUMN_TYPES.get(column, "string")
+    if type_name == "timestamp":
+        return pyarrow.timestamp("us")
+    return getattr(pyarrow, type_name)()
+
+
+def table_value(value: Any, cutoff: Optional[int]) -> Any:
+    """
+    Converts a measure value to a table value: values above the cutoff and missing
+    values are None, and quotes added for csv output are removed.
+    """
+    if isinstance(value, int) and cutoff and value > cutoff >= 0:
+        return None
+    if isinstance(value, str):
+        if value == "NA":
+            return None
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            return value[1:-1]
+    return value
+
+
+def column_value(
+    column: str, experiment: Experiment, trial: Trial, region: Optional[Region]
+) -> Any:
+    """Returns the value of an output column for a row."""
+    source, accessor = COLUMN_ACCESSORS[column]
+    if source == "experiment":
+        return accessor(experiment)
+    if source == "trial":
+        return accessor(trial)
+    return None if region is None else accessor(region)
+
+
+def output_columns(config: Configuration) -> List[str]:
+    """Returns the configured output columns that can be written to a table."""
+    return [column for column in config.output.columns if column in COLUMN_ACCESSORS]
+
+
+def schema(config: Configuration = Configuration()):
+    """
+    Returns the schema of tables generated with a configuration.
+
+    Args:
+        config (Configuration): Configuration.
+    """
+    require_pyarrow()
+    columns = config.output.columns
+    fields = [
+        pyarrow.field(columns[column].header, arrow_type(column))
+        for column in output_columns(config)
+    ]
+    if config.wide_format:
+        fields += [
+            pyarrow.field(value.header, arrow_type(measure))
+            for (measure, value) in config.measures.all.items()
+            if measure not in config.output.columns
+        ]
+    else:
+        fields += [
+            pyarrow.field("measure", pyarrow.string()),
+            pyarrow.field("value", pyarrow.float64()),
+            pyarrow.field("value_text", pyarrow.string()),
+        ]
+    return pyarrow.schema(fields)
+
+
+def long_rows(
+    experiment: Experiment, config: Configuration, columns: List[str]
+) -> Iterable[List[Any]]:
+    """Yields the rows of a long format table for an experiment."""
+    for trial in experiment.trials.values():
+        measures: List[Tuple[Optional[Region], str, OutputColumnConfig]] = [
+            (None, measure, value)
+            for (measure, value) in config.measures.trial.items()
+        ] + [
+            (region, measure, value)
+            for region in trial.item.regions
+            for (measure, value) in config.measures.region.items()
+        ]
+        for (region, measure, value) in measures:
+            cell = table_value(measure_value(trial, region, measure), value.cutoff)
+            yield [
+                column_value(column, experiment, trial, region) for column in columns
+            ] + [
+                measure,
+                None if cell is None or isinstance(cell, str) else float(cell),
+                cell if isinstance(cell, str) else None,
+            ]
+
+
+def wide_rows(
+    experiment: Experiment, config: Configuration, columns: List[str]
+) -> Iterable[List[Any]]:
+    """Yields the rows of a wide format table for an experiment."""
+    measures = [
+        (measure, value)
+        for (measure, value) in wide_format_columns(config).items()
+        if measure not in config.output.columns
+    ]
+    for trial in experiment.trials.values():
+        for region in trial.item.regions:
+            yield [
+                column_value(column, experiment, trial, region) for column in columns
+            ] + [
+                table_value(measure_value(trial, region, measure), value.cutoff)
+                for (measure, value) in measures
+            ]
+
+
+def experiment_table(experiment: Experiment, config: Configuration = Configuration()):
+    """
+    Generates an Arrow table of all measures specified in config file for an
+    experiment, in wide or long format depending on the configuration.
+
+    Args:
+        experiment (Experiment): Experiment to generate a table for.
+        config (Configuration): Configuration.
+    """
+    table_schema = schema(config)
+    columns = output_columns(config)
+    rows = list(
+        wide_rows(experiment, config, columns)
+        if config.wide_format
+        else long_rows(experiment, config, columns)
+    )
+    return pyarrow.Table.from_arrays(
+        [
+            pyarrow.array(
+                [
+                    str(row[index])
+                    if field.type == pyarrow.string() and row[index] is not None
+                    else row[index]
+                    for row in rows
+                ],
+                type=field.type,
+            )
+            for (index, field) in enumerate(table_schema)
+        ],
+        schema=table_schema,
+    )
+
+
+def generate_table(
+    experiments: Iterable[Experiment], config: Configuration = Configuration()
+):
+    """
+    Generates an Arrow table of all measures specified in config file for a list of
+    experiments.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        config (Configuration): Configuration.
+    """
+    return pyarrow.concat_tables(
+        [experiment_table(experiment, config) for experiment in experiments]
+        or [schema(config).empty_table()]
+    )
+
+
+def write_parquet(
+    experiments: Iterable[Experiment],
+    output_file: str,
+    config: Configuration = Configuration(),
+):
+    """
+    Writes all measures specified in config file for a list of experiments to a
+    Parquet file, with one row group per experiment. Each experiment is written as
+    soon as it is produced, so experiments can be a generator that calculates them.
+
+    Args:
+        experiments (Iterable[Experiment]): Experiments.
+        output_file (str): Name of output file.
+        config (Configuration): Configuration.
+    """
+    require_pyarrow()
+    with pyarrow.parquet.ParquetWriter(output_file, schema(config)) as writer:
+        for experiment in experiments:
+            writer.write_table(experiment_table(experiment, config))
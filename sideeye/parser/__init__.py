@@ -2,4 +2,4 @@
 File parsers for regions and experiment data.
 """
 
-from sideeye.parser import asc, da1, region, experiment
+from sideeye.parser import asc, da1, region, experiment, cache
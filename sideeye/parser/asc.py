@@ -4,11 +4,20 @@ A parser for .ASC files.
 
 import re
 import os
+from io import StringIO
+from bisect import bisect_left
 from datetime import datetime
 from math import sqrt
-from typing import Optional, Dict, List, Tuple
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Iterable,
+    Iterator,
+    Union,
+)
 from mypy_extensions import TypedDict
-from sideeye.data import Fixation, Point, Trial, Item, Experiment
+from sideeye.data import FixationSequence, Trial, Item, Experiment
 from sideeye.config import Configuration, ASCParsingConfig
 from sideeye.types import Condition, ItemNum
 
@@ -25,7 +34,8 @@ class CharPosition(TypedDict, total=False):
     line_pos: int
 
 
-LINE_TYPES = ["MSG", "EFIX", "EBLINK", "SYNCTIME"]
+LINE_TYPES = ("MSG", "EFIX", "EBLINK")
+MESSAGE_TAGS = ("SYNCTIME", "TRIALID", "CHAR", "TRIAL_RESULT")
 ITEM_REGEX = re.compile(r"E(?P<condition>.+)I(?P<item>.+)D0")
 CHAR_REGEX = re.compile(
     r"CHAR.+(?P<char>.)\s+(?P<x1>.+)\s+(?P<y1>.+)\s+(?P<x2>.+)\s+(?P<y2>.+)"
@@ -38,6 +48,27 @@ BLINK_REGEX = re.compile(r"EBLINK\s+.+\s+.+\s+(?P<blink_dur>.+)")
 START_REGEX = re.compile(r".+\s+(?P<start>.+)\s+SYNCTIME")
 
 
+def tokenize(line: str) -> Optional[str]:
+    """
+    Classifies a line of an .ASC file by its leading keyword, or by its message tag
+    for MSG lines, so that only the matching extractor has to be run on it. Returns
+    one of `EFIX`, `EBLINK`, `SYNCTIME`, `TRIALID`, `CHAR` or `TRIAL_RESULT`, or None
+    if the line is not used in parsing.
+
+    Args:
+        line (str): A line of an .ASC file.
+    """
+    if not line.lstrip().startswith(LINE_TYPES):
+        return None
+    tokens = line.split(maxsplit=4)
+    if tokens[0] == "MSG":
+        # The tag follows the timestamp, or an optional time offset after it.
+        return next((tag for tag in tokens[2:4] if tag in MESSAGE_TAGS), None)
+    if tokens[0] in LINE_TYPES:
+        return tokens[0]
+    return None
+
+
 def get_condition(line: str) -> Optional[str]:
     """Returns item condition in line."""
     match = ITEM_REGEX.search(line)
@@ -122,118 +153,187 @@ def get_lines(characters: List[CharPosition]) -> List[CharPosition]:
     return [char for line in character_lines for char in line]
 
 
-def get_fixation(
-    line: str, characters: List[CharPosition], item: Item, index: int, time_offset: int
-) -> Tuple[Optional[Fixation], int]:
-    """Returns a Fixation object."""
-    fix = FIX_REGEX.search(line)
-    if fix:
-        fix_x = float(fix.group("x"))
-        fix_y = float(fix.group("y"))
-        characters = get_lines(characters)
-
-        for char in characters:
-            if (char["x1"] < fix_x < char["x2"]) and (char["y1"] < fix_y < char["y2"]):
-                offset = time_offset if time_offset else int(fix.group("start"))
-                return (
-                    Fixation(
-                        Point(char["char_pos"], char["line_pos"]),
-                        int(fix.group("start")) - offset,
-                        int(fix.group("end")) - offset,
-                        index,
-                        item.find_region(char["char_pos"], char["line_pos"]),
-                    ),
-                    offset,
-                )
-    return None, time_offset
+class CharacterLayout:
+    """
+    Spatial index of the characters displayed in a trial, used to map fixation
+    coordinates to character positions. Characters are clustered into lines with
+    `get_lines` once, and each position lookup is a binary search over the
+    y-intervals of the lines followed by a binary search over the x1 positions of
+    the characters in the line.
 
+    Args:
+        characters (List[CharPosition]): Character locations of the trial.
+    """
 
-def get_new_fixations(
-    new_fixation: Fixation,
-    fixations: List[Fixation],
+    def __init__(self, characters: List[CharPosition]):
+        self.line_y1: List[int] = []
+        self.line_y2: List[int] = []
+        self.lines: List[List[CharPosition]] = []
+        self.line_x1: List[List[int]] = []
+        self.line_max_x2: List[List[int]] = []
+        for char in get_lines(characters):
+            if not self.lines or char["line_pos"] != self.lines[-1][-1]["line_pos"]:
+                self.line_y1 += [char["y1"]]
+                self.line_y2 += [char["y2"]]
+                self.lines += [[]]
+                self.line_x1 += [[]]
+                self.line_max_x2 += [[]]
+            self.line_y1[-1] = min(self.line_y1[-1], char["y1"])
+            self.line_y2[-1] = max(self.line_y2[-1], char["y2"])
+            self.lines[-1] += [char]
+            self.line_x1[-1] += [char["x1"]]
+            self.line_max_x2[-1] += [
+                max(self.line_max_x2[-1][-1], char["x2"])
+                if self.line_max_x2[-1]
+                else char["x2"]
+            ]
+
+    def find(self, x_pos: float, y_pos: float) -> Optional[CharPosition]:
+        """
+        Returns the first character (in line and x1 order) whose bounding box
+        contains the position (x_pos, y_pos), or None if there is no such character.
+
+        Args:
+            x_pos (float): X position in pixels.
+            y_pos (float): Y position in pixels.
+        """
+        line = bisect_left(self.line_y1, y_pos) - 1
+        if line < 0 or y_pos >= self.line_y2[line]:
+            return None
+        characters = self.lines[line]
+        max_x2 = self.line_max_x2[line]
+        match = None
+        # Characters left of the x1 bisection point can only contain x_pos while
+        # the running maximum of their x2 positions is past it.
+        for pos in range(bisect_left(self.line_x1[line], x_pos) - 1, -1, -1):
+            if max_x2[pos] <= x_pos:
+                break
+            char = characters[pos]
+            if x_pos < char["x2"] and char["y1"] < y_pos < char["y2"]:
+                match = char
+        return match
+
+
+def add_fixation(
+    line: str,
+    layout: CharacterLayout,
+    fixations: FixationSequence,
+    time_offset: int,
     config: ASCParsingConfig = Configuration().asc_parsing,
-) -> List[Fixation]:
-    """Append a new fixation or merge with the previous fixation."""
-    if fixations and new_fixation.duration() < config.fixation_min_cutoff:
-        old_fix = fixations[-1]
-        return fixations[:-1] + [
-            Fixation(
-                Point(old_fix.char, old_fix.line),
-                old_fix.start,
-                new_fixation.end,
-                old_fix.index,
-                old_fix.region,
-            )
-        ]
-    if fixations and fixations[-1].duration() < config.fixation_min_cutoff:
-        old_fix = fixations[-1]
-        return fixations[:-1] + [
-            Fixation(
-                Point(new_fixation.char, new_fixation.line),
-                old_fix.start,
-                new_fixation.end,
-                old_fix.index,
-                new_fixation.region,
+) -> int:
+    """
+    Adds the fixation of an EFIX line to a FixationSequence with `merge_fixation`,
+    if the fixation is on a character of the layout. The fixation's fields are
+    written to the sequence's arrays, without creating a Fixation, and its region is
+    not set, so the regions of a trial's fixations can be assigned at once. Returns
+    the time offset of the trial's fixations, which is the start time of its first
+    fixation.
+    """
+    fix = FIX_REGEX.search(line)
+    if fix:
+        char = layout.find(float(fix.group("x")), float(fix.group("y")))
+        if char:
+            offset = time_offset if time_offset else int(fix.group("start"))
+            merge_fixation(
+                fixations,
+                char["char_pos"],
+                char["line_pos"],
+                int(fix.group("start")) - offset,
+                int(fix.group("end")) - offset,
+                config,
             )
-        ]
-    return fixations[:] + [new_fixation]
+            return offset
+    return time_offset
 
 
-def get_trials(
-    asc: str,
+def merge_fixation(
+    fixations: FixationSequence,
+    char: int,
+    line: int,
+    start: int,
+    end: int,
+    config: ASCParsingConfig = Configuration().asc_parsing,
+):
+    """
+    Appends a new fixation to a FixationSequence, or merges it with the last fixation
+    of the sequence if either of them is shorter than `fixation_min_cutoff`. A merged
+    fixation starts at the start of the last fixation and ends at the end of the new
+    one. It keeps the position of the last fixation, unless only the last fixation is
+    shorter than the cutoff. The last fixation is updated in the sequence's arrays in
+    place.
+    """
+    if start > end or start < 0 or end < 0:
+        raise ValueError("Invalid start or end time.")
+    last = len(fixations) - 1
+    if last < 0 or (
+        end - start >= config.fixation_min_cutoff
+        and fixations.end[last] - fixations.start[last] >= config.fixation_min_cutoff
+    ):
+        fixations.add(char, line, start, end, None)
+        return
+    if fixations.start[last] > end:
+        raise ValueError("Invalid start or end time.")
+    if end - start >= config.fixation_min_cutoff:
+        fixations.char[last] = char
+        fixations.line[last] = line
+        fixations.region_index[last] = -1
+    fixations.end[last] = end
+    fixations.changed()
+
+
+def iter_trials(
+    asc: Union[str, Iterable[str]],
     items: Dict[Condition, Dict[ItemNum, Item]],
     config: ASCParsingConfig = Configuration().asc_parsing,
-) -> List[Trial]:
+) -> Iterator[Trial]:
     """
-    Parses .ASC text into a list of Trial objects.
+    Parses .ASC text into Trial objects, yielding each Trial as soon as its
+    TRIAL_RESULT line is read. Lines are consumed one at a time, so an open file
+    can be passed instead of its text to avoid reading the whole file into memory.
 
     Args:
-        asc (string): Text of .ASC file.
+        asc (Union[str, Iterable[str]]): Text of .ASC file, or an iterable of its lines.
         items (Dict[str, Dict[str, Item]]): List of items in experiments.
         config (ASCParsingConfig): Configuration for .ASC parsing.
     """
     characters: List[CharPosition] = []
-    fixations: List[Fixation] = []
+    layout: Optional[CharacterLayout] = None
+    fixations = FixationSequence()
     fixation_start_time = 0
-    trials: List[Trial] = []
+    trial_count = 0
     exclude = False
     blinks = 0
     start_time = 0
     condition: Optional[str] = None
     item: Optional[str] = None
-    for line in asc.split("\n"):
-        if line.split() and line.split()[0] in LINE_TYPES:
-            start_time = get_start(line) or start_time
-            condition = get_condition(line) or condition
-            item = get_item(line) or item
-            char = get_char(line)
-            characters = characters + [char] if char else characters
-            new_fixation, fixation_start_time = (
-                get_fixation(
-                    line,
-                    characters,
-                    items[item][condition],
-                    len(fixations),
-                    fixation_start_time,
-                )
-                if start_time
+    for line in StringIO(asc) if isinstance(asc, str) else asc:
+        tag = tokenize(line)
+        if tag is None:
+            continue
+        if tag == "EFIX":
+            if (
+                start_time
                 and item
                 and condition
                 and item in items
                 and condition in items[item]
-                else (None, fixation_start_time)
-            )
-            fixations = (
-                get_new_fixations(new_fixation, fixations, config)
-                if new_fixation
-                else fixations
-            )
+            ):
+                layout = layout or CharacterLayout(characters)
+                fixation_start_time = add_fixation(
+                    line, layout, fixations, fixation_start_time, config
+                )
             if (
                 config.max_saccade_dur
                 and len(fixations) > 1
-                and fixations[-1].start - fixations[-2].end > config.max_saccade_dur
+                and fixations.start[-1] - fixations.end[-2] > config.max_saccade_dur
             ):
                 exclude = True
+        elif tag == "CHAR":
+            char = get_char(line)
+            if char:
+                characters.append(char)
+                layout = None
+        elif tag == "EBLINK":
             blink_dur = get_blink_dur(line)
             if blink_dur:
                 blinks += 1
@@ -241,32 +341,49 @@ def get_trials(
                     exclude = True
                 if config.blink_max_count and blinks > config.blink_max_count:
                     exclude = True
+        elif tag == "SYNCTIME":
+            start_time = get_start(line) or start_time
+        elif tag == "TRIALID":
+            condition = get_condition(line) or condition
+            item = get_item(line) or item
+        elif tag == "TRIAL_RESULT":
             end_time = get_end(line)
             if end_time:
-                if (
-                    item
-                    and condition
-                    and item in items
-                    and condition in items[item]
-                    and not exclude
-                ):
-                    trials += [
-                        Trial(
-                            len(trials),
+                if item and condition and item in items and condition in items[item]:
+                    fixations.assign_regions(items[item][condition])
+                    if not exclude:
+                        yield Trial(
+                            trial_count,
                             end_time - start_time,
                             items[item][condition],
                             fixations,
                         )
-                    ]
+                        trial_count += 1
                 start_time = 0
-                fixations = []
+                fixations = FixationSequence()
                 fixation_start_time = 0
                 characters = []
+                layout = None
                 exclude = False
                 blinks = 0
                 item = None
                 condition = None
-    return trials
+
+
+def get_trials(
+    asc: Union[str, Iterable[str]],
+    items: Dict[Condition, Dict[ItemNum, Item]],
+    config: ASCParsingConfig = Configuration().asc_parsing,
+) -> List[Trial]:
+    """
+    Parses .ASC text into a list of Trial objects.
+
+    Args:
+        asc (Union[str, Iterable[str]]): Text of .ASC file, or an iterable of its lines.
+        items (Dict[str, Dict[str, Item]]): List of items in experiments.
+        config (ASCParsingConfig): Configuration for .ASC parsing.
+    """
+    return list(iter_trials(asc, items, config))
 
 
 def parse(
@@ -283,7 +400,7 @@ def parse(
         config (ASCParsingConfig): Configuration for .ASC parsing.
     """
     with open(asc_file) as file:
-        trials = get_trials(file.read(), items, config)
+        trials = get_trials(file, items, config)
         return Experiment(
             "".join(os.path.split(asc_file)[1].split(".")[:-1]),
             trials,
@@ -0,0 +1,203 @@
+"""
+This module contains functions for caching parsed items and experiments on disk, so
+that files are only parsed again when they change. Cache entries are pickled to a
+directory (`Configuration.cache_dir`), keyed by the content hash, path and
+modification time of the parsed file, and the configuration sections used to parse
+it (``da1_fields``, ``region_fields``, ``asc_parsing`` and ``cutoffs``). Editing a
+file or changing one of these sections creates a new entry, and the least recently
+used entries are removed once the directory grows larger than
+`Configuration.cache_size` megabytes.
+
+Experiments are cached with the ItemTable of the items they were parsed with, so
+their entries refer to Items and Regions by id instead of containing copies of
+them (see `sideeye.data.ItemTable`).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, List, Optional, Tuple
+from sideeye.config import Configuration
+from sideeye.data import ItemTable
+
+# Incremented when the data classes change, so entries pickled by older versions of
+# SideEye are not loaded.
+CACHE_VERSION = 9
+
+# Configuration sections that change the result of parsing a file.
+CONFIG_SECTIONS = ["da1_fields", "region_fields", "asc_parsing", "cutoffs"]
+
+ENTRY_EXTENSION = ".pickle"
+
+
+def config_key(config: Configuration) -> str:
+    """Returns the configuration sections used by the parsers as a JSON string."""
+    return json.dumps(
+        {section: vars(getattr(config, section)) for section in CONFIG_SECTIONS},
+        sort_keys=True,
+    )
+
+
+def file_digest(filename: str) -> str:
+    """Returns the SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def object_digest(value: Any) -> str:
+    """Returns the SHA-256 digest of a pickled object."""
+    return hashlib.sha256(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def file_key(filename: str, config: Configuration, *parts: str) -> str:
+    """
+    Returns the cache key of a parsed file.
+
+    Args:
+        filename (str): Name of parsed file.
+        config (Configuration): Configuration the file is parsed with.
+        parts (str): Other values the parsed file depends on.
+    """
+    key = [
+        CACHE_VERSION,
+        filename,
+        os.stat(filename).st_mtime_ns,
+        file_digest(filename),
+        config_key(config),
+        *parts,
+    ]
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+
+def entry_path(directory: str, key: str) -> str:
+    """Returns the path of a cache entry."""
+    return os.path.join(directory, key + ENTRY_EXTENSION)
+
+
+def load(directory: str, key: str, table: ItemTable = None) -> Optional[Any]:
+    """
+    Returns a cached value, or None if there is no entry for the key. Entries that
+    cannot be read are removed. Loading an entry marks it as recently used.
+
+    Args:
+        directory (str): Cache directory.
+        key (str): Cache key.
+        table (Optional[ItemTable]): Item table the value was stored with.
+    """
+    path = entry_path(directory, key)
+    try:
+        with open(path, "rb") as entry:
+            value = pickle.load(entry) if table is None else table.load(entry)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        remove_entry(path)
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+def store(
+    directory: str, key: str, value: Any, max_size: int, table: ItemTable = None
+):
+    """
+    Caches a value, then removes the least recently used entries until the cache is
+    at most max_size bytes.
+
+    Args:
+        directory (str): Cache directory.
+        key (str): Cache key.
+        value (Any): Value to cache.
+        max_size (int): Maximum size of the cache directory, in bytes.
+        table (Optional[ItemTable]): Item table whose Items and Regions are stored
+            as references.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".tmp", delete=False
+    ) as entry:
+        if table is None:
+            pickle.dump(value, entry, pickle.HIGHEST_PROTOCOL)
+        else:
+            table.dump(value, entry)
+    os.replace(entry.name, entry_path(directory, key))
+    evict(directory, max_size)
+
+
+def remove_entry(path: str):
+    """Removes a cache entry, if it has not been removed already."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def evict(directory: str, max_size: int):
+    """
+    Removes the least recently used entries of a cache directory until it is at
+    most max_size bytes.
+
+    Args:
+        directory (str): Cache directory.
+        max_size (int): Maximum size of the cache directory, in bytes.
+    """
+    entries: List[Tuple[int, int, str]] = []
+    for name in os.listdir(directory):
+        if name.endswith(ENTRY_EXTENSION):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries += [(stat.st_mtime_ns, stat.st_size, path)]
+    size = sum(entry[1] for entry in entries)
+    for (_, entry_size, path) in sorted(entries):
+        if size <= max_size:
+            break
+        remove_entry(path)
+        size -= entry_size
+
+
+def cached(
+    config: Configuration,
+    key: Callable[[], str],
+    parse: Callable[[], Any],
+    table: Callable[[], ItemTable] = None,
+):
+    """
+    Returns the cached result of parse if the configuration has a cache directory
+    and the result is cached, otherwise calls parse and caches its result. Results
+    that are None are not cached.
+
+    Args:
+        config (Configuration): Configuration.
+        key (Callable[[], str]): Function returning the cache key.
+        parse (Callable[[], Any]): Function parsing the file.
+        table (Optional[Callable[[], ItemTable]]): Function returning the item table
+            of the items the file is parsed with. The table must be part of the
+            cache key.
+    """
+    if config.cache_dir is None:
+        return parse()
+    entry_key = key()
+    item_table = table() if table is not None else None
+    value = load(config.cache_dir, entry_key, item_table)
+    if value is None:
+        value = parse()
+        if value is not None:
+            store(
+                config.cache_dir,
+                entry_key,
+                value,
+                config.cache_size * 1024 * 1024,
+                item_table,
+            )
+    return value
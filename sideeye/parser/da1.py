@@ -1,35 +1,211 @@
 """
 A file parser for DA1 data files.
+
+If NumPy is installed, DA1 files are decoded in chunks of lines: all integers in a
+chunk are converted into one array, and the fixations of each trial are sliced from
+it as (x, y, start time, end time) columns. Exclusion by the fixation cutoffs is
+applied to the columns as array masks, and Fixation objects are only created when
+a trial's fixations are accessed. Without NumPy, or if a chunk contains something
+other than integers, lines are split and converted one at a time.
 """
 import os
-from typing import List, Dict
-from sideeye.data import Point, Fixation, Trial, Experiment, Item
+from io import StringIO
+from typing import Any, List, Dict, Iterator, Tuple
+from sideeye.data import FixationSequence, Trial, Experiment, Item
+from sideeye.data.sequence import typed_array
 from sideeye.types import ItemNum, Condition
-from sideeye.config import Configuration
+from sideeye.config import Configuration, DA1Config
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Approximate number of bytes of lines decoded at once.
+CHUNK_SIZE = 1 << 20
+WHITESPACE = b" \t\n\r\x0b\x0c"
 
+# The item number, condition, trial index, trial time and fixations of a line, as
+# a list of numbers or a tuple of columns.
+DA1Line = Tuple[str, str, int, int, Any]
 
-def validate(filename: str, fixations_first_col: int, da1_type: str = None):
-    """Checks if a file is in DA1 format."""
+
+def validate(
+    filename: str,
+    fixations_first_col: int,
+    da1_type: str = None,
+    first_line: str = None,
+):
+    """
+    Checks if a file is in DA1 format. The first line of the file is read from the
+    file, unless it is provided as `first_line`.
+    """
     if filename[-4:].lower() != ".da1":
         raise ValueError("%s Failed validation: Not a DA1 file" % filename)
-    with open(filename) as da1_file:
-        line = [int(x) for x in da1_file.readline().split()]
-        if (len(line) - fixations_first_col) % 4 != 0:
-            raise ValueError(
-                "%s Failed validation: Does not match DA1 file format" % filename
-            )
-        if da1_type == "robodoc" and line[3] < line[-1]:
-            raise ValueError("%s Failed validation: Not a robodoc DA1 file" % filename)
+    if first_line is None:
+        with open(filename) as da1_file:
+            first_line = da1_file.readline()
+    line = [int(x) for x in first_line.split()]
+    if (len(line) - fixations_first_col) % 4 != 0:
+        raise ValueError(
+            "%s Failed validation: Does not match DA1 file format" % filename
+        )
+    if da1_type == "robodoc" and line[3] < line[-1]:
+        raise ValueError("%s Failed validation: Not a robodoc DA1 file" % filename)
 
 
-def parse(
+def split_lines(text: str, fields: DA1Config) -> Iterator[DA1Line]:
+    """Splits the lines of DA1 text and converts their numbers one line at a time."""
+    for da1_line in StringIO(text, newline=None):
+        split_line = da1_line.split()
+        if not split_line:
+            continue
+        line: List[int] = [int(x) for x in split_line]
+        yield (
+            split_line[fields.number],
+            split_line[fields.condition],
+            line[fields.index],
+            line[fields.time],
+            line[fields.fixation_start :],
+        )
+
+
+def field_positions(firsts: Any, counts: Any, field: int) -> Any:
+    """
+    Returns the position of a field of each line in the numbers of a chunk, given
+    the position of the first number and the count of numbers of each line.
+    """
+    if numpy.any((field < -counts) | (field >= counts)):
+        raise IndexError("list index out of range")
+    return firsts + field % counts
+
+
+def decode_lines(
+    data: bytes,
+    filename: str,
+    items: Dict[ItemNum, Dict[Condition, Item]],
+    config: Configuration,
+) -> Iterator[DA1Line]:
+    """
+    Decodes the lines of DA1 text with NumPy. Every number in the text is converted
+    in one call. The fixations of all lines are validated and excluded by the
+    fixation cutoffs with array operations, and their regions are found with one
+    call to `Item.find_region_numbers` for each item. The fixations of each line
+    are yielded as (x, y, start time, end time, excluded, region number) arrays
+    for `FixationSequence.from_columns`. Lines of items that are not in the
+    experiment are yielded with no fixations. If the text contains something other
+    than integers, it is split line by line instead.
+    """
+    (fields, cutoffs) = (config.da1_fields, config.cutoffs)
+    chars = numpy.frombuffer(data, dtype=numpy.uint8)
+    space = numpy.isin(chars, numpy.frombuffer(WHITESPACE, dtype=numpy.uint8))
+    starts = numpy.flatnonzero(~space & numpy.concatenate(([True], space[:-1])))
+    ends = numpy.flatnonzero(~space & numpy.concatenate((space[1:], [True]))) + 1
+    try:
+        values = numpy.array(data.split(), dtype=numpy.int64)
+    except (ValueError, OverflowError):
+        yield from split_lines(data.decode(), fields)
+        return
+
+    newlines = numpy.cumsum((chars == ord("\n")) | (chars == ord("\r")))
+    firsts = numpy.flatnonzero(numpy.diff(newlines[starts], prepend=-1))
+    counts = numpy.diff(firsts, append=len(starts))
+    (token_starts, token_ends) = (starts.tolist(), ends.tolist())
+    numbers = [
+        data[token_starts[pos] : token_ends[pos]].decode()
+        for pos in field_positions(firsts, counts, fields.number).tolist()
+    ]
+    conditions = [
+        data[token_starts[pos] : token_ends[pos]].decode()
+        for pos in field_positions(firsts, counts, fields.condition).tolist()
+    ]
+    indices = values[field_positions(firsts, counts, fields.index)].tolist()
+    times = values[field_positions(firsts, counts, fields.time)].tolist()
+    line_items = [
+        items[number][condition] for (number, condition) in zip(numbers, conditions)
+    ]
+
+    fixation_start = fields.fixation_start
+    begins = numpy.clip(
+        fixation_start + counts if fixation_start < 0 else fixation_start, 0, counts
+    )
+    # Lines of items that are not in the experiment are skipped by iter_trials, so
+    # their fixations are neither decoded nor validated.
+    lengths = numpy.where(
+        numpy.array([bool(item) for item in line_items], dtype=bool),
+        counts - begins,
+        0,
+    )
+    if numpy.any(lengths % 4):
+        raise ValueError(
+            "%s Failed validation: Does not match DA1 file format" % filename
+        )
+    (char, line, start, end) = (
+        values[concatenated_ranges(firsts + begins, lengths)].reshape(-1, 4).T
+    )
+    if numpy.any((start > end) | (start < 0) | (end < 0)):
+        raise ValueError("Invalid start or end time.")
+    duration = end - start
+    excluded = (
+        (char < 0)
+        | (line < 0)
+        | ~((duration > cutoffs.min) & ((cutoffs.max < 0) | (duration < cutoffs.max)))
+    )
+
+    bounds = numpy.concatenate(([0], numpy.cumsum(lengths // 4)))
+    region_number = numpy.full(len(char), -1, dtype=numpy.int64)
+    item_lines: Dict[int, Tuple[Item, List[int]]] = {}
+    for (line_pos, item) in enumerate(line_items):
+        if item:
+            item_lines.setdefault(id(item), (item, []))[1].append(line_pos)
+    for (item, lines) in item_lines.values():
+        positions = concatenated_ranges(
+            bounds[lines], bounds[numpy.array(lines) + 1] - bounds[lines]
+        )
+        region_number[positions] = numpy.frombuffer(
+            item.find_region_numbers(char[positions], line[positions]),
+            dtype=numpy.int64,
+        )
+
+    columns = [
+        typed_array("q", char),
+        typed_array("q", line),
+        typed_array("q", start),
+        typed_array("q", end),
+        typed_array("b", excluded),
+        typed_array("q", region_number),
+    ]
+    bounds = bounds.tolist()
+    for (line_pos, number) in enumerate(numbers):
+        fixations = slice(bounds[line_pos], bounds[line_pos + 1])
+        yield (
+            number,
+            conditions[line_pos],
+            indices[line_pos],
+            times[line_pos],
+            tuple(column[fixations] for column in columns),
+        )
+
+
+def concatenated_ranges(starts: Any, lengths: Any) -> Any:
+    """
+    Returns the positions in a list of ranges, given as arrays of start positions
+    and lengths, concatenated into one array.
+    """
+    positions = numpy.repeat(starts - (numpy.cumsum(lengths) - lengths), lengths)
+    positions += numpy.arange(len(positions))
+    return positions
+
+
+def iter_trials(
     filename: str,
     items: Dict[ItemNum, Dict[Condition, Item]],
     config: Configuration = Configuration(),
     da1_type: str = None,
-) -> Experiment:
+) -> Iterator[Trial]:
     """
-    Parses DA1-like files into sideeye Experiment objects, given column positions.
+    Parses DA1-like files into sideeye Trial objects, given column positions. Each
+    Trial is yielded as soon as the chunk of the file containing its line is parsed.
 
     Args:
         filename (str): DA1 file.
@@ -39,74 +215,92 @@ def parse(
     if config.terminal_output > 0:
         print("\nParsing DA1 file: %s" % filename)
 
-    validate(filename, config.da1_fields.fixation_start, da1_type)
-
     def parse_fixations(line, item):
-        """Parses a list of (x, y, start time, end time) numbers into a list of Fixations."""
-        fixations = []
+        """
+        Parses a list of (x, y, start time, end time) numbers, or the columns
+        decoded by `decode_lines`, into a FixationSequence, and assigns the regions
+        of all fixations at once.
+        """
+        if isinstance(line, tuple):
+            return FixationSequence.from_columns(item, *line)
+        if len(line) % 4 != 0:
+            raise ValueError(
+                "%s Failed validation: Does not match DA1 file format" % filename
+            )
+
+        fixations = FixationSequence(item.regions)
         for pos in range(0, len(line), 4):
-            x_pos = line[pos]
-            y_pos = line[pos + 1]
             start = line[pos + 2]
             end = line[pos + 3]
-            if (end - start) > config.cutoffs.min and (
-                config.cutoffs.max < 0 or (end - start) < config.cutoffs.max
-            ):
-                fixations += [
-                    Fixation(
-                        Point(x_pos, y_pos),
-                        start,
-                        end,
-                        len(fixations),
-                        item.find_region(x_pos, y_pos),
-                    )
-                ]
-            else:
-                fixations += [
-                    Fixation(
-                        Point(x_pos, y_pos),
-                        start,
-                        end,
-                        len(fixations),
-                        item.find_region(x_pos, y_pos),
-                        excluded=True,
-                    )
-                ]
+            fixations.add(
+                line[pos],
+                line[pos + 1],
+                start,
+                end,
+                None,
+                not (
+                    (end - start) > config.cutoffs.min
+                    and (config.cutoffs.max < 0 or (end - start) < config.cutoffs.max)
+                ),
+            )
+        fixations.assign_regions(item)
 
         return fixations
 
-    with open(filename) as da1_file:
-        trials: List[Trial] = []
-        for da1_line in da1_file:
-            split_line = da1_line.split()
-            number = split_line[config.da1_fields.number]
-            condition = split_line[config.da1_fields.condition]
-            line: List[int] = [int(x) for x in split_line]
-            if config.terminal_output == 2 or config.terminal_output >= 5:
-                print("\tParsing trial: %s" % line[config.da1_fields.index])
-            if items[number][condition]:
-                fixations = parse_fixations(
-                    line[config.da1_fields.fixation_start :], items[number][condition]
-                )
-                trials += [
-                    Trial(
-                        line[config.da1_fields.index],
-                        line[config.da1_fields.time],
+    with open(filename, "rb") as da1_file:
+        chunk = da1_file.readlines(CHUNK_SIZE)
+        validate(
+            filename,
+            config.da1_fields.fixation_start,
+            da1_type,
+            StringIO(chunk[0].decode() if chunk else "", newline=None).readline(),
+        )
+        while chunk:
+            data = b"".join(chunk)
+            lines = (
+                decode_lines(data, filename, items, config)
+                if numpy is not None
+                else split_lines(data.decode(), config.da1_fields)
+            )
+            for (number, condition, index, time, fixations) in lines:
+                if config.terminal_output == 2 or config.terminal_output >= 5:
+                    print("\tParsing trial: %s" % index)
+                if items[number][condition]:
+                    yield Trial(
+                        index,
+                        time,
                         items[number][condition],
-                        fixations,
+                        parse_fixations(fixations, items[number][condition]),
                         config.cutoffs.include_fixation,
                         config.cutoffs.include_saccades,
                     )
-                ]
-            else:
-                print(
-                    "Item number",
-                    number,
-                    ", condition",
-                    condition,
-                    "does not exist. It was not added to the Experiment object.",
-                )
-
-        return Experiment(
-            "".join(os.path.split(filename)[1].split(".")[:-1]), trials, filename
-        )
+                else:
+                    print(
+                        "Item number",
+                        number,
+                        ", condition",
+                        condition,
+                        "does not exist. It was not added to the Experiment object.",
+                    )
+            chunk = da1_file.readlines(CHUNK_SIZE)
+
+
+def parse(
+    filename: str,
+    items: Dict[ItemNum, Dict[Condition, Item]],
+    config: Configuration = Configuration(),
+    da1_type: str = None,
+) -> Experiment:
+    """
+    Parses DA1-like files into sideeye Experiment objects, given column positions.
+
+    Args:
+        filename (str): DA1 file.
+        items (Dict[ItemNum, Dict[Condition, Item]]): List of items in the experiment.
+        da1_type (str): Type of DA1 file - `timdrop`, `robodoc`, or `None` for any other type.
+    """
+    return Experiment(
+        "".join(os.path.split(filename)[1].split(".")[:-1]),
+        list(iter_trials(filename, items, config, da1_type)),
+        filename,
+    )
@@ -3,12 +3,119 @@ This module contains functions for parsing experiments.
 
 """
 
-from typing import List
-from sideeye.parser import region, da1, asc
-from sideeye.data import Experiment
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Iterator, Tuple, Optional, Any
+from sideeye.parser import region, da1, asc, cache
+from sideeye.data import Experiment, Trial, Item, ItemTable
+from sideeye.types import ItemNum, Condition
 from sideeye.config import Configuration
 
 
+def parse_items(
+    region_file: str, config: Configuration = Configuration()
+) -> Dict[ItemNum, Dict[Condition, Item]]:
+    """
+    Given a region file and config file, parse the items of an experiment. If the
+    configuration has a cache directory, the items are cached (see
+    `sideeye.parser.cache`).
+
+    Args:
+        region_file: Name of region file (.cnt, .reg, or .txt).
+        config (Configuration): Configuration.
+    """
+    verbose = config.terminal_output
+
+    def parse_region_file():
+        if region_file[-4:].lower() == ".txt":
+            return region.textfile(region_file, verbose=verbose)
+        return region.file(region_file, config, verbose=verbose)
+
+    return cache.cached(
+        config, lambda: cache.file_key(region_file, config), parse_region_file
+    )
+
+
+def parse_file(
+    experiment_file: str,
+    items: Dict[ItemNum, Dict[Condition, Item]],
+    config: Configuration = Configuration(),
+    items_key: str = None,
+    table: ItemTable = None,
+) -> Optional[Experiment]:
+    """
+    Given a DA1 or ASC file and the items of the experiment, parse an Experiment.
+    Returns None if the file is not a DA1 or ASC file. If the configuration has a
+    cache directory, the experiment is cached (see `sideeye.parser.cache`) with
+    the item table of the items, so the cached experiment refers to `items`, and
+    its cache key is stored as `Experiment.source_key`.
+
+    Args:
+        experiment_file (str): Name of DA1 or ASC file.
+        items (Dict[ItemNum, Dict[Condition, Item]]): Items in the experiment.
+        config (Configuration): Configuration.
+        items_key (Optional[str]): Cache key of the items, such as the key of the
+            region file they were parsed from. If not provided, a digest of the
+            items is computed when caching.
+        table (Optional[ItemTable]): Item table of `items`. If not provided, it is
+            created when caching.
+    """
+
+    def parse_experiment_file():
+        if experiment_file[-4:].lower() == ".da1":
+            return da1.parse(experiment_file, items, config)
+        if experiment_file[-4:].lower() == ".asc":
+            return asc.parse(experiment_file, items, config.asc_parsing)
+        return None
+
+    if config.cache_dir is None:
+        return parse_experiment_file()
+    key = cache.file_key(
+        experiment_file,
+        config,
+        items_key if items_key is not None else cache.object_digest(items),
+    )
+    experiment = cache.cached(
+        config,
+        lambda: key,
+        parse_experiment_file,
+        lambda: table if table is not None else ItemTable.from_dict(items),
+    )
+    if experiment is not None:
+        experiment.source_key = key
+    return experiment
+
+
+# Items and configuration of a parse_files worker process, set once per worker by
+# init_worker so they are not pickled with every file.
+WORKER_STATE: Dict[str, Any] = {}
+
+
+def init_worker(table: ItemTable, config: Configuration, items_key: str = None):
+    """Stores the items and configuration shared by all files parsed in a worker."""
+    WORKER_STATE["table"] = table
+    WORKER_STATE["items"] = table.as_dict()
+    WORKER_STATE["config"] = config
+    WORKER_STATE["items_key"] = items_key
+
+
+def parse_worker_file(experiment_file: str) -> Optional[bytes]:
+    """
+    Parses a file in a worker process initialized by init_worker. The experiment is
+    returned pickled with the worker's item table, without its Items.
+    """
+    table = WORKER_STATE["table"]
+    experiment = parse_file(
+        experiment_file,
+        WORKER_STATE["items"],
+        WORKER_STATE["config"],
+        WORKER_STATE["items_key"],
+        table,
+    )
+    return None if experiment is None else table.dumps(experiment)
+
+
 def parse(
     experiment_file: str, region_file: str, config: Configuration = Configuration()
 ) -> Experiment:
@@ -21,17 +128,14 @@ def parse(
         region_file: Name of region file (.cnt, .reg, or .txt).
         config (Configuration): Configuration.
     """
-    verbose = config.terminal_output
-
-    if region_file[-4:].lower() == ".txt":
-        items = region.textfile(region_file, verbose=verbose)
-    else:
-        items = region.file(region_file, config, verbose=verbose)
-
-    if experiment_file[-4:].lower() == ".da1":
-        experiment = da1.parse(experiment_file, items, config)
-    if experiment_file[-4:].lower() == ".asc":
-        experiment = asc.parse(experiment_file, items, config.asc_parsing)
+    experiment = parse_file(
+        experiment_file,
+        parse_items(region_file, config),
+        config,
+        None if config.cache_dir is None else cache.file_key(region_file, config),
+    )
+    if experiment is None:
+        raise ValueError("%s is not a DA1 or ASC file." % experiment_file)
     return experiment
 
 
@@ -39,6 +143,7 @@ def parse_files(
     experiment_files: List[str],
     region_file: str,
     config: Configuration = Configuration(),
+    workers: int = None,
 ) -> List[Experiment]:
     """
     Given a list of DA1 or ASC files, a region file, and config file, parse all files in
@@ -48,20 +153,75 @@ def parse_files(
         experiment_files: List of DA1 or ASC files.
         region_file: Name of region file (.cnt, .reg, or .txt).
         config (Config): Configuration.
+        workers (Optional[int]): Number of worker processes to parse files with, or 0
+            for one per CPU. If not provided, `config.workers` is used. Experiments are
+            returned in the order of `experiment_files`, and share the Items of the
+            region file whether or not they are parsed in workers.
     """
-    verbose = config.terminal_output
+    workers = config.workers if workers is None else workers
+    items = parse_items(region_file, config)
+    table = ItemTable.from_dict(items)
+    items_key = (
+        None if config.cache_dir is None else cache.file_key(region_file, config)
+    )
+    files: List[str] = []
+    for experiment_file in experiment_files:
+        if experiment_file[-4:].lower() in [".da1", ".asc"]:
+            files += [experiment_file]
+        else:
+            print("Skipping %s: not a DA1 or ASC file." % experiment_file)
 
-    if region_file[-4:].lower() == ".txt":
-        items = region.textfile(region_file, verbose=verbose)
+    if workers == 1 or len(files) < 2:
+        experiments = [
+            parse_file(file, items, config, items_key, table) for file in files
+        ]
     else:
-        items = region.file(region_file, config, verbose=verbose)
-    experiments: List[Experiment] = []
+        with ProcessPoolExecutor(
+            max_workers=workers if workers > 0 else None,
+            initializer=init_worker,
+            initargs=(table, config, items_key),
+        ) as executor:
+            experiments = [
+                None if data is None else table.loads(data)
+                for data in executor.map(parse_worker_file, files)
+            ]
+
+    return [experiment for experiment in experiments if experiment is not None]
+
+
+def iter_trials(
+    experiment_files: List[str],
+    region_file: str,
+    config: Configuration = Configuration(),
+) -> Iterator[Tuple[Experiment, Trial]]:
+    """
+    Given a list of DA1 or ASC files, a region file, and config file, parse the trials
+    in each file one at a time. Each trial is yielded with an Experiment holding the
+    name, filename, and date of the file it came from, but none of its trials, so
+    that no file has to be held in memory as a whole.
+
+    Args:
+        experiment_files: List of DA1 or ASC files.
+        region_file: Name of region file (.cnt, .reg, or .txt).
+        config (Config): Configuration.
+    """
+    items = parse_items(region_file, config)
+
     for experiment_file in experiment_files:
+        name = "".join(os.path.split(experiment_file)[1].split(".")[:-1])
         if experiment_file[-4:].lower() == ".da1":
-            experiments += [da1.parse(experiment_file, items, config)]
+            experiment = Experiment(name, [], experiment_file)
+            for trial in da1.iter_trials(experiment_file, items, config):
+                yield (experiment, trial)
         elif experiment_file[-4:].lower() == ".asc":
-            experiments += [asc.parse(experiment_file, items, config.asc_parsing)]
+            experiment = Experiment(
+                name,
+                [],
+                experiment_file,
+                datetime.fromtimestamp(os.path.getmtime(experiment_file)),
+            )
+            with open(experiment_file) as asc_file:
+                for trial in asc.iter_trials(asc_file, items, config.asc_parsing):
+                    yield (experiment, trial)
         else:
             print("Skipping %s: not a DA1 or ASC file." % experiment_file)
-
-    return experiments
@@ -19,3 +19,7 @@ ItemNum = str
 ItemId = Tuple[ItemNum, Condition]
 Measures = DefaultDict[int, DefaultDict[str, Union[Dict, RegionMeasure]]]
 TrialMeasures = DefaultDict[str, Dict]
+RegionMeasureTable = Dict[int, Dict[str, Tuple[Any, Optional[List[int]]]]]
+MeasureTable = Dict[ItemId, Tuple[Dict[str, Any], RegionMeasureTable]]
+FirstPassTable = Dict[int, List[Fixation]]
+FirstPassCache = Optional[Tuple[int, FirstPassTable]]
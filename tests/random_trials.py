@@ -0,0 +1,44 @@
+import random
+from sideeye.data import Point, Fixation, Region, Item, Trial
+
+
+def random_trial(rng: random.Random, lines: int = 1, include: bool = False) -> Trial:
+    """
+    Returns a trial of up to 12 random fixations in an item of 1 to 6 regions, for
+    comparing implementations of the same measures.
+
+    Args:
+        rng (random.Random): Random number generator.
+        lines (int): Number of lines the fixations are placed on at random. Each
+            fixation keeps the region of its character position.
+        include (bool): Whether to set `include_fixation` and `include_saccades`
+            of the trial at random. If False, both are False.
+    """
+    regions = [
+        Region(Point(10 * number, 0), Point(10 * number + 10, 0))
+        for number in range(rng.randint(1, 6))
+    ]
+    fixations = []
+    time = 0
+    for index in range(rng.randint(0, 12)):
+        number = rng.randrange(len(regions))
+        duration = rng.choice([0, 50, 100, 120])
+        fixations += [
+            Fixation(
+                Point(10 * number + rng.randrange(10), rng.randrange(lines)),
+                time,
+                time + duration,
+                index,
+                regions[number],
+                excluded=rng.random() < 0.25,
+            )
+        ]
+        time += duration + rng.choice([0, 10])
+    return Trial(
+        1,
+        time if rng.random() < 0.9 else None,
+        Item(1, 1, regions),
+        fixations,
+        include_fixation=include and rng.random() < 0.5,
+        include_saccades=include and rng.random() < 0.5,
+    )
@@ -1,6 +1,6 @@
 import os
 from nose2.tools import such
-from sideeye import config, parser, Point, Fixation, Trial, Item
+from sideeye import config, parser, Point, Fixation, FixationSequence, Trial, Item
 
 with such.A(".ASC Parser") as it:
 
@@ -93,6 +93,23 @@ with such.A(".ASC Parser") as it:
             ),
         )
 
+    @it.should("parse an iterable of .ASC lines")
+    def test_asc_lines():
+        text = it.asc_header + "EFIX R 2000 2010 10 12 105 0" + it.asc_end
+        parsed_experiment = parser.asc.get_trials(
+            iter(text.splitlines(keepends=True)), it.items
+        )
+        it.assertEqual(parsed_experiment, parser.asc.get_trials(text, it.items))
+        it.assertEqual(len(parsed_experiment), 1)
+
+    @it.should("yield trials one at a time")
+    def test_iter_trials():
+        text = it.asc_header + "EFIX R 2000 2010 10 12 105 0" + it.asc_end
+        trials = parser.asc.iter_trials(text + text, it.items)
+        it.assertEqual(next(trials).index, 0)
+        it.assertEqual(next(trials).index, 1)
+        it.assertEqual(list(trials), [])
+
     @it.should("only parse trials ending in D0")
     def test_d0_d1():
         trial_1 = it.asc_header + "EFIX R 2000 2010 10 12 105 0" + it.asc_end
@@ -224,6 +241,23 @@ with such.A(".ASC Parser") as it:
             ),
         )
 
+    @it.should("merge fixations into the last fixation of a sequence in place")
+    def test_merge_fixation():
+        asc_config = config.ASCParsingConfig({"fixation_min_cutoff": 10})
+        fixations = FixationSequence()
+        parser.asc.merge_fixation(fixations, 1, 0, 0, 5, asc_config)
+        version = fixations.version
+        parser.asc.merge_fixation(fixations, 3, 0, 10, 30, asc_config)
+        it.assertNotEqual(fixations.version, version)
+        parser.asc.merge_fixation(fixations, 5, 0, 35, 37, asc_config)
+        parser.asc.merge_fixation(fixations, 7, 1, 40, 60, asc_config)
+        it.assertEqual(list(fixations.char), [3, 7])
+        it.assertEqual(list(fixations.line), [0, 1])
+        it.assertEqual(list(fixations.start), [0, 40])
+        it.assertEqual(list(fixations.end), [37, 60])
+        with it.assertRaises(ValueError):
+            parser.asc.merge_fixation(fixations, 1, 0, 70, 65, asc_config)
+
     @it.should("not include fixations before the start of a trial.")
     def test_fix_before_synctime():
         fixations = """
@@ -307,6 +341,22 @@ with such.A(".ASC Parser") as it:
         )
         it.assertEqual(parsed_experiment, [])
 
+    @it.should("classify lines by keyword or message tag")
+    def test_tokenize():
+        it.assertEqual(parser.asc.tokenize("MSG 1 SYNCTIME"), "SYNCTIME")
+        it.assertEqual(parser.asc.tokenize("MSG 1 -2 SYNCTIME"), "SYNCTIME")
+        it.assertEqual(parser.asc.tokenize("  MSG\t1000 TRIALID E1I1D0"), "TRIALID")
+        it.assertEqual(
+            parser.asc.tokenize("MSG 1001 REGION CHAR 1 1   50 100 60 110"), "CHAR"
+        )
+        it.assertEqual(parser.asc.tokenize("MSG 10001 TRIAL_RESULT 7"), "TRIAL_RESULT")
+        it.assertEqual(parser.asc.tokenize("EFIX R 2000 2010 10 12 105 0"), "EFIX")
+        it.assertEqual(parser.asc.tokenize("EBLINK R 2010 2015 5"), "EBLINK")
+        it.assertEqual(parser.asc.tokenize("MSG 10002 TRIAL OK"), None)
+        it.assertEqual(parser.asc.tokenize("SFIX R 2000"), None)
+        it.assertEqual(parser.asc.tokenize("2000\t  10.0\t  12.0\t 2100.0"), None)
+        it.assertEqual(parser.asc.tokenize(""), None)
+
     with it.having("get_lines") as it:
 
         @it.should("cluster character coordinates into lines")
@@ -387,5 +437,40 @@ with such.A(".ASC Parser") as it:
             ]
             it.assertEqual(parser.asc.get_lines(chars), expected_chars)
 
+    with it.having("CharacterLayout") as it:
+
+        @it.should("find the character containing a position")
+        def test_character_layout():
+            layout = parser.asc.CharacterLayout(
+                [
+                    {"char": "c", "x1": 20, "x2": 30, "y1": 11, "y2": 23},
+                    {"char": "a", "x1": 0, "x2": 10, "y1": 10, "y2": 20},
+                    {"char": "b", "x1": 10, "x2": 20, "y1": 9, "y2": 20},
+                    {"char": "d", "x1": 0, "x2": 10, "y1": 30, "y2": 40},
+                    {"char": "e", "x1": 10, "x2": 20, "y1": 29, "y2": 41},
+                ]
+            )
+            it.assertEqual(layout.find(15, 15)["char"], "b")
+            it.assertEqual(layout.find(15, 15)["char_pos"], 1)
+            it.assertEqual(layout.find(25, 22)["char"], "c")
+            it.assertEqual(layout.find(5, 35)["char"], "d")
+            it.assertEqual(layout.find(15, 40)["line_pos"], 1)
+            it.assertEqual(layout.find(10, 15), None)
+            it.assertEqual(layout.find(5, 21), None)
+            it.assertEqual(layout.find(5, 25), None)
+            it.assertEqual(layout.find(35, 15), None)
+
+        @it.should("find the first character when character boxes overlap")
+        def test_character_layout_overlap():
+            layout = parser.asc.CharacterLayout(
+                [
+                    {"char": "a", "x1": 0, "x2": 30, "y1": 10, "y2": 20},
+                    {"char": "b", "x1": 10, "x2": 20, "y1": 10, "y2": 20},
+                    {"char": "c", "x1": 20, "x2": 40, "y1": 10, "y2": 20},
+                ]
+            )
+            it.assertEqual(layout.find(25, 15)["char"], "a")
+            it.assertEqual(layout.find(35, 15)["char"], "c")
+
 
 it.createTests(globals())
@@ -1,5 +1,12 @@
+import os
+import pickle
+import shutil
+import tempfile
 from nose2.tools import such
-from sideeye import Point, Fixation, Region, Item, Trial, Experiment
+from sideeye import Point, Fixation, Region, Item, Trial, Experiment, parser
+from sideeye.calculate import calculate_measures
+from sideeye.config import Configuration
+from sideeye.output import generate_all_output
 
 with such.A("Experiment") as it:
 
@@ -44,5 +51,99 @@ with such.A("Experiment") as it:
             != Experiment("ex2", [it.trial], filename="ex2.da1")
         )
 
+    with it.having("archives"):
+
+        @it.has_setup
+        def setup_archives():
+            dirname = os.path.dirname(os.path.realpath(__file__))
+            it.directory = tempfile.mkdtemp()
+            it.archive = os.path.join(it.directory, "timdrop.sideeye")
+            it.parsed = parser.experiment.parse(
+                os.path.join(dirname, "../testdata/timdrop.DA1"),
+                os.path.join(dirname, "../testdata/timdropDA1.cnt"),
+            )
+
+        @it.has_teardown
+        def teardown_archives():
+            shutil.rmtree(it.directory)
+
+        @it.should("save and load experiments")
+        def test_save_load():
+            it.parsed.save(it.archive)
+            loaded = Experiment.load(it.archive)
+            it.assertEqual(loaded, it.parsed)
+            trials = list(loaded.trials.values())
+            it.assertIsInstance(trials[0].fixations[0], Fixation)
+            it.assertIs(trials[0].fixations[0].region, trials[0].item.regions[0])
+            config = Configuration()
+            calculate_measures([it.parsed, loaded], config.measures.names)
+            it.assertEqual(
+                generate_all_output([loaded], config),
+                generate_all_output([it.parsed], config),
+            )
+
+        @it.should("build trials of loaded experiments when they are used")
+        def test_lazy_load():
+            it.parsed.save(it.archive)
+            loaded = Experiment.load(it.archive)
+            it.assertIsNone(loaded.trials.entries)
+            trials = dict(Experiment.load(it.archive).trials)
+            (key, trial) = list(trials.items())[-1]
+            it.assertEqual(loaded.trials[key], trial)
+            it.assertIs(loaded.trials[key], loaded.trials[key])
+            it.assertEqual(len(loaded.trials.pending), len(trials) - 1)
+            it.assertEqual(
+                loaded.get_trial(index=trial.index).item,
+                it.parsed.get_trial(index=trial.index).item,
+            )
+            it.assertEqual(loaded.date, it.parsed.date)
+            del loaded.trials[key]
+            it.assertNotIn(key, loaded.trials)
+            loaded.trials[key] = trial
+            it.assertEqual(loaded.trials, trials)
+
+        @it.should("pickle loaded experiments")
+        def test_pickle_loaded():
+            it.parsed.save(it.archive)
+            loaded = Experiment.load(it.archive)
+            unpickled = pickle.loads(pickle.dumps(loaded))
+            it.assertEqual(unpickled, loaded)
+            trial = list(unpickled.trials.values())[0]
+            trial.fixations.add(1, 0, 10000, 10100, None)
+            it.assertEqual(len(trial.fixations), len(trial.fixations.start))
+
+        @it.should("save experiments with lists of fixations")
+        def test_save_lists():
+            item = Item(
+                3,
+                1,
+                [Region(Point(0, 0), Point(5, 0)), Region(Point(5, 0), Point(9, 1))],
+            )
+            trial = Trial(
+                0,
+                100,
+                item,
+                [
+                    Fixation(Point(1, 0), 0, 10, 0, item.regions[0]),
+                    Fixation(Point(1, 1), 20, 30, 1, item.regions[1], True),
+                    Fixation(Point(-1, 0), 40, 50, 2, None),
+                ],
+                include_fixation=True,
+            )
+            experiment = Experiment("lists", [trial], "lists.da1")
+            experiment.save(it.archive)
+            loaded = Experiment.load(it.archive)
+            it.assertEqual(loaded, experiment)
+            it.assertTrue(loaded.trials[(3, 1)].include_fixation)
+            with it.assertRaises(ValueError):
+                it.experiment.save(it.archive)
+
+        @it.should("not load files that are not archives")
+        def test_load_validation():
+            with open(it.archive, "wb") as archive_file:
+                archive_file.write(b"index condition number")
+            with it.assertRaises(ValueError):
+                Experiment.load(it.archive)
+
 
 it.createTests(globals())
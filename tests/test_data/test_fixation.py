@@ -29,6 +29,19 @@ with such.A("Fixation") as it:
             != Fixation(Point(1, 3), 3, 4, 1, "region")
         )
 
+    @it.should("compare every attribute when it has a region")
+    def test_fixation_attribute_equality():
+        it.assertNotEqual(it.fix1, it.fix2)
+        it.fix2.index = 0
+        it.assertEqual(it.fix1, it.fix2)
+        it.fix2.excluded = True
+        it.assertNotEqual(it.fix1, it.fix2)
+
+    @it.should("not allow attributes that are not defined")
+    def test_fixation_slots():
+        with it.assertRaises(AttributeError):
+            it.fix1.label = "label"
+
     @it.should("only allow valid fixations")
     def test_fixation_validation():
         with it.assertRaises(ValueError):
@@ -36,6 +36,74 @@ with such.A("Item") as it:
         it.assertEqual(it.labeled_item.find_region(1, 1), it.r1)
         it.assertEqual(it.labeled_item.find_region(9, 1), it.r3)
 
+    @it.should("find regions at the edges of an item")
+    def test_find_region_edges():
+        it.assertEqual(it.labeled_item.find_region(0, 0), it.r1)
+        it.assertEqual(it.labeled_item.find_region(3, 1), it.r2)
+        it.assertEqual(it.labeled_item.find_region(7, 1), it.r2)
+        it.assertEqual(it.labeled_item.find_region(8, 1), it.r3)
+        it.assertEqual(it.labeled_item.find_region(50, 2), it.r3)
+        with it.assertRaises(ValueError):
+            it.labeled_item.find_region(0, 3)
+
+    @it.should("find regions by bisection the same way as a linear scan")
+    def test_find_region_bisection():
+        regions = [
+            Region(Point(0, 0), Point(4, 0)),
+            Region(Point(4, 0), Point(9, 0)),
+            Region(Point(9, 0), Point(2, 1)),
+            Region(Point(2, 1), Point(2, 1)),
+            Region(Point(2, 1), Point(6, 1)),
+            Region(Point(0, 3), Point(5, 3)),
+        ]
+        item = Item(3, 1, regions)
+        it.assertIsNotNone(item.region_starts)
+        for y_pos in range(-1, 5):
+            for x_pos in range(-1, 12):
+                expected = None
+                for (number, region) in enumerate(regions[1:]):
+                    if region.start.y > y_pos or (
+                        region.start.y == y_pos and region.start.x > x_pos
+                    ):
+                        expected = regions[number]
+                        break
+                if expected is None and y_pos <= regions[-1].end.y:
+                    expected = regions[-1]
+                if expected is None:
+                    with it.assertRaises(ValueError):
+                        item.find_region(x_pos, y_pos)
+                else:
+                    it.assertIs(item.find_region(x_pos, y_pos), expected)
+
+    @it.should("find the regions of many positions at once")
+    def test_find_regions():
+        positions = [(x_pos, y_pos) for y_pos in range(0, 3) for x_pos in range(-1, 12)]
+        x_positions = [x_pos for (x_pos, _) in positions]
+        y_positions = [y_pos for (_, y_pos) in positions]
+        it.assertEqual(
+            it.labeled_item.find_regions(x_positions, y_positions),
+            [it.labeled_item.find_region(x_pos, y_pos) for (x_pos, y_pos) in positions],
+        )
+        it.assertEqual(
+            list(it.labeled_item.find_region_numbers(x_positions, y_positions)),
+            [
+                it.labeled_item.find_region(x_pos, y_pos).number
+                for (x_pos, y_pos) in positions
+            ],
+        )
+        with it.assertRaises(ValueError):
+            it.labeled_item.find_regions([1, 2, 3], [1, 3, 1])
+        with it.assertRaises(ValueError):
+            it.labeled_item.find_regions([1, 2], [1])
+
+    @it.should("find regions in items with regions out of order")
+    def test_find_region_unordered():
+        item = Item(4, 1, [it.r1, it.r3, it.r2])
+        it.assertIsNone(item.region_starts)
+        it.assertEqual(item.find_region(5, 1), it.r1)
+        it.assertEqual(item.find_region(9, 1), it.r2)
+        it.assertEqual(item.find_regions([5, 9], [1, 1]), [it.r1, it.r2])
+
     @it.should("get the number of regions in the item")
     def test_region_count():
         it.assertEqual(it.labeled_item.region_count(), 3)
@@ -0,0 +1,127 @@
+import pickle
+from nose2.tools import such
+from sideeye import Point, Fixation, Region, Item, Trial
+from sideeye.data import FixationSequence, FixationView
+
+with such.A("FixationSequence") as it:
+
+    @it.has_test_setup
+    def setup():
+        it.regions = [
+            Region(Point(0, 0), Point(5, 0)),
+            Region(Point(5, 0), Point(10, 0)),
+            Region(Point(10, 0), Point(15, 0)),
+        ]
+        it.item = Item(1, 1, it.regions)
+        it.fixations = [
+            Fixation(Point(1, 0), 0, 100, 0, it.regions[0]),
+            Fixation(Point(12, 0), 120, 200, 1, it.regions[2]),
+            Fixation(Point(6, 0), 230, 300, 2, it.regions[1], excluded=True),
+            Fixation(Point(7, 0), 320, 500, 3, it.regions[1]),
+            Fixation(Point(-1, 0), 520, 600, 4, None),
+        ]
+        it.sequence = FixationSequence(it.regions)
+        for fixation in it.fixations:
+            it.sequence.add(
+                fixation.char,
+                fixation.line,
+                fixation.start,
+                fixation.end,
+                fixation.region,
+                fixation.excluded,
+            )
+
+    @it.should("return fixations equal to the fixations it was filled with")
+    def test_views():
+        it.assertEqual(len(it.sequence), len(it.fixations))
+        it.assertEqual(it.sequence, it.fixations)
+        it.assertEqual(list(it.sequence), it.fixations)
+        it.assertEqual(it.sequence[-1], it.fixations[-1])
+        it.assertEqual(it.sequence[1:3], it.fixations[1:3])
+        it.assertIsInstance(it.sequence[0], Fixation)
+        it.assertIs(it.sequence[1].region, it.regions[2])
+        it.assertIsNone(it.sequence[4].region)
+        it.assertTrue(it.sequence[4].excluded)
+        it.assertEqual(it.sequence[3].duration(), 180)
+        with it.assertRaises(IndexError):
+            it.sequence[5]
+
+    @it.should("store region numbers of the item's regions")
+    def test_region_index():
+        it.assertEqual(list(it.sequence.region_index), [0, 2, 1, 1, -1])
+        other = Region(Point(20, 0), Point(25, 0))
+        it.sequence[0].assign_region(other)
+        it.assertIs(it.sequence[0].region, other)
+        it.assertEqual(it.sequence.region_index[0], 3)
+        it.assertEqual(len(it.regions), 3)
+
+    @it.should("write attributes of fixations to its arrays")
+    def test_write():
+        it.sequence[2].excluded = False
+        it.assertFalse(it.sequence[2].excluded)
+        it.sequence[0] = it.fixations[1]
+        it.assertEqual(it.sequence[0].start, 120)
+        it.assertEqual(it.sequence[0].index, 0)
+        with it.assertRaises(AttributeError):
+            it.sequence[0].index = 1
+
+    @it.should("change its version on every write")
+    def test_version():
+        versions = [it.sequence.version]
+        it.sequence[2].excluded = False
+        versions += [it.sequence.version]
+        it.sequence[0].assign_region(it.regions[1])
+        versions += [it.sequence.version]
+        it.sequence[1] = it.fixations[3]
+        versions += [it.sequence.version]
+        it.sequence.append(it.fixations[0])
+        versions += [it.sequence.version]
+        versions += [pickle.loads(pickle.dumps(it.sequence)).version]
+        versions += [FixationSequence(it.regions, it.fixations).version]
+        it.assertEqual(len(set(versions)), len(versions))
+
+    @it.should("only allow valid fixations")
+    def test_validation():
+        with it.assertRaises(ValueError):
+            it.sequence.add(1, 0, 10, 5, it.regions[0])
+
+    @it.should("calculate the same saccades as a list of fixations")
+    def test_trial():
+        trial = Trial(1, 600, it.item, it.sequence)
+        expected = Trial(1, 600, it.item, it.fixations)
+        it.assertIs(trial.fixations, it.sequence)
+        it.assertEqual(trial.saccades, expected.saccades)
+        it.assertEqual(trial, expected)
+        it.assertEqual(
+            [fixation.index for fixation in trial.fixations], list(range(5))
+        )
+
+    @it.should("be pickled with its arrays, and pickle views as fixations")
+    def test_pickle():
+        sequence = pickle.loads(pickle.dumps(it.sequence))
+        it.assertIsInstance(sequence, FixationSequence)
+        it.assertEqual(sequence, it.fixations)
+        fixation = pickle.loads(pickle.dumps(it.sequence[1]))
+        it.assertNotIsInstance(fixation, FixationView)
+        it.assertEqual(fixation, it.fixations[1])
+
+    @it.should("assign the region of every fixation from its item")
+    def test_assign_regions():
+        sequence = FixationSequence()
+        for fixation in it.fixations:
+            sequence.add(
+                fixation.char, fixation.line, fixation.start, fixation.end, None
+            )
+        sequence.assign_regions(it.item)
+        it.assertEqual(sequence.regions, it.regions)
+        it.assertEqual(list(sequence.region_index), [0, 2, 1, 1, 0])
+        it.assertEqual(
+            [fixation.region for fixation in sequence],
+            [
+                it.item.find_region(fixation.char, fixation.line)
+                for fixation in sequence
+            ],
+        )
+
+
+it.createTests(globals())
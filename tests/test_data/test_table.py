@@ -0,0 +1,88 @@
+import os
+import pickle
+from nose2.tools import such
+from sideeye import Point, Fixation, Region, Item, ItemTable, Trial, Experiment, parser
+
+with such.A("ItemTable") as it:
+
+    def regions():
+        return [Region(Point(0, 0), Point(4, 0)), Region(Point(4, 0), Point(9, 0))]
+
+    def size(value):
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+    @it.has_test_setup
+    def setup():
+        it.item = Item("1", "1", regions())
+        it.equal_item = Item("1", "1", regions())
+        it.other_item = Item("1", "2", [Region(Point(0, 0), Point(9, 0))])
+        it.table = ItemTable([it.item, it.other_item])
+
+    @it.should("intern equal items")
+    def test_add():
+        it.assertEqual(len(it.table), 2)
+        it.assertEqual(it.table.add(it.item), 0)
+        it.assertEqual(it.table.add(it.equal_item), 0)
+        it.assertIs(it.table.intern(it.equal_item), it.item)
+        it.assertEqual(it.table.add(it.other_item), 1)
+        it.assertEqual(len(it.table), 2)
+        changed = Item("1", "1", [Region(Point(0, 0), Point(9, 0))])
+        it.assertEqual(it.table.add(changed), 2)
+        it.assertEqual(it.table.as_dict(), {"1": {"1": it.item, "2": it.other_item}})
+
+    @it.should("find regions by item id and region number")
+    def test_region():
+        it.assertIs(it.table.region(0, 1), it.item.regions[1])
+        it.assertIs(it.table.region(1, 0), it.other_item.regions[0])
+        with it.assertRaises(IndexError):
+            it.table.region(2, 0)
+
+    @it.should("pickle items and regions as references")
+    def test_dumps():
+        trial = Trial(
+            0,
+            100,
+            it.equal_item,
+            [
+                Fixation(Point(1, 0), 0, 10, 0, it.equal_item.regions[0]),
+                Fixation(Point(5, 0), 20, 30, 1, it.equal_item.regions[1]),
+            ],
+        )
+        experiment = Experiment("table", [trial], "table.da1")
+        it.assertEqual(len(it.table.dumps(experiment)), size(experiment))
+        it.table.add(it.equal_item)
+        data = it.table.dumps(experiment)
+        it.assertLess(len(data), size(experiment))
+        loaded = ItemTable([it.item, it.other_item]).loads(data)
+        it.assertEqual(loaded, experiment)
+
+        unpickled = pickle.loads(pickle.dumps(it.table))
+        loaded = unpickled.loads(data)
+        loaded_trial = loaded.trials[("1", "1")]
+        it.assertIs(loaded_trial.item, unpickled[0])
+        it.assertIs(loaded_trial.fixations[1].region, unpickled.region(0, 1))
+        it.assertIs(loaded_trial.saccades[0].end.region, unpickled.region(0, 1))
+
+    @it.should("not unpickle references missing from the table")
+    def test_missing_reference():
+        data = it.table.dumps(it.other_item)
+        with it.assertRaises(pickle.UnpicklingError):
+            ItemTable([it.item]).loads(data)
+
+    @it.should("shrink parsed experiments")
+    def test_parsed_experiment():
+        dirname = os.path.dirname(os.path.realpath(__file__))
+        items = parser.region.file(os.path.join(dirname, "../testdata/timdropDA1.cnt"))
+        experiment = parser.da1.parse(
+            os.path.join(dirname, "../testdata/timdrop.DA1"), items
+        )
+        table = ItemTable.from_dict(items)
+        data = table.dumps(experiment)
+        it.assertLess(len(data), size(experiment))
+        loaded = table.loads(data)
+        it.assertEqual(loaded, experiment)
+        for (key, trial) in loaded.trials.items():
+            it.assertIs(trial.item, items[key[0]][key[1]])
+
+
+it.createTests(globals())
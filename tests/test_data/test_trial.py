@@ -1,3 +1,4 @@
+import pickle
 from nose2.tools import such
 from sideeye import Point, Fixation, Saccade, Region, Item, Trial
 
@@ -84,6 +85,32 @@ with such.A("Trial") as it:
         ]
         it.assertEqual(it.trial_include_both.saccades, saccades)
 
+    @it.should("find saccades when they are first used")
+    def test_lazy_saccades():
+        trial = Trial(1, 5, it.item, it.fixations, include_fixation=True)
+        it.assertIsNone(trial.saccade_cache)
+        saccades = trial.saccades
+        it.assertIs(trial.saccades, saccades)
+        it.assertEqual(saccades, it.trial_include_fixations.saccades)
+        it.assertEqual(trial, Trial(1, 5, it.item, it.fixations, include_fixation=True))
+        it.assertNotEqual(trial, Trial(1, 5, it.item, it.fixations))
+        trial.saccades = []
+        it.assertEqual(trial.saccades, [])
+
+    @it.should("find saccades again when the fixations or settings change")
+    def test_saccade_cache():
+        trial = Trial(1, 5, it.item, it.fixations)
+        it.assertEqual(trial.saccades, it.trial.saccades)
+        for fixation in trial.fixations:
+            fixation.excluded = False
+        it.assertEqual(len(trial.saccades), len(it.fixations) - 1)
+        trial.fixations = it.fixations
+        trial.include_fixation = True
+        it.assertEqual(trial.saccades, it.trial_include_fixations.saccades)
+        copy = pickle.loads(pickle.dumps(trial))
+        it.assertIsNone(copy.saccade_cache)
+        it.assertEqual(copy, trial)
+
     @it.should("not allow trials with index < 0")
     def test_trial_index():
         with it.assertRaises(ValueError):
@@ -1,12 +1,43 @@
+import csv
+import io
 import os
+import tempfile
+from unittest import mock
 from nose2.tools import such
-from sideeye import calculate_all_measures, parser
+from sideeye import (
+    calculate_all_measures,
+    generate_trial_output,
+    iter_all_measures,
+    write_all_measures,
+    config,
+    parser,
+    measures,
+    Point,
+    Fixation,
+    Region,
+    Item,
+    Trial,
+    Experiment,
+)
+from sideeye.calculate import load_saved_measures
+from sideeye.output import (
+    OutputPlan,
+    csv_row,
+    measure_output,
+    output_header,
+    write_column,
+    trial_all_rows,
+    trial_wide_rows,
+    wide_format_columns,
+)
 
 with such.A("Output Generator") as it:
 
     @it.has_setup
     def setup():
         dirname = os.path.dirname(os.path.realpath(__file__))
+        it.da1_file = os.path.join(dirname, "testdata/timdrop.DA1")
+        it.region_file = os.path.join(dirname, "testdata/timdropDA1.cnt")
         it.experiment = parser.experiment.parse(
             os.path.join(dirname, "testdata/timdrop.DA1"),
             os.path.join(dirname, "testdata/timdropDA1.cnt"),
@@ -26,5 +57,311 @@ reread_time,second_pass,spillover_time,refixation_time,landing_position,\
 launch_site,first_pass_fixation_count,go_back_time_region,go_back_time_char""",
         )
 
+    @it.should("generate the same output when calculating in parallel")
+    def test_parallel_output():
+        for wide_format in [True, False]:
+            configuration = config.Configuration()
+            configuration.wide_format = wide_format
+            serial = parser.experiment.parse_files(
+                [it.da1_file, it.da1_file], it.region_file, configuration
+            )
+            parallel = parser.experiment.parse_files(
+                [it.da1_file, it.da1_file], it.region_file, configuration
+            )
+            it.assertEqual(
+                calculate_all_measures(parallel, None, configuration, workers=2),
+                calculate_all_measures(serial, None, configuration),
+            )
+            it.assertEqual(
+                [experiment.trials for experiment in parallel],
+                [experiment.trials for experiment in serial],
+            )
+
+    @it.should("generate output from a stream of trials")
+    def test_stream_output():
+        for wide_format in [True, False]:
+            configuration = config.Configuration()
+            configuration.wide_format = wide_format
+            experiment = parser.experiment.parse(
+                it.da1_file, it.region_file, configuration
+            )
+            rows = iter_all_measures(
+                parser.experiment.iter_trials(
+                    [it.da1_file], it.region_file, configuration
+                ),
+                configuration,
+            )
+            it.assertEqual(
+                next(rows),
+                calculate_all_measures([experiment], None, configuration).split(
+                    "\n"
+                )[0]
+                + "\n",
+            )
+            it.assertEqual(
+                next(rows) + "".join(rows),
+                calculate_all_measures([experiment], None, configuration).split(
+                    "\n", 1
+                )[1],
+            )
+
+    @it.should("write the same output to a file as it returns")
+    def test_file_output():
+        for wide_format in [True, False]:
+            configuration = config.Configuration()
+            configuration.wide_format = wide_format
+            experiment = parser.experiment.parse(
+                it.da1_file, it.region_file, configuration
+            )
+            expected = calculate_all_measures([experiment], None, configuration)
+            with tempfile.TemporaryDirectory() as directory:
+                output_file = os.path.join(directory, "output.csv")
+                it.assertEqual(
+                    calculate_all_measures([experiment], output_file, configuration),
+                    expected,
+                )
+                with open(output_file) as output:
+                    it.assertEqual(output.read(), expected)
+                it.assertIsNone(
+                    write_all_measures([experiment], output_file, configuration)
+                )
+                with open(output_file) as output:
+                    it.assertEqual(output.read(), expected)
+
+    @it.should("write the same rows with a compiled output plan")
+    def test_output_plan():
+        configuration = config.Configuration()
+        columns = {
+            column: {"header": column}
+            for column in [
+                "experiment_name",
+                "filename",
+                "date",
+                "trial_id",
+                "trial_total_time",
+                "item_id",
+                "item_condition",
+                "region_label",
+                "region_number",
+                "region_text",
+                "region_start",
+                "region_end",
+                "measure",
+                "value",
+            ]
+        }
+        configuration.output = config.OutputConfig(columns, columns)
+        configuration.measures = config.MeasuresConfig(
+            {"total_time": {"cutoff": 300}, "skip": {}, "landing_position": {}},
+            {"fixation_count": {"cutoff": 5}, "trial_total_time": {}},
+        )
+        calculate_all_measures([it.experiment], None, configuration)
+        long_columns = configuration.output.columns
+        wide_columns = wide_format_columns(configuration)
+        for trial in it.experiment.trials.values():
+            expected = [
+                measure_output(
+                    measure, value.cutoff, long_columns, it.experiment, trial, None
+                )
+                for (measure, value) in configuration.measures.trial.items()
+            ] + [
+                measure_output(
+                    measure, value.cutoff, long_columns, it.experiment, trial, region
+                )
+                for region in trial.item.regions
+                for (measure, value) in configuration.measures.region.items()
+            ]
+            it.assertEqual(
+                list(trial_all_rows(it.experiment, trial, configuration)), expected
+            )
+            expected = [
+                csv_row(
+                    [
+                        write_column(
+                            column, it.experiment, trial, region, column, value.cutoff
+                        )
+                        for (column, value) in wide_columns.items()
+                    ]
+                )
+                for region in trial.item.regions
+            ]
+            it.assertEqual(
+                list(
+                    trial_wide_rows(
+                        it.experiment, trial, configuration, OutputPlan(wide_columns)
+                    )
+                ),
+                expected,
+            )
+
+    @it.should("quote cells that contain commas, quotes or line breaks")
+    def test_csv_quoting():
+        item = Item(
+            1,
+            1,
+            [
+                Region(Point(0, 0), Point(5, 0), text='say "hi", then'),
+                Region(Point(5, 0), Point(9, 0), text="two\nlines"),
+            ],
+        )
+        trial = Trial(
+            0,
+            100,
+            item,
+            [
+                Fixation(Point(1, 0), 0, 100, 0, item.regions[0]),
+                Fixation(Point(6, 0), 120, 220, 1, item.regions[1]),
+            ],
+        )
+        experiment = Experiment("quotes", [trial], "quotes.da1")
+        for wide_format in [True, False]:
+            configuration = config.Configuration()
+            configuration.wide_format = wide_format
+            columns = {
+                column: {"header": column}
+                for column in ["region_text", "region_start", "measure", "value"]
+            }
+            configuration.output = config.OutputConfig(columns, columns)
+            configuration.measures = config.MeasuresConfig(
+                {"landing_position": {}, "total_time": {}}, {}
+            )
+            rows = list(
+                csv.DictReader(
+                    io.StringIO(
+                        calculate_all_measures([experiment], None, configuration)
+                    )
+                )
+            )
+            it.assertEqual(
+                [row["region_text"] for row in rows][:: 1 if wide_format else 2],
+                ['say "hi", then', "two\\nlines"],
+            )
+            it.assertEqual(rows[0]["region_start"], "(0, 0)")
+            it.assertEqual(
+                rows[0]["landing_position" if wide_format else "value"], "(1, 0)"
+            )
+        for cells in [["a", "1"], [""], ["", ""], ['a"b', "c,d"], ["e\rf", "g"]]:
+            expected = io.StringIO()
+            csv.writer(expected, lineterminator="\n").writerow(cells)
+            it.assertEqual(csv_row(cells), expected.getvalue())
+
+    @it.should("only calculate measures that were not saved before")
+    def test_saved_measures():
+        with tempfile.TemporaryDirectory() as directory:
+            configuration = config.Configuration()
+            configuration.wide_format = False
+            names = configuration.measures.names
+            expected = calculate_all_measures(
+                [parser.experiment.parse(it.da1_file, it.region_file)],
+                None,
+                configuration,
+            )
+            configuration.cache_dir = directory
+            configuration.measures.names = names[:5]
+            calculate_all_measures(
+                [parser.experiment.parse(it.da1_file, it.region_file, configuration)],
+                None,
+                configuration,
+            )
+            configuration.measures.names = names
+            experiment = parser.experiment.parse(
+                it.da1_file, it.region_file, configuration
+            )
+            it.assertEqual(
+                load_saved_measures(experiment, names, configuration), names[5:]
+            )
+            with mock.patch.dict(measures.VERSIONS, {names[0]: "changed"}):
+                it.assertEqual(
+                    load_saved_measures(experiment, names, configuration),
+                    [names[0]] + names[5:],
+                )
+            it.assertEqual(
+                calculate_all_measures(
+                    [
+                        parser.experiment.parse(
+                            it.da1_file, it.region_file, configuration
+                        )
+                    ],
+                    None,
+                    configuration,
+                ),
+                expected,
+            )
+            it.assertEqual(
+                load_saved_measures(
+                    parser.experiment.parse(it.da1_file, it.region_file, configuration),
+                    names,
+                    configuration,
+                ),
+                [],
+            )
+            it.assertEqual(
+                load_saved_measures(
+                    parser.experiment.parse(it.da1_file, it.region_file),
+                    names,
+                    configuration,
+                ),
+                names,
+            )
+
+    @it.should("have a version for every measure")
+    def test_measure_versions():
+        it.assertTrue(
+            set(config.Configuration().measures.names) <= set(measures.VERSIONS)
+        )
+
+    @it.should("not load measures saved with other saccade settings")
+    def test_saved_measures_cutoffs():
+        def trial_output(configuration):
+            experiment = parser.experiment.parse(
+                it.da1_file, it.region_file, configuration
+            )
+            calculate_all_measures([experiment], None, configuration)
+            return generate_trial_output([experiment], configuration)
+
+        with tempfile.TemporaryDirectory() as directory:
+            configuration = config.Configuration()
+            columns = {
+                column: {"header": column}
+                for column in ["trial_id", "region_number", "measure", "value"]
+            }
+            configuration.output = config.OutputConfig(columns, columns)
+            configuration.cutoffs.min = 250
+            excluded = trial_output(configuration)
+            configuration.cutoffs.include_fixation = True
+            configuration.cutoffs.include_saccades = True
+            included = trial_output(configuration)
+            it.assertNotEqual(included, excluded)
+
+            configuration.cache_dir = directory
+            configuration.cutoffs.include_fixation = False
+            configuration.cutoffs.include_saccades = False
+            it.assertEqual(trial_output(configuration), excluded)
+            configuration.cutoffs.include_fixation = True
+            configuration.cutoffs.include_saccades = True
+            it.assertEqual(trial_output(configuration), included)
+
+    @it.should("generate a row for each trial measure in trial output")
+    def test_trial_output():
+        configuration = config.Configuration()
+        calculate_all_measures([it.experiment], None, configuration)
+        columns = configuration.output.trial
+        output = generate_trial_output([it.experiment], configuration)
+        it.assertEqual(
+            output,
+            output_header(columns)
+            + "".join(
+                measure_output(
+                    measure, value.cutoff, columns, it.experiment, trial, None
+                )
+                for trial in it.experiment.trials.values()
+                for (measure, value) in configuration.measures.trial.items()
+            ),
+        )
+        it.assertEqual(
+            len(output.split("\n")) - 2,
+            len(it.experiment.trials) * len(configuration.measures.trial),
+        )
+
 
 it.createTests(globals())
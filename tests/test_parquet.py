@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+from nose2.tools import such
+from sideeye import calculate_all_measures, write_all_measures, config, parser, parquet
+
+with such.A("Parquet Output") as it:
+
+    @it.has_setup
+    def setup():
+        dirname = os.path.dirname(os.path.realpath(__file__))
+        it.da1_file = os.path.join(dirname, "testdata/timdrop.DA1")
+        it.region_file = os.path.join(dirname, "testdata/timdropDA1.cnt")
+
+    @it.should("not accept an unknown output format")
+    def test_output_format():
+        with it.assertRaises(ValueError):
+            config.OutputConfig({}, {}, "xlsx")
+
+    @it.should("read the output format from the output section")
+    def test_output_section():
+        with tempfile.TemporaryDirectory() as directory:
+            config_file = os.path.join(directory, "config.json")
+            with open(config_file, "w") as cfg:
+                json.dump({"output": {"format": "parquet"}}, cfg)
+            it.assertEqual(config.Configuration(config_file).output.format, "parquet")
+        it.assertEqual(config.Configuration().output.format, "csv")
+
+    @it.should("write one row group per experiment in wide format")
+    def test_wide_parquet(case):
+        if parquet.pyarrow is None:
+            case.skipTest("pyarrow is not installed")
+        configuration = config.Configuration()
+        configuration.output.format = "parquet"
+        experiments = [
+            parser.experiment.parse(it.da1_file, it.region_file) for _ in range(2)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "output.parquet")
+            it.assertIsNone(write_all_measures(experiments, filename, configuration))
+            parquet_file = parquet.pyarrow.parquet.ParquetFile(filename)
+            it.assertEqual(parquet_file.metadata.num_row_groups, 2)
+            table = parquet_file.read()
+        it.assertEqual(table.schema, parquet.schema(configuration))
+        it.assertEqual(
+            table.num_rows,
+            2
+            * sum(len(trial.item.regions) for trial in experiments[0].trials.values()),
+        )
+        it.assertEqual(table.schema.field("skip").type, parquet.pyarrow.bool_())
+        it.assertEqual(table.schema.field("total_time").type, parquet.pyarrow.int64())
+
+        it.assertEqual(
+            table.column("total_time").to_pylist(),
+            [
+                trial.region_measures[region.number]["total_time"]["value"]
+                for experiment in experiments
+                for trial in experiment.trials.values()
+                for region in trial.item.regions
+            ],
+        )
+
+    @it.should("return a table of all measures in long format")
+    def test_long_table(case):
+        if parquet.pyarrow is None:
+            case.skipTest("pyarrow is not installed")
+        configuration = config.Configuration()
+        configuration.wide_format = False
+        configuration.output.format = "parquet"
+        table = calculate_all_measures(
+            [parser.experiment.parse(it.da1_file, it.region_file)],
+            None,
+            configuration,
+        )
+        configuration.output.format = "csv"
+        output = calculate_all_measures(
+            [parser.experiment.parse(it.da1_file, it.region_file)],
+            None,
+            configuration,
+        )
+        it.assertEqual(table.num_rows, len(output.split("\n")) - 2)
+        it.assertEqual(table.schema.names[-3:], ["measure", "value", "value_text"])
+        rows = table.to_pylist()
+        landing = [row for row in rows if row["measure"] == "landing_position"]
+        it.assertTrue(landing)
+        it.assertTrue(all(row["value"] is None for row in landing))
+        it.assertTrue(
+            all(row["value_text"] is None for row in rows if row["value"] is not None)
+        )
+
+
+it.createTests(globals())
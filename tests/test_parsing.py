@@ -1,6 +1,10 @@
 import os
+import shutil
+import tempfile
 from nose2.tools import such
 from sideeye import config, parser, Point, Fixation, Trial, Region, Item
+from sideeye.output import generate_all_output
+from sideeye.calculate import calculate_measures
 
 with such.A("Parser") as it:
     with it.having("DA1 parser"):
@@ -217,6 +221,106 @@ with such.A("Parser") as it:
             )
             it.assertEqual(it.robodoc_DA1.trials[("58", "12")], it.trial7)
 
+        @it.should("yield the trials of a DA1 file one at a time")
+        def test_da1_iter_trials():
+            trials = parser.da1.iter_trials(
+                os.path.join(it.dirname, "testdata/robodoc.DA1"),
+                it.robodoc_items,
+                it.config,
+            )
+            it.assertEqual(next(trials), list(it.robodoc_DA1.trials.values())[0])
+            it.assertEqual(
+                list(trials), list(it.robodoc_DA1.trials.values())[1:],
+            )
+
+        @it.should("parse DA1 files the same way with and without NumPy")
+        def test_da1_without_numpy():
+            timdrop_config = config.Configuration()
+            timdrop_config.cutoffs.min = 100
+            timdrop_config.cutoffs.max = 300
+
+            def parse_files():
+                return [
+                    parser.da1.parse(
+                        os.path.join(it.dirname, "testdata/timdrop.DA1"),
+                        it.timdrop_items,
+                        timdrop_config,
+                    ).trials,
+                    parser.da1.parse(
+                        os.path.join(it.dirname, "testdata/robodoc.DA1"),
+                        it.robodoc_items,
+                        it.config,
+                    ).trials,
+                ]
+
+            numpy = parser.da1.numpy
+            try:
+                parser.da1.numpy = None
+                line_by_line = parse_files()
+            finally:
+                parser.da1.numpy = numpy
+            bulk = parse_files()
+            it.assertEqual(bulk, line_by_line)
+            it.assertTrue(
+                any(
+                    fixation.excluded
+                    for trial in bulk[0].values()
+                    for fixation in trial.fixations
+                    if fixation.char >= 0
+                )
+            )
+
+        @it.should("parse DA1 files with Windows line endings and blank lines")
+        def test_da1_line_endings():
+            directory = tempfile.mkdtemp()
+            filename = os.path.join(directory, "robodoc.DA1")
+            with open(os.path.join(it.dirname, "testdata/robodoc.DA1")) as da1_file:
+                lines = da1_file.read().splitlines()
+            with open(filename, "wb") as da1_file:
+                da1_file.write("\r\n\r\n".join(lines).encode())
+            try:
+                it.assertEqual(
+                    parser.da1.parse(filename, it.robodoc_items, it.config).trials,
+                    it.robodoc_DA1.trials,
+                )
+                with open(filename, "ab") as da1_file:
+                    da1_file.write(b"\r\n" + lines[0].encode() + b" 1.5")
+                with it.assertRaises(ValueError):
+                    parser.da1.parse(filename, it.robodoc_items, it.config)
+            finally:
+                shutil.rmtree(directory)
+
+        @it.should("skip malformed lines of items that are not in the experiment")
+        def test_da1_missing_item():
+            directory = tempfile.mkdtemp()
+            filename = os.path.join(directory, "robodoc.DA1")
+            with open(os.path.join(it.dirname, "testdata/robodoc.DA1")) as da1_file:
+                lines = da1_file.read().splitlines()
+            (number, condition) = list(it.robodoc_DA1.trials)[1]
+            items = {
+                item_number: dict(conditions)
+                for (item_number, conditions) in it.robodoc_items.items()
+            }
+            items[number][condition] = None
+            expected = dict(it.robodoc_DA1.trials)
+            del expected[(number, condition)]
+            numpy = parser.da1.numpy
+            try:
+                for malformed in [" 5 0 100 50", " 5"]:
+                    with open(filename, "w") as da1_file:
+                        da1_file.write(
+                            "\n".join([lines[0], lines[1] + malformed] + lines[2:])
+                        )
+                    for module in [numpy, None]:
+                        parser.da1.numpy = module
+                        it.assertEqual(
+                            parser.da1.parse(filename, items, it.config).trials,
+                            expected,
+                        )
+            finally:
+                parser.da1.numpy = numpy
+                shutil.rmtree(directory)
+
         @it.should("throw an error when given a non-DA1 file input")
         def test_non_da1():
             with it.assertRaises(ValueError):
@@ -231,6 +335,36 @@ with such.A("Parser") as it:
                     da1_type="robodoc",
                 )
 
+    with it.having("experiment parser"):
+
+        @it.has_setup
+        def setup_experiment():
+            it.dirname = os.path.dirname(os.path.realpath(__file__))
+            it.files = [
+                os.path.join(it.dirname, "testdata/timdrop.DA1"),
+                os.path.join(it.dirname, "testdata/test.asc"),
+                os.path.join(it.dirname, "testdata/timdropDA1.cnt"),
+                os.path.join(it.dirname, "testdata/timdrop.DA1"),
+            ]
+            it.region_file = os.path.join(it.dirname, "testdata/timdropDA1.cnt")
+
+        @it.should("parse files in parallel in input order")
+        def test_parse_files_workers():
+            sequential = parser.experiment.parse_files(it.files, it.region_file)
+            parallel = parser.experiment.parse_files(
+                it.files, it.region_file, workers=2
+            )
+            it.assertEqual(
+                [experiment.filename for experiment in parallel],
+                [it.files[0], it.files[1], it.files[3]],
+            )
+            it.assertEqual(
+                [experiment.trials for experiment in parallel],
+                [experiment.trials for experiment in sequential],
+            )
+            for (key, trial) in parallel[0].trials.items():
+                it.assertIs(trial.item, parallel[2].trials[key].item)
+
     with it.having("region parser"):
 
         @it.has_setup
@@ -289,5 +423,84 @@ with such.A("Parser") as it:
                     os.path.join(it.dirname, "testdata/robodoc.DA1"), it.config
                 )
 
+    with it.having("parse cache"):
+
+        @it.has_setup
+        def setup_cache():
+            it.dirname = os.path.dirname(os.path.realpath(__file__))
+            it.directory = tempfile.mkdtemp()
+            it.da1_file = os.path.join(it.directory, "timdrop.DA1")
+            it.region_file = os.path.join(it.directory, "timdropDA1.cnt")
+            shutil.copy(os.path.join(it.dirname, "testdata/timdrop.DA1"), it.da1_file)
+            shutil.copy(
+                os.path.join(it.dirname, "testdata/timdropDA1.cnt"), it.region_file
+            )
+            it.config = config.Configuration()
+            it.config.cache_dir = os.path.join(it.directory, "cache")
+
+        @it.has_teardown
+        def teardown_cache():
+            shutil.rmtree(it.directory)
+
+        def output(experiments):
+            for experiment in experiments:
+                experiment.date = None
+            calculate_measures(experiments, it.config.measures.names)
+            return generate_all_output(experiments, it.config)
+
+        def entries():
+            return sorted(os.listdir(it.config.cache_dir))
+
+        @it.should("return the same experiments from the cache")
+        def test_cache_hit():
+            uncached = parser.experiment.parse_files(
+                [it.da1_file], it.region_file, config.Configuration()
+            )
+            parsed = parser.experiment.parse_files(
+                [it.da1_file], it.region_file, it.config
+            )
+            it.assertEqual(len(entries()), 2)
+            cached = parser.experiment.parse_files(
+                [it.da1_file], it.region_file, it.config
+            )
+            it.assertEqual(len(entries()), 2)
+            it.assertEqual(output(cached), output(uncached))
+            it.assertEqual(output(parsed), output(uncached))
+            it.assertEqual(
+                parser.experiment.parse_items(it.region_file, it.config),
+                parser.experiment.parse_items(it.region_file, config.Configuration()),
+            )
+
+        @it.should("not return cached experiments after a file or config changes")
+        def test_cache_invalidation():
+            parser.experiment.parse(it.da1_file, it.region_file, it.config)
+            before = entries()
+            stat = os.stat(it.da1_file)
+            os.utime(it.da1_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            parser.experiment.parse(it.da1_file, it.region_file, it.config)
+            it.assertEqual(len(set(entries()) - set(before)), 1)
+            before = entries()
+            it.config.cutoffs.max = 400
+            parser.experiment.parse(it.da1_file, it.region_file, it.config)
+            it.assertEqual(len(set(entries()) - set(before)), 2)
+            it.config.cutoffs.max = -1
+
+        @it.should("remove the least recently used entries")
+        def test_cache_eviction():
+            parser.experiment.parse(it.da1_file, it.region_file, it.config)
+            sizes = {
+                name: os.path.getsize(os.path.join(it.config.cache_dir, name))
+                for name in entries()
+            }
+            for (age, name) in enumerate(entries()):
+                os.utime(os.path.join(it.config.cache_dir, name), (age, age))
+            newest = entries()[-1]
+            parser.cache.evict(it.config.cache_dir, sizes[newest])
+            it.assertEqual(entries(), [newest])
+            it.config.cache_size = 0
+            parser.experiment.parse(it.da1_file, it.region_file, it.config)
+            it.assertEqual(entries(), [])
+            it.config.cache_size = 256
+
 
 it.createTests(globals())
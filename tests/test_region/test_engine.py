@@ -0,0 +1,134 @@
+import os
+import random
+from nose2.tools import such
+from sideeye import parser
+from sideeye.data import Point, Fixation, Region, Item, Trial
+from sideeye.measures import region, trial as trial_measures
+from sideeye.measures.engine import (
+    MEASURE_INTERMEDIATES,
+    TrialTables,
+    can_fuse,
+    calculate_region_measures,
+    calculate_trial_measures,
+    plan_intermediates,
+)
+from tests.random_trials import random_trial
+
+with such.A("Fused region measure engine") as it:
+
+    @it.has_setup
+    def setup():
+        dirname = os.path.dirname(os.path.realpath(__file__))
+        it.trials = list(
+            parser.experiment.parse(
+                os.path.join(dirname, "../testdata/timdrop.DA1"),
+                os.path.join(dirname, "../testdata/timdropDA1.cnt"),
+            ).trials.values()
+        )
+        rng = random.Random(0)
+        it.trials += [random_trial(rng, lines=2, include=True) for _ in range(2000)]
+
+    def assert_same_measure(trial, tables, measure, region_number):
+        expected = getattr(region, measure)(trial, region_number)
+        value, fixations = getattr(tables, measure)(region_number)
+        it.assertEqual(
+            (type(value), value), (type(expected["value"]), expected["value"])
+        )
+        if expected["fixations"] is None:
+            it.assertIsNone(fixations)
+        else:
+            it.assertEqual(
+                [fixation.index for fixation in fixations],
+                [fixation.index for fixation in expected["fixations"]],
+            )
+            it.assertEqual(fixations, expected["fixations"])
+
+    @it.should("calculate the same region measures as the measure functions")
+    def test_same_measures():
+        for trial in it.trials:
+            it.assertTrue(can_fuse(trial))
+            tables = TrialTables(trial)
+            for measure in region.__all__:
+                for region_number in range(len(trial.item.regions)):
+                    assert_same_measure(trial, tables, measure, region_number)
+
+    @it.should("calculate the same trial measures as the measure functions")
+    def test_same_trial_measures():
+        measures = [
+            measure
+            for measure in MEASURE_INTERMEDIATES
+            if measure not in region.__all__
+        ]
+        for trial in it.trials:
+            if trial.time is None and not any(
+                not fixation.excluded for fixation in trial.fixations
+            ):
+                continue
+            tables = TrialTables(trial, measures)
+            for measure in measures:
+                expected = getattr(trial_measures, measure)(trial)
+                value = getattr(tables, measure)()
+                it.assertEqual((type(value), value), (type(expected), expected))
+
+    @it.should("plan only the intermediates of the requested measures")
+    def test_plan():
+        it.assertTrue(set(region.__all__) <= set(MEASURE_INTERMEDIATES))
+        it.assertEqual(plan_intermediates(["skip", "first_pass"]), ["first_pass"])
+        it.assertEqual(
+            plan_intermediates(["go_past", "fixation_count"]),
+            [
+                "included",
+                "region_fixations",
+                "first_pass",
+                "first_pass_start",
+                "next_greater",
+            ],
+        )
+        it.assertEqual(plan_intermediates([]), [])
+        with it.assertRaises(ValueError):
+            plan_intermediates(["reading_speed"])
+        tables = TrialTables(it.trials[0], ["total_time"])
+        it.assertEqual(tables.intermediates, ["included", "region_fixations"])
+        it.assertFalse(hasattr(tables, "previous"))
+
+    @it.should("calculate trial and region measures together")
+    def test_calculate_trial_measures():
+        trial = random_trial(random.Random(2), lines=2, include=True)
+        calculate_trial_measures(trial, ["percent_regressions", "skip"])
+        it.assertEqual(set(trial.trial_measures), {"percent_regressions"})
+        for region_number in range(len(trial.item.regions)):
+            it.assertEqual(set(trial.region_measures[region_number]), {"skip"})
+
+    @it.should("save measures for every region of a trial")
+    def test_save_measures():
+        trial = random_trial(random.Random(1), lines=2, include=True)
+        calculate_region_measures(trial, ["total_time", "skip"])
+        for region_number in range(len(trial.item.regions)):
+            it.assertEqual(
+                set(trial.region_measures[region_number]), {"total_time", "skip"}
+            )
+
+    @it.should("fall back to the measure functions for unnumbered regions")
+    def test_unfusable():
+        regions = [
+            Region(Point(0, 0), Point(10, 0)),
+            Region(Point(10, 0), Point(20, 0)),
+        ]
+        item = Item(1, 1, regions)
+        fixations = [
+            Fixation(Point(1, 0), 0, 100, 0, regions[0]),
+            Fixation(Point(30, 0), 100, 200, 1, Region(Point(20, 0), Point(40, 0))),
+        ]
+        trial = Trial(1, 200, item, fixations)
+        it.assertFalse(can_fuse(trial))
+        calculate_region_measures(trial, ["first_pass"])
+        it.assertEqual(trial.region_measures[0]["first_pass"]["value"], 100)
+        it.assertEqual(trial.region_measures[1]["first_pass"]["value"], None)
+
+    @it.should("raise an error if a region measure does not exist")
+    def test_missing_measure():
+        with it.assertRaises(ValueError):
+            calculate_region_measures(it.trials[0], ["trial_total_time"])
+
+
+it.createTests(globals())
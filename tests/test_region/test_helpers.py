@@ -1,6 +1,12 @@
 from nose2.tools import such
-from sideeye.measures.helpers import get_fp_fixations
-from sideeye.data import Point, Fixation, Region, Item, Trial
+from sideeye.measures.helpers import (
+    get_fp_fixations,
+    get_fp_table,
+    fp_cache_info,
+    reset_fp_cache_info,
+    clear_fp_cache,
+)
+from sideeye.data import Point, Fixation, FixationSequence, Region, Item, Trial
 
 with such.A("Region Measure Helpers") as it:
 
@@ -85,5 +91,74 @@ with such.A("Region Measure Helpers") as it:
             it.assertEqual(get_fp_fixations(it.trial_y, 0), [])
             it.assertEqual(get_fp_fixations(it.trial_y, 2), [])
 
+    with it.having("a first pass cache"):
+
+        @it.should("compute first pass fixations for all regions once per trial")
+        def test_fp_cache_hits():
+            trial = Trial(1, 600, it.item_x, list(it.fixations_x2))
+            reset_fp_cache_info()
+            for region_number in range(4):
+                get_fp_fixations(trial, region_number)
+            it.assertEqual(fp_cache_info(), {"hits": 3, "misses": 1})
+            it.assertEqual(
+                get_fp_table(trial),
+                {
+                    0: it.fixations_x2[0:2],
+                    1: it.fixations_x2[2:4],
+                    2: [it.fixations_x2[6]],
+                },
+            )
+
+        @it.should("recompute first pass fixations when the fixations change")
+        def test_fp_cache_invalidation():
+            trial = Trial(1, 600, it.item_x, list(it.fixations_x))
+            it.assertEqual(get_fp_fixations(trial, 2), [it.fixations_x[2]])
+            trial.fixations = trial.fixations[:2]
+            it.assertEqual(get_fp_fixations(trial, 2), [])
+            trial.fixations += [it.fixations_x[3]]
+            it.assertEqual(trial.fixations[2].start, it.fixations_x[3].start)
+            it.assertEqual(get_fp_fixations(trial, 1), [trial.fixations[2]])
+            trial.fixations[2] = it.fixations_x[2]
+            it.assertEqual(get_fp_fixations(trial, 1), [])
+            it.assertEqual(get_fp_fixations(trial, 2), [it.fixations_x[2]])
+            clear_fp_cache(trial)
+            it.assertIsNone(trial.first_pass_cache)
+
+        @it.should("recompute first pass fixations when fixations change in place")
+        def test_fp_cache_in_place():
+            for sequence in [False, True]:
+                fixations = [
+                    Fixation(
+                        Point(fixation.char, fixation.line),
+                        fixation.start,
+                        fixation.end,
+                        fixation.index,
+                        fixation.region,
+                    )
+                    for fixation in it.fixations_x
+                ]
+                trial = Trial(
+                    1,
+                    600,
+                    it.item_x,
+                    FixationSequence(it.regions_x, fixations)
+                    if sequence
+                    else fixations,
+                )
+                it.assertEqual(get_fp_fixations(trial, 0), fixations[0:2])
+                trial.fixations[0].excluded = True
+                it.assertEqual(get_fp_fixations(trial, 0), [fixations[1]])
+                trial.fixations[1].assign_region(it.regions_x[1])
+                it.assertEqual(get_fp_fixations(trial, 0), [])
+                for fixation in trial.fixations:
+                    fixation.excluded = True
+                it.assertEqual(get_fp_table(trial), {})
+
+        @it.should("not compare cached first pass fixations")
+        def test_fp_cache_equality():
+            trial = Trial(1, 600, it.item_x, list(it.fixations_x))
+            get_fp_table(trial)
+            it.assertEqual(trial, Trial(1, 600, it.item_x, list(it.fixations_x)))
+
 
 it.createTests(globals())
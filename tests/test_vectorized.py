@@ -0,0 +1,93 @@
+import os
+import random
+from nose2.tools import such
+from sideeye import calculate_all_measures, config, parser
+from sideeye.data import FixationSequence, columns
+from sideeye.measures import region, trial, vectorized
+from tests.random_trials import random_trial
+
+with such.A("Vectorized measures") as it:
+
+    @it.has_setup
+    def setup():
+        dirname = os.path.dirname(os.path.realpath(__file__))
+        it.da1_file = os.path.join(dirname, "testdata/timdrop.DA1")
+        it.region_file = os.path.join(dirname, "testdata/timdropDA1.cnt")
+        rng = random.Random(0)
+        it.trials = [random_trial(rng) for _ in range(500)]
+
+    @it.should("build a columnar view of a trial's fixations")
+    def test_columns(case):
+        if columns.numpy is None:
+            case.skipTest("NumPy is not installed")
+        test_trial = it.trials[0]
+        view = test_trial.columns()
+        it.assertIs(test_trial.columns(), view)
+        it.assertEqual(len(view), len(test_trial.fixations))
+        it.assertEqual(
+            view.duration.tolist(), [fix.duration() for fix in test_trial.fixations]
+        )
+        it.assertEqual(
+            view.region_number.tolist(),
+            [fix.region.number for fix in test_trial.fixations],
+        )
+        test_trial.fixations = test_trial.fixations[:1]
+        it.assertEqual(len(test_trial.columns()), 1)
+        for fixations in [
+            test_trial.fixations,
+            FixationSequence(test_trial.item.regions, test_trial.fixations),
+        ]:
+            test_trial.fixations = fixations
+            excluded = not fixations[0].excluded
+            test_trial.columns()
+            fixations[0].excluded = excluded
+            it.assertEqual(test_trial.columns().excluded.tolist(), [excluded])
+
+    @it.should("calculate the same measures as the standard implementations")
+    def test_same_measures(case):
+        if columns.numpy is None:
+            case.skipTest("NumPy is not installed")
+        for test_trial in it.trials:
+            for measure in vectorized.__all__:
+                if hasattr(trial, measure):
+                    if not [fix for fix in test_trial.fixations if not fix.excluded]:
+                        continue
+                    expected = getattr(trial, measure)(test_trial)
+                    actual = getattr(vectorized, measure)(test_trial)
+                    it.assertEqual((type(actual), actual), (type(expected), expected))
+                else:
+                    expected = [
+                        getattr(region, measure)(test_trial, number)
+                        for number in range(len(test_trial.item.regions))
+                    ]
+                    getattr(vectorized, measure)(test_trial)
+                    for (number, value) in enumerate(expected):
+                        actual = test_trial.region_measures[number][measure]
+                        it.assertEqual(
+                            (type(actual["value"]), actual["value"]),
+                            (type(value["value"]), value["value"]),
+                        )
+                        it.assertEqual(actual["fixations"], value["fixations"])
+
+    @it.should("generate the same output when calculating vectorized measures")
+    def test_vectorized_output(case):
+        if columns.numpy is None:
+            case.skipTest("NumPy is not installed")
+        for wide_format in [True, False]:
+            configuration = config.Configuration()
+            configuration.wide_format = wide_format
+            standard = calculate_all_measures(
+                [parser.experiment.parse(it.da1_file, it.region_file)],
+                config=configuration,
+            )
+            configuration.vectorized = True
+            it.assertEqual(
+                calculate_all_measures(
+                    [parser.experiment.parse(it.da1_file, it.region_file)],
+                    config=configuration,
+                ),
+                standard,
+            )
+
+
+it.createTests(globals())